@@ -4,45 +4,25 @@
 # 3/ apparent equatorial luminosity and associated apparent effective temperature
 
 from ester import *
+from ester.index import index
 import matplotlib.pyplot as plt
 import numpy as np
-import math
-import commands
 
 sigma=SIG_SB
 path='/home/rieutord/Ester/local/runs/olympe/Achernar2D/'
-lpath=len(path)
-liste=commands.getoutput('ls '+path+'Ach2D_ev_0*')
-
-lis=liste.split()
-
-te=[0.0 for i in range(len(lis))]
-t_app_pole=[0.0 for i in range(len(lis))]
-t_app_eq=[0.0 for i in range(len(lis))]
-lum=[0.0 for i in range(len(lis))]
-lum_app_pole=[0.0 for i in range(len(lis))]
-lum_app_eq=[0.0 for i in range(len(lis))]
-
-i=0
-for filename in lis:
-	print filename[lpath:]
-	a=star2d(filename)
-	nth=a.nth+2
-	integrand=a.r[a.nr-1,:]*np.sqrt(a.r[a.nr-1,:]**2+a.rt[a.nr-1,:]**2)
-	integrand=a.R**2*2*np.pi*integrand
-	surf=np.dot(integrand,a.It) # surface calculee
-	te[i]=math.log10((a.L/surf/sigma)**(0.25))
-	lum[i]=math.log10(a.L/L_SUN)
-	print 'Temp eff =',(a.L/surf/sigma)**0.25,'lum = ',a.L/L_SUN,' Req = ',a.Re/R_SUN
-	app_l= a.apparent_luminosity(0) # polar app. luminosity
-	#print 'app lum pole=',app_l
-	t_app_pole[i]=np.log10((L_SUN*app_l/surf/sigma)**(0.25))
-        lum_app_pole[i]=np.log10(app_l)
-	app_l= a.apparent_luminosity(90) # equat. app. luminosity
-	#print 'app lum eq=',app_l
-	t_app_eq[i]=math.log10((L_SUN*app_l/surf/sigma)**(0.25))
-        lum_app_eq[i]=math.log10(app_l)
-        i=i+1
+# scalars of the models, read from the index of the directory (only new or
+# modified models are read)
+a=index(path,'Ach2D_ev_0*.h5')
+
+surf=a['surf'] # surface calculee
+te=np.log10((a['L']/surf/sigma)**(0.25))
+lum=np.log10(a['L']/L_SUN)
+for k,filename in enumerate(a['file']):
+	print filename,'Temp eff =',(a['L'][k]/surf[k]/sigma)**0.25,'lum = ',a['L'][k]/L_SUN,' Req = ',a['Re'][k]/R_SUN
+t_app_pole=np.log10((L_SUN*a['L_app_pole']/surf/sigma)**(0.25)) # polar app. luminosity
+lum_app_pole=np.log10(a['L_app_pole'])
+t_app_eq=np.log10((L_SUN*a['L_app_eq']/surf/sigma)**(0.25)) # equat. app. luminosity
+lum_app_eq=np.log10(a['L_app_eq'])
 
 
 xm=min(np.concatenate([te,t_app_eq]))-0.05
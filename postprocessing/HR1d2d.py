@@ -5,9 +5,9 @@
 # and a 1D evolution model for reference
 
 from ester import *
+from ester.index import index
 import matplotlib.pyplot as plt
 import numpy as np
-import commands
 
 plt.close()
 #plt.switch_backend('TKAgg')
@@ -15,73 +15,43 @@ sigma=SIG_SB
 #liste=commands.getoutput('ls *ev_000*.h5')
 #---------------------- 1D models-----------------------------------
 path='/home/rieutord/Ester/local/runs/olympe/Ach3/'
-lpath=len(path)
-liste=commands.getoutput('ls '+path+'*R_ev_00[0-4][0-9].h5')
-liste=commands.getoutput('ls '+path+'*R_ev_*.h5')
-MYRS=365.25*86400*1e6
-
-lis=liste.split()
-
-te=[0.0 for i in range(len(lis))]
-lum=[0.0 for i in range(len(lis))]
-age=[0.0 for i in range(len(lis))]
-
-i=0
-for filename in lis:
-	a=star2d(filename)
-	lu=a.L/L_SUN
-	te[i]=a.Teff[0,0]
-	age[i]=a.age
-	lum[i]=a.L/L_SUN
-	if (i==0) : 
-		E=lum[i]*L_SUN*age[i]*MYRS
-		#print 'Energy emitted (ergs) = %.3e'%E
-	if (i>0) : 
-		L0=lum[i-1]*L_SUN
-		L1=lum[i]*L_SUN
-		L=(L0+L1)/2
-		E=E+L*(age[i]-age[i-1])*MYRS
-		#print 'Energy emitted (ergs) = %.3e'%E
-	Esun=E/C_LIGHT**2/M_SUN
-	print filename[lpath:],'Age = %.3f'%a.age,' Xc = %.2e'%a.X[0,0],' Tc = %.3e'%a.Tc,\
-         ' rho_c = %.2f'%a.rhoc,'Lum = %.2f'%lu #,'E emitted = %.3e'%Esun
-        i=i+1
+
+# scalars of the models, read from the index of the directory (only new or
+# modified models are read)
+a=index(path,'*R_ev_*.h5')
+lis=a['file']
+
+te=a['Teff'][:,0]
+age=a['age']
+lum=a['L']/L_SUN
+
+# the age is only known for models that store it (NaN otherwise): it is
+# used to annotate the tracks
+for i,filename in enumerate(lis):
+	print filename,' Xc = %.2e'%a['Xc'][i],' Tc = %.3e'%a['Tc'][i],\
+         ' rho_c = %.2f'%a['rhoc'][i],'Lum = %.2f'%lum[i]
+i=len(lis)
 i1d=i
 print 'nombre de modeles 1D =',i1d
 
 #---------------------- 2D models-----------------------------------
 # we add 2D models
 path='/home/rieutord/Ester/local/runs/olympe/Achernar2D/'
-lpath=len(path)
-liste=commands.getoutput('ls '+path+'Ach2D_ev_0*.h5')
-
-lis=liste.split()
-
-te2D=[0.0 for i in range(len(lis))]
-t_app_eq=[0.0 for i in range(len(lis))]
-t_app_pole=[0.0 for i in range(len(lis))]
-lum2D=[0.0 for i in range(len(lis))]
-lum_app_pole=[0.0 for i in range(len(lis))]
-lum_app_eq=[0.0 for i in range(len(lis))]
-age2D=[0.0 for i in range(len(lis))]
-
-i=0
-for filename in lis:
-        a=star2d(filename)
-	age2D[i]=a.age
-        integrand=a.r[a.nr-1,:]*np.sqrt(a.r[a.nr-1,:]**2+a.rt[a.nr-1,:]**2)
-        integrand=a.R**2*2*np.pi*integrand
-        surf=np.dot(integrand,a.It) # surface calculee
-        te2D[i]=(a.L/surf/sigma)**0.25
-        lum2D[i]=a.L/L_SUN
-        print filename[lpath:],' Temp eff =',te2D[i],'lum = ',lum2D[i],' Req = ',a.Re/R_SUN
-        app_l= a.apparent_luminosity(0) # polar app. luminosity
-        t_app_pole[i]=(L_SUN*app_l/surf/sigma)**0.25
-        lum_app_pole[i]=app_l
-        app_l= a.apparent_luminosity(90) # equat. app. luminosity
-        t_app_eq[i]=(L_SUN*app_l/surf/sigma)**0.25
-        lum_app_eq[i]=app_l
-        i=i+1
+
+a=index(path,'Ach2D_ev_0*.h5')
+lis=a['file']
+
+age2D=a['age']
+surf=a['surf'] # surface calculee
+te2D=(a['L']/surf/sigma)**0.25
+lum2D=a['L']/L_SUN
+for k,filename in enumerate(lis):
+	print filename,' Temp eff =',te2D[k],'lum = ',lum2D[k],' Req = ',a['Re'][k]/R_SUN
+t_app_pole=(L_SUN*a['L_app_pole']/surf/sigma)**0.25 # polar app. luminosity
+lum_app_pole=a['L_app_pole']
+t_app_eq=(L_SUN*a['L_app_eq']/surf/sigma)**0.25 # equat. app. luminosity
+lum_app_eq=a['L_app_eq']
+i=len(lis)
 
 xm=12000 #min(te)-1000
 xmm=22000 #max(te)+1000
@@ -149,36 +119,21 @@ for k in range(i-1):
 
 # Let's add another 2D track
 path='/home/rieutord/Ester/local/runs/olympe/Achernar2D_O5/'
-lpath=len(path)
-liste=commands.getoutput('ls '+path+'Ach2DO5_ev_0*.h5')
-
-lis=liste.split()
-
-te2D=[0.0 for i in range(len(lis))]
-t_app_pole=[0.0 for i in range(len(lis))]
-t_app_eq=[0.0 for i in range(len(lis))]
-lum2D=[0.0 for i in range(len(lis))]
-lum_app_pole=[0.0 for i in range(len(lis))]
-lum_app_eq=[0.0 for i in range(len(lis))]
-age2D=[0.0 for i in range(len(lis))]
-
-i=0
-for filename in lis:
-        a=star2d(filename)
-	age2D[i]=a.age
-        integrand=a.r[a.nr-1,:]*np.sqrt(a.r[a.nr-1,:]**2+a.rt[a.nr-1,:]**2)
-        integrand=a.R**2*2*np.pi*integrand
-        surf=np.dot(integrand,a.It) # surface calculee
-        te2D[i]=(a.L/surf/sigma)**0.25
-        lum2D[i]=a.L/L_SUN
-        print filename[lpath:],' Temp eff =',te2D[i],'lum = ',lum2D[i],' Req = ',a.Re/R_SUN
-        app_l= a.apparent_luminosity(0) # polar app. luminosity
-        t_app_pole[i]=(L_SUN*app_l/surf/sigma)**0.25
-        lum_app_pole[i]=app_l
-        app_l= a.apparent_luminosity(90) # equat. app. luminosity
-        t_app_eq[i]=(L_SUN*app_l/surf/sigma)**0.25
-        lum_app_eq[i]=app_l
-        i=i+1
+
+a=index(path,'Ach2DO5_ev_0*.h5')
+lis=a['file']
+
+age2D=a['age']
+surf=a['surf'] # surface calculee
+te2D=(a['L']/surf/sigma)**0.25
+lum2D=a['L']/L_SUN
+for k,filename in enumerate(lis):
+	print filename,' Temp eff =',te2D[k],'lum = ',lum2D[k],' Req = ',a['Re'][k]/R_SUN
+t_app_pole=(L_SUN*a['L_app_pole']/surf/sigma)**0.25 # polar app. luminosity
+lum_app_pole=a['L_app_pole']
+t_app_eq=(L_SUN*a['L_app_eq']/surf/sigma)**0.25 # equat. app. luminosity
+lum_app_eq=a['L_app_eq']
+i=len(lis)
 
 print i-1
 plt.plot(te2D,lum2D,'go')
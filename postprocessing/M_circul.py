@@ -21,22 +21,13 @@ omega=Omega_scale*a.w
 print 'omega pole',omega[-1,nth+1]
 print 'omega equator',omega[-1,0]
 
-# the cartesian grid
-x=a.r*np.sin(a.th)/R_SUN
-y=a.r*np.cos(a.th)/R_SUN
-# the stellar surface
-xb=x[-1,:]
-yb=y[-1,:]
-x=np.c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-y=np.c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
-z=np.c_[a.G,a.G[:,-2::-1],a.G[:,1:],a.G[:,-2::-1]]
+# the cartesian grid of the meridional plane
+P=a.plane(R_SUN)
 plt.figure(1,figsize=(7,7))
-plt.contour(x,y,z,30,colors='r')
+plt.contour(P.x,P.y,P.mirror(a.G),30,colors='r')
 plt.title('meridional streamlines')
-plt.plot(xb,yb,'-',color='k')
-plt.plot(xb,-yb,'-',color='k')
-plt.plot(-xb,yb,'-',color='k')
-plt.plot(-xb,-yb,'-',color='k')
+# the stellar surface
+plt.plot(P.x[-1],P.y[-1],'-',color='k')
 
 plt.axis([-5.5,5.5,-5.5,5.5])
 plt.axis('scaled')
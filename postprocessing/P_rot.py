@@ -21,14 +21,11 @@ omega=Omega_scale*a.w
 print 'omega pole',omega[-1,nth+1]
 print 'omega equator',omega[-1,0]
 
-x=a.r*np.sin(a.th)/R_SUN
-y=a.r*np.cos(a.th)/R_SUN
-x=np.c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-y=np.c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
+P=a.plane(R_SUN) # mirrored meridional plane
 pi=math.acos(-1)/3600.
-z=2*pi/np.c_[omega,omega[:,-2::-1],omega[:,1:],omega[:,-2::-1]]
+z=2*pi/P.mirror(omega)
 plt.figure(1,figsize=(7,7))
-plt.contourf(x,y,z,60,cmap=plt.cm.RdBu)
+plt.contourf(P.x,P.y,z,60,cmap=plt.cm.RdBu)
 plt.title('Rotation Period (hours)')
 
 plt.colorbar()
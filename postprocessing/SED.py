@@ -55,27 +55,31 @@ class Star:
         self.nth                = 51
         self.nphi0              = 5
         self.dth                = pi / self.nth
-        self.theta              = [self.dth/2. + j * self.dth for j in range(self.nth)]
+        self.theta              = self.dth/2. + self.dth * np.arange(self.nth)
         self.Rs                 = self.mod.Rp
-        self.eval_func          = [self.mod.leg_eval_matrix(j) for j in self.theta]
-        self.eval_func_antisym  = [self.mod.leg_eval_matrix_antisym(j) for j in self.theta]
+        self.eval_func          = self.mod.leg_eval_matrix(self.theta)
+        self.eval_func_antisym  = self.mod.leg_eval_matrix_antisym(self.theta)
         self.r                  = np.dot(self.mod.r[-1, 1:-1], self.eval_func).ravel()
         self.rt                 = np.dot(self.mod.rt[-1, 1:-1], self.eval_func_antisym).ravel()
         self.Teff               = np.dot(self.mod.Teff[:, 1:-1], self.eval_func).ravel()
-        self.logg               = np.array([np.log10(i) for i in np.dot(self.mod.gsup[:, 1:-1],
-                                            self.eval_func)[0]]).ravel()
+        self.logg               = np.log10(np.dot(self.mod.gsup[:, 1:-1], self.eval_func)).ravel()
         self.ds0                = self.ds_func(0, self.nphi0)
         self.dphi, self.nphi    = self.grid_phi(nphi0=self.nphi0, nth=self.nth, ds0=self.ds0)
-        self.phi                = [[self.dphi[i] / 2. + j * self.dphi[i] for j in\
-                                    range(int(self.nphi[i]))] for i in range(self.nth)]
-        self.ds                 = [self.ds_func(i, self.nphi[i]) for i in range(self.nth)]
-        self.ngrid              = sum(self.nphi)
+        self.ngrid              = self.nphi.sum()
+        # theta index of each surface element, the elements being sorted by
+        # theta then phi
+        self.ith                = np.repeat(np.arange(self.nth), self.nphi)
+        jphi                    = np.arange(self.ngrid) - np.repeat(np.cumsum(self.nphi) - self.nphi, self.nphi)
+        self.phi_flat           = self.dphi[self.ith] * (jphi + 0.5)
+        self.phi                = np.split(self.phi_flat, np.cumsum(self.nphi)[:-1])
+        self.ds                 = self.ds_func(np.arange(self.nth), self.nphi)
         self.init_mu()
         self.flat()
 
     def ds_func(self, i, j):
         """
         Function to compute the surface element's area at given theta (theta[i]) and dphi (2*pi/j).
+        i and j can be arrays.
         """
         return self.r[i]**2 * sqrt(1 + (self.rt[i]**2/self.r[i]**2)) * np.sin(self.theta[i])\
                * self.dth * 2 * pi / j
@@ -85,43 +89,33 @@ class Star:
         Compute the phi step at every theta so that the surface elements' areas are as
         homogeneous as possible across the star.
         """
-        dphi = [2 * pi / nphi0]
-        nphi = [nphi0]
-        for i in range(1, nth):
-            temp = float('inf')
-            j = 1
-            while abs(self.ds_func(i, j) - ds0) <= temp:
-                temp = abs(self.ds_func(i, j) - ds0)
-                index = j
-                j += 1
-            dphi.append(2 * pi / index)
-            nphi.append(int(index))
-
-        return np.array(dphi), np.array(nphi)
+        # |ds_func(i, j) - ds0| decreases with j up to j = ds_func(i, 1)/ds0, then
+        # increases: the best number of elements is one of its integer neighbours
+        # (the largest one if both are as good)
+        i = np.arange(1, nth)
+        j = np.maximum(np.floor(self.ds_func(i, 1) / ds0), 1)
+        up = abs(self.ds_func(i, j + 1) - ds0) <= abs(self.ds_func(i, j) - ds0)
+        nphi = np.concatenate(([nphi0], j + up)).astype(int)
+        return 2 * pi / nphi, nphi
 
     def init_mu(self):
         """
         Compute mu, cosine of the angle between the normal to the surface and the line of sight
         (depends on inclination angle, and necessary to compute the visible grid).
         """
-        self.mu       = [[round((cos(self.phi[i][j])*sin(self.incl)*(self.r[i]*sin(self.theta[i])
-                          - self.rt[i]*cos(self.theta[i])) + cos(self.incl)
-                          * (self.r[i]*cos(self.theta[i]) + self.rt[i]*sin(self.theta[i])))
-                          / (self.r[i]*np.sqrt(1 + (self.rt[i]**2 / self.r[i]**2))), 6)
-                          for j in range(int(self.nphi[i]))]
-                         for i in range(self.nth)]
-        self.mu_flat  = np.array(list(itertools.chain(*self.mu)))
+        r, rt, theta = self.r[self.ith], self.rt[self.ith], self.theta[self.ith]
+        self.mu_flat  = np.round((cos(self.phi_flat)*sin(self.incl)*(r*sin(theta) - rt*cos(theta))
+                                  + cos(self.incl) * (r*cos(theta) + rt*sin(theta)))
+                                 / (r*np.sqrt(1 + (rt**2 / r**2))), 6)
+        self.mu       = np.split(self.mu_flat, np.cumsum(self.nphi)[:-1])
         self.vis_mask = np.where(self.mu_flat >= 0.)
         self.mu_vis = self.mu_flat[self.vis_mask]
 
     def flat(self):
         """Flatten all arrays"""
-        ds   = [list(itertools.repeat(self.ds[i], self.nphi[i])) for i in range(self.nth)]
-        Teff = [list(itertools.repeat(self.Teff[i], self.nphi[i])) for i in range(self.nth)]
-        logg = [list(itertools.repeat(self.logg[i], self.nphi[i])) for i in range(self.nth)]
-        self.ds_flat   = np.array(list(itertools.chain(*ds)))
-        self.Teff_flat = np.array(list(itertools.chain(*Teff)))
-        self.logg_flat = np.array(list(itertools.chain(*logg)))
+        self.ds_flat   = self.ds[self.ith]
+        self.Teff_flat = self.Teff[self.ith]
+        self.logg_flat = self.logg[self.ith]
         return
 
     def visgrid(self):
@@ -129,25 +123,37 @@ class Star:
         self.ds_vis   = self.ds_flat[self.vis_mask]
         self.Teff_vis = self.Teff_flat[self.vis_mask]
         self.logg_vis = self.logg_flat[self.vis_mask]
+        self.ith_vis  = self.ith[self.vis_mask]
 
     def Lapp(self):
         inc=self.incl*180/pi
         return self.mod.apparent_luminosity(inc)
     def Teff_mean(self):
-        return sum(self.Teff_vis*self.mu_vis*self.ds_vis)/sum(self.mu_vis*self.ds_vis)
+        return np.sum(self.Teff_vis*self.mu_vis*self.ds_vis)/np.sum(self.mu_vis*self.ds_vis)
 
     def logg_mean(self):
-        return sum(self.logg_vis*self.mu_vis*self.ds_vis)/sum(self.mu_vis*self.ds_vis)
+        return np.sum(self.logg_vis*self.mu_vis*self.ds_vis)/np.sum(self.mu_vis*self.ds_vis)
 
     def B(self, l, T):
         return 2*Star.h*Star.c**2 / (l**5*(np.exp(Star.h*Star.c/(l*Star.k*T))-1))
 
-    def SED(self, wavelength=np.linspace(1e-5, 2e-2, 10000)):
-        flux = []
-        for T in self.Teff_vis:
-            flux.append(self.B(wavelength, T))
-        return wavelength, np.array([sum(f*self.mu_vis*self.ds_vis*self.Rs**2/Star.dist**2)
-                                     for f in np.array(flux).T])
+    def SED(self, wavelength=np.linspace(1e-5, 2e-2, 10000), chunk=2**20):
+        """
+        Flux received at distance dist at the given wavelengths. The visible
+        elements of a theta ring share the same Teff: their weights are summed,
+        and the Planck function is computed once per ring, by blocks of at most
+        `chunk` (ring, wavelength) values.
+        """
+        wavelength = np.asarray(wavelength, dtype=float)
+        weight = np.bincount(self.ith_vis, self.mu_vis*self.ds_vis, minlength=self.nth)\
+                 * self.Rs**2/Star.dist**2
+        rings = np.nonzero(weight)[0]
+        T, weight = self.Teff[rings, None], weight[rings]
+        sed = np.empty(wavelength.shape)
+        n = max(chunk // max(len(rings), 1), 1)
+        for k in range(0, wavelength.size, n):
+            sed.flat[k:k+n] = np.dot(weight, self.B(wavelength.ravel()[k:k+n], T))
+        return wavelength, sed
 
     def plot_SED(self):
         wave, sed = self.SED()
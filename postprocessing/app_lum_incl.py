@@ -10,19 +10,18 @@
 from ester import *
 import matplotlib.pyplot as plt
 
+import numpy
+
 np=20
-lum_app=[0.0 for i in range(np)]
-angle=[float(i)/float(np-1)*90 for i in range(np)]
+angle=numpy.linspace(0,90,np)
 a=star2d('Achernar2d')
 print 'Luminosity of the star (solar unit) =',a.L/L_SUN
 print ' '
 
-k=0
-for i in angle:
-	app_l= a.apparent_luminosity(i)
+# all the inclinations are computed at once
+lum_app=a.apparent_luminosity(angle)
+for i,app_l in zip(angle,lum_app):
 	print i, 'angle in degrees, app lum =',app_l
-	lum_app[k]=app_l
-	k=k+1
 
 
 plt.plot(angle,lum_app,'b-')
@@ -9,17 +9,12 @@ a=star1d('M5paper_OPAL') # open a 1D solution
 
 print 'Compute the Chebyshev spectrum of the density'
 
-# a.P is the projection matrix of the Gauss-Lobatto grid
-
-sp1d=abs(np.dot(a.P,a.rho))
-jfirst=np.zeros(a.ndomains,dtype=np.int)
-
-for i in np.arange(a.ndomains-1)+1:
-   jfirst[i]=jfirst[i-1]+a.npts[i]
+# Chebyshev spectrum, normalized by the first coefficient in each domain
+sp1d=a.spectrum('rho')
+# first point of each domain
+jfirst=np.cumsum(np.r_[0,a.npts[:-1]])
 
 for i in range(a.ndomains):
-    sp0=sp1d[jfirst[i]] # normalization by the first coefficient
-    sp1d[jfirst[i]:jfirst[i]+a.npts[i],0]=sp1d[jfirst[i]:jfirst[i]+a.npts[i],0]/sp0
     plt.plot(np.arange(a.npts[i])+jfirst[i],sp1d[jfirst[i]:jfirst[i]+a.npts[i]])
 
 ym=min(sp1d)
@@ -3,45 +3,60 @@
 # files written in "film/" directory
 # preliminary step to make a film with other tools
 # the script make_the_film, which uses mencoder, is a possible solution
+#
+# Usage: python film.py [model files] (default: the files of 'pattern')
+# Frames are rendered by a pool of processes (one per CPU), each of them
+# reusing the same figure for all its frames. Frame i is always written to
+# film/anim_M5_<i>.png, in the order of the (sorted) model files.
 
 import sys
-from ester import *
+import os
+import glob
+import multiprocessing
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import math
-import commands
-import string
 import numpy as np
+from ester import star2d
 
 Lsun=3.8396e33;
 sigma=5.67e-5; # Stefan constant, cgs
 R_SUN=6.95508e10;
 
-liste=commands.getoutput('ls $HOME/uqbar/ESTER/Z0.014/M5_film/M5Xc1sol6565_film_0*')
+pattern=os.path.expanduser('~/uqbar/ESTER/Z0.014/M5_film/M5Xc1sol6565_film_0*')
+outdir='film'
 
-lis=liste.split()
-print 'nb of images ',len(lis)
+_fig=None
+_ax=None
 
-te=[0.0 for i in range(len(lis))]
+def init_worker():
+	# each process draws all its frames on the same figure
+	global _fig,_ax
+	_fig=plt.figure(1,figsize=(7,7))
+	_ax=_fig.add_subplot(111)
 
-i=0
-for filename in lis:
-	print filename
+def render(args):
+	i,filename=args
 	a=star2d(filename)
-	print 'Xc',i,a.Xc
-	Req=a.Re/R_SUN
-	Rpol=a.Rp/R_SUN
-        print Req,Rpol
-       
-	x=a.r*np.sin(a.th)/R_SUN # en km
-        y=a.r*np.cos(a.th)/R_SUN # en km
-        x=np.c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-        y=np.c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
-        pi=math.acos(-1)/3600.
-        z=2*pi/np.c_[a.w,a.w[:,-2::-1],a.w[:,1:],a.w[:,-2::-1]]
-        plt.figure(1,figsize=(7,7))
-        plt.contourf(x,y,z,60,cmap=plt.cm.RdBu)
-        plt.axis([-5.5,5.5,-5.5,5.5])
+	P=a.plane(R_SUN) # mirrored meridional plane
+	pi=np.pi/3600.
+	z=2*pi/P.mirror(a.w)
+	_ax.cla()
+	_ax.contourf(P.x,P.y,z,60,cmap=plt.cm.RdBu)
+	_ax.axis([-5.5,5.5,-5.5,5.5])
 	srtnum='{0:03}'.format(i)
-	plt.savefig('film/anim_M5_'+srtnum+'.png', bbox_inches=0)
-        plt.close()
-        i=i+1
+	_fig.savefig(os.path.join(outdir,'anim_M5_'+srtnum+'.png'))
+	return i,a.Xc,a.Re/R_SUN,a.Rp/R_SUN
+
+if __name__ == '__main__':
+	lis=sys.argv[1:] or sorted(glob.glob(pattern))
+	print('nb of images '+str(len(lis)))
+	if not os.path.isdir(outdir):
+		os.makedirs(outdir)
+	pool=multiprocessing.Pool(initializer=init_worker)
+	try:
+		for i,Xc,Req,Rpol in pool.imap(render,enumerate(lis)):
+			print('%s Xc %d %g %g %g' % (lis[i],i,Xc,Req,Rpol))
+	finally:
+		pool.close()
+		pool.join()
@@ -10,33 +10,15 @@ a=star2d(filename) # open a 2D solution
 
 print 'Compute the 2D spectrum of the density'
 
-# a.P is the projection matrix of the Gauss-Lobatto grid
-# a.P_00 is the projection matrix of the Gauss-Legendre grid for a field
-# symmetric with respect to equator
-
-
-sp_leg=np.zeros((a.nr,a.nth))
+# Spectrum of the density: projection on the Chebyshev polynomials of each
+# domain of the Gauss-Lobatto grid (rows) and on the Legendre polynomials
+# of the Gauss-Legendre grid for a field symmetric with respect to equator
+# (columns), normalized by the coefficient (n=0,l=0) in each domain
+sp_leg=a.spectrum('rho')
 print 'check the shape',sp_leg.shape
 
-# Gauss Legendre spectrum
-# we eliminate the pole/equator points that are respectively at a.nth+1
-# and 0
-
-for i in range(a.nr):
-    sp_leg[i,:]=np.dot(a.P_00,a.rho[i,1:a.nth+1]) 
-
-for k in range(a.nth):
-    sp_leg[:,k]=abs(np.dot(a.P,sp_leg[:,k]))
-
-# Normalisation by the coefficient (0,0) in each domain
-jfirst=np.zeros(a.ndomains,dtype=np.int)
-
-for i in np.arange(a.ndomains-1)+1:
-   jfirst[i]=jfirst[i-1]+a.npts[i]
-
-for i in range(a.ndomains):
-    sp0=sp_leg[jfirst[i],0] # normalization by the (n=0,l=0) coefficient
-    sp_leg[jfirst[i]:jfirst[i]+a.npts[i],:]=sp_leg[jfirst[i]:jfirst[i]+a.npts[i],:]/sp0
+# first point of each domain
+jfirst=np.cumsum(np.r_[0,a.npts[:-1]])
 
 x=np.arange(a.nth)
 y=np.arange(a.nr)
@@ -31,6 +31,8 @@
 %ignore star2d::version_struct;
 %ignore star2d::units_struct;
 %ignore star2d::config_struct;
+%ignore app_lum_cache;
+%ignore phys_cache;
 
 %{
 #include "matrix.h"
@@ -45,6 +47,24 @@
 %array_class(double, doubleArray);
 %array_class(int, intArray);
 
+// Expose the column-major storage of matrix objects to NumPy without copy:
+// numpy.asarray(m) returns a Fortran-ordered (nrows, ncols) view on m.data()
+%extend matrix {
+    size_t data_address() const {
+        return (size_t) $self->data();
+    }
+%pythoncode %{
+    @property
+    def __array_interface__(self):
+        import sys
+        return {'version': 3,
+                'typestr': ('<f8' if sys.byteorder == 'little' else '>f8'),
+                'shape': (self.nrows(), self.ncols()),
+                'strides': (8, 8*self.nrows()),
+                'data': (self.data_address(), False)}
+%}
+}
+
 %include "matrix.h"
 %include "physics.h"
 %include "mapping.h"
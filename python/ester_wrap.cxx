@@ -3023,25 +3023,26 @@ SWIG_Python_NonDynamicSetAttr(PyObject *obj, PyObject *name, PyObject *value) {
 #define SWIGTYPE_p_matrix_map swig_types[17]
 #define SWIGTYPE_p_matrix_map_elem swig_types[18]
 #define SWIGTYPE_p_nuc_struct swig_types[19]
-#define SWIGTYPE_p_opa_struct swig_types[20]
-#define SWIGTYPE_p_p_char swig_types[21]
-#define SWIGTYPE_p_p_int swig_types[22]
-#define SWIGTYPE_p_p_intArray swig_types[23]
-#define SWIGTYPE_p_plt swig_types[24]
-#define SWIGTYPE_p_remapper swig_types[25]
-#define SWIGTYPE_p_solver swig_types[26]
-#define SWIGTYPE_p_star1d swig_types[27]
-#define SWIGTYPE_p_star2d swig_types[28]
-#define SWIGTYPE_p_star2d__config_struct swig_types[29]
-#define SWIGTYPE_p_star2d__units_struct swig_types[30]
-#define SWIGTYPE_p_star2d__version_struct swig_types[31]
-#define SWIGTYPE_p_star_evol swig_types[32]
-#define SWIGTYPE_p_std__mapT_std__string_matrix_map_t swig_types[33]
+#define SWIGTYPE_p_opa_houdek_context swig_types[20]
+#define SWIGTYPE_p_opa_struct swig_types[21]
+#define SWIGTYPE_p_p_char swig_types[22]
+#define SWIGTYPE_p_p_int swig_types[23]
+#define SWIGTYPE_p_p_intArray swig_types[24]
+#define SWIGTYPE_p_plt swig_types[25]
+#define SWIGTYPE_p_remapper swig_types[26]
+#define SWIGTYPE_p_solver swig_types[27]
+#define SWIGTYPE_p_star1d swig_types[28]
+#define SWIGTYPE_p_star2d swig_types[29]
+#define SWIGTYPE_p_star2d__config_struct swig_types[30]
+#define SWIGTYPE_p_star2d__units_struct swig_types[31]
+#define SWIGTYPE_p_star2d__version_struct swig_types[32]
+#define SWIGTYPE_p_star_evol swig_types[33]
 #define SWIGTYPE_p_std__string swig_types[34]
 #define SWIGTYPE_p_std__vectorT_int_t swig_types[35]
-#define SWIGTYPE_p_tiempo swig_types[36]
-static swig_type_info *swig_types[38];
-static swig_module_info swig_module = {swig_types, 37, 0, 0, 0, 0};
+#define SWIGTYPE_p_std__vectorT_std__string_t swig_types[36]
+#define SWIGTYPE_p_tiempo swig_types[37]
+static swig_type_info *swig_types[39];
+static swig_module_info swig_module = {swig_types, 38, 0, 0, 0, 0};
 #define SWIG_TypeQuery(name) SWIG_TypeQueryModule(&swig_module, &swig_module, name)
 #define SWIG_MangledTypeQuery(name) SWIG_MangledTypeQueryModule(&swig_module, &swig_module, name)
 
@@ -3146,12 +3147,12 @@ namespace swig {
 }
 
 
-#include "../src/include/matrix.h"
-#include "../src/include/star.h"
-#include "../src/include/physics.h"
-#include "../src/include/mapping.h"
-#include "../src/include/numdiff.h"
-#include "../src/graphics/matplotlib.h"
+#include "matrix.h"
+#include "star.h"
+#include "physics.h"
+#include "mapping.h"
+#include "numdiff.h"
+#include "matplotlib.h"
 
 
 typedef double doubleArray;
@@ -3644,6 +3645,46 @@ SWIG_AsVal_char (PyObject * obj, char *val)
 
 
 
+SWIGINTERN size_t matrix_data_address(matrix const *self){
+        return (size_t) self->data();
+    }
+
+  #define SWIG_From_long   PyInt_FromLong 
+
+
+SWIGINTERNINLINE PyObject* 
+SWIG_From_unsigned_SS_long  (unsigned long value)
+{
+  return (value > LONG_MAX) ?
+    PyLong_FromUnsignedLong(value) : PyInt_FromLong(static_cast< long >(value));
+}
+
+
+#ifdef SWIG_LONG_LONG_AVAILABLE
+SWIGINTERNINLINE PyObject* 
+SWIG_From_unsigned_SS_long_SS_long  (unsigned long long value)
+{
+  return (value > LONG_MAX) ?
+    PyLong_FromUnsignedLongLong(value) : PyInt_FromLong(static_cast< long >(value));
+}
+#endif
+
+
+SWIGINTERNINLINE PyObject *
+SWIG_From_size_t  (size_t value)
+{    
+#ifdef SWIG_LONG_LONG_AVAILABLE
+  if (sizeof(size_t) <= sizeof(unsigned long)) {
+#endif
+    return SWIG_From_unsigned_SS_long  (static_cast< unsigned long >(value));
+#ifdef SWIG_LONG_LONG_AVAILABLE
+  } else {
+    /* assume sizeof(size_t) <= sizeof(unsigned long long) */
+    return SWIG_From_unsigned_SS_long_SS_long  (static_cast< unsigned long long >(value));
+  }
+#endif
+}
+
 
 SWIGINTERNINLINE PyObject *
 SWIG_FromCharPtrAndSize(const char* carray, size_t size)
@@ -8989,6 +9030,28 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_matrix_data_address(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  matrix *arg1 = (matrix *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  size_t result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:matrix_data_address",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_matrix, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "matrix_data_address" "', argument " "1"" of type '" "matrix const *""'"); 
+  }
+  arg1 = reinterpret_cast< matrix * >(argp1);
+  result = matrix_data_address((matrix const *)arg1);
+  resultobj = SWIG_From_size_t(static_cast< size_t >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *matrix_swigregister(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *obj;
   if (!PyArg_ParseTuple(args,(char *)"O:swigregister", &obj)) return NULL;
@@ -13486,10 +13549,70 @@ SWIGINTERN PyObject *atm_struct_swigregister(PyObject *SWIGUNUSEDPARM(self), PyO
   return SWIG_Py_Void();
 }
 
+SWIGINTERN PyObject *_wrap_composition_map_species_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  std::vector< std::string > arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:composition_map_species_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_species_set" "', argument " "1"" of type '" "composition_map *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  {
+    res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_std__vectorT_std__string_t,  0  | 0);
+    if (!SWIG_IsOK(res2)) {
+      SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_species_set" "', argument " "2"" of type '" "std::vector< std::string >""'"); 
+    }  
+    if (!argp2) {
+      SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "composition_map_species_set" "', argument " "2"" of type '" "std::vector< std::string >""'");
+    } else {
+      std::vector< std::string > * temp = reinterpret_cast< std::vector< std::string > * >(argp2);
+      arg2 = *temp;
+      if (SWIG_IsNewObj(res2)) delete temp;
+    }
+  }
+  if (arg1) (arg1)->species = arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_composition_map_species_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  std::vector< std::string > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:composition_map_species_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_species_get" "', argument " "1"" of type '" "composition_map *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  result =  ((arg1)->species);
+  resultobj = SWIG_NewPointerObj((new std::vector< std::string >(static_cast< const std::vector< std::string >& >(result))), SWIGTYPE_p_std__vectorT_std__string_t, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_composition_map_dt_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   composition_map *arg1 = (composition_map *) 0 ;
-  matrix_map *arg2 = (matrix_map *) 0 ;
+  matrix *arg2 = (matrix *) 0 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
   void *argp2 = 0 ;
@@ -13503,11 +13626,11 @@ SWIGINTERN PyObject *_wrap_composition_map_dt_set(PyObject *SWIGUNUSEDPARM(self)
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_dt_set" "', argument " "1"" of type '" "composition_map *""'"); 
   }
   arg1 = reinterpret_cast< composition_map * >(argp1);
-  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_matrix_map, 0 |  0 );
+  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_matrix, 0 |  0 );
   if (!SWIG_IsOK(res2)) {
-    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_dt_set" "', argument " "2"" of type '" "matrix_map *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_dt_set" "', argument " "2"" of type '" "matrix *""'"); 
   }
-  arg2 = reinterpret_cast< matrix_map * >(argp2);
+  arg2 = reinterpret_cast< matrix * >(argp2);
   if (arg1) (arg1)->dt = *arg2;
   resultobj = SWIG_Py_Void();
   return resultobj;
@@ -13522,7 +13645,7 @@ SWIGINTERN PyObject *_wrap_composition_map_dt_get(PyObject *SWIGUNUSEDPARM(self)
   void *argp1 = 0 ;
   int res1 = 0 ;
   PyObject * obj0 = 0 ;
-  matrix_map *result = 0 ;
+  matrix *result = 0 ;
   
   if (!PyArg_ParseTuple(args,(char *)"O:composition_map_dt_get",&obj0)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
@@ -13530,8 +13653,8 @@ SWIGINTERN PyObject *_wrap_composition_map_dt_get(PyObject *SWIGUNUSEDPARM(self)
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_dt_get" "', argument " "1"" of type '" "composition_map *""'"); 
   }
   arg1 = reinterpret_cast< composition_map * >(argp1);
-  result = (matrix_map *)& ((arg1)->dt);
-  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_matrix_map, 0 |  0 );
+  result = (matrix *)& ((arg1)->dt);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_matrix, 0 |  0 );
   return resultobj;
 fail:
   return NULL;
@@ -13541,7 +13664,7 @@ fail:
 SWIGINTERN PyObject *_wrap_composition_map_jac_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   composition_map *arg1 = (composition_map *) 0 ;
-  std::map< std::string,matrix_map > *arg2 = (std::map< std::string,matrix_map > *) 0 ;
+  matrix *arg2 = (matrix *) 0 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
   void *argp2 = 0 ;
@@ -13555,11 +13678,11 @@ SWIGINTERN PyObject *_wrap_composition_map_jac_set(PyObject *SWIGUNUSEDPARM(self
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_jac_set" "', argument " "1"" of type '" "composition_map *""'"); 
   }
   arg1 = reinterpret_cast< composition_map * >(argp1);
-  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_std__mapT_std__string_matrix_map_t, 0 |  0 );
+  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_matrix, 0 |  0 );
   if (!SWIG_IsOK(res2)) {
-    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_jac_set" "', argument " "2"" of type '" "std::map< std::string,matrix_map > *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_jac_set" "', argument " "2"" of type '" "matrix *""'"); 
   }
-  arg2 = reinterpret_cast< std::map< std::string,matrix_map > * >(argp2);
+  arg2 = reinterpret_cast< matrix * >(argp2);
   if (arg1) (arg1)->jac = *arg2;
   resultobj = SWIG_Py_Void();
   return resultobj;
@@ -13574,7 +13697,7 @@ SWIGINTERN PyObject *_wrap_composition_map_jac_get(PyObject *SWIGUNUSEDPARM(self
   void *argp1 = 0 ;
   int res1 = 0 ;
   PyObject * obj0 = 0 ;
-  std::map< std::string,matrix_map > *result = 0 ;
+  matrix *result = 0 ;
   
   if (!PyArg_ParseTuple(args,(char *)"O:composition_map_jac_get",&obj0)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
@@ -13582,8 +13705,8 @@ SWIGINTERN PyObject *_wrap_composition_map_jac_get(PyObject *SWIGUNUSEDPARM(self
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_jac_get" "', argument " "1"" of type '" "composition_map *""'"); 
   }
   arg1 = reinterpret_cast< composition_map * >(argp1);
-  result = (std::map< std::string,matrix_map > *)& ((arg1)->jac);
-  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_std__mapT_std__string_matrix_map_t, 0 |  0 );
+  result = (matrix *)& ((arg1)->jac);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_matrix, 0 |  0 );
   return resultobj;
 fail:
   return NULL;
@@ -13727,6 +13850,185 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_composition_map_nspecies(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:composition_map_nspecies",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_nspecies" "', argument " "1"" of type '" "composition_map const *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  result = (int)((composition_map const *)arg1)->nspecies();
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_composition_map_index_species(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:composition_map_index_species",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_index_species" "', argument " "1"" of type '" "composition_map *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  (arg1)->index_species();
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_composition_map_index(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  std::string *arg2 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:composition_map_index",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_index" "', argument " "1"" of type '" "composition_map const *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_std__string,  0  | 0);
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_index" "', argument " "2"" of type '" "std::string const &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "composition_map_index" "', argument " "2"" of type '" "std::string const &""'"); 
+  }
+  arg2 = reinterpret_cast< std::string * >(argp2);
+  result = (int)((composition_map const *)arg1)->index((std::string const &)*arg2);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_composition_map_dense(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  matrix result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:composition_map_dense",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_dense" "', argument " "1"" of type '" "composition_map const *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  result = ((composition_map const *)arg1)->dense();
+  resultobj = SWIG_NewPointerObj((new matrix(static_cast< const matrix& >(result))), SWIGTYPE_p_matrix, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_composition_map_get_dt(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  std::string *arg2 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  matrix result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:composition_map_get_dt",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_get_dt" "', argument " "1"" of type '" "composition_map const *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_std__string,  0  | 0);
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_get_dt" "', argument " "2"" of type '" "std::string const &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "composition_map_get_dt" "', argument " "2"" of type '" "std::string const &""'"); 
+  }
+  arg2 = reinterpret_cast< std::string * >(argp2);
+  result = ((composition_map const *)arg1)->get_dt((std::string const &)*arg2);
+  resultobj = SWIG_NewPointerObj((new matrix(static_cast< const matrix& >(result))), SWIGTYPE_p_matrix, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_composition_map_get_jac(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  composition_map *arg1 = (composition_map *) 0 ;
+  std::string *arg2 = 0 ;
+  std::string *arg3 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  void *argp3 = 0 ;
+  int res3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  matrix result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:composition_map_get_jac",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_composition_map, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "composition_map_get_jac" "', argument " "1"" of type '" "composition_map const *""'"); 
+  }
+  arg1 = reinterpret_cast< composition_map * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_std__string,  0  | 0);
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "composition_map_get_jac" "', argument " "2"" of type '" "std::string const &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "composition_map_get_jac" "', argument " "2"" of type '" "std::string const &""'"); 
+  }
+  arg2 = reinterpret_cast< std::string * >(argp2);
+  res3 = SWIG_ConvertPtr(obj2, &argp3, SWIGTYPE_p_std__string,  0  | 0);
+  if (!SWIG_IsOK(res3)) {
+    SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "composition_map_get_jac" "', argument " "3"" of type '" "std::string const &""'"); 
+  }
+  if (!argp3) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "composition_map_get_jac" "', argument " "3"" of type '" "std::string const &""'"); 
+  }
+  arg3 = reinterpret_cast< std::string * >(argp3);
+  result = ((composition_map const *)arg1)->get_jac((std::string const &)*arg2,(std::string const &)*arg3);
+  resultobj = SWIG_NewPointerObj((new matrix(static_cast< const matrix& >(result))), SWIGTYPE_p_matrix, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_delete_composition_map(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   composition_map *arg1 = (composition_map *) 0 ;
@@ -14202,6 +14504,184 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_new_opa_houdek_context__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  std::string *arg1 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  opa_houdek_context *result = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:new_opa_houdek_context",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1, SWIGTYPE_p_std__string,  0  | 0);
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "new_opa_houdek_context" "', argument " "1"" of type '" "std::string const &""'"); 
+  }
+  if (!argp1) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "new_opa_houdek_context" "', argument " "1"" of type '" "std::string const &""'"); 
+  }
+  arg1 = reinterpret_cast< std::string * >(argp1);
+  result = (opa_houdek_context *)new opa_houdek_context((std::string const &)*arg1);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_opa_houdek_context, SWIG_POINTER_NEW |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_new_opa_houdek_context__SWIG_1(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  opa_houdek_context *result = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)":new_opa_houdek_context")) SWIG_fail;
+  result = (opa_houdek_context *)new opa_houdek_context();
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_opa_houdek_context, SWIG_POINTER_NEW |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_new_opa_houdek_context(PyObject *self, PyObject *args) {
+  Py_ssize_t argc;
+  PyObject *argv[2] = {
+    0
+  };
+  Py_ssize_t ii;
+  
+  if (!PyTuple_Check(args)) SWIG_fail;
+  argc = args ? PyObject_Length(args) : 0;
+  for (ii = 0; (ii < 1) && (ii < argc); ii++) {
+    argv[ii] = PyTuple_GET_ITEM(args,ii);
+  }
+  if (argc == 0) {
+    return _wrap_new_opa_houdek_context__SWIG_1(self, args);
+  }
+  if (argc == 1) {
+    int _v;
+    int res = SWIG_ConvertPtr(argv[0], 0, SWIGTYPE_p_std__string, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      return _wrap_new_opa_houdek_context__SWIG_0(self, args);
+    }
+  }
+  
+fail:
+  SWIG_SetErrorMsg(PyExc_NotImplementedError,"Wrong number or type of arguments for overloaded function 'new_opa_houdek_context'.\n"
+    "  Possible C/C++ prototypes are:\n"
+    "    opa_houdek_context::opa_houdek_context(std::string const &)\n"
+    "    opa_houdek_context::opa_houdek_context()\n");
+  return 0;
+}
+
+
+SWIGINTERN PyObject *_wrap_opa_houdek_context_evaluate(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  opa_houdek_context *arg1 = (opa_houdek_context *) 0 ;
+  matrix *arg2 = 0 ;
+  double arg3 ;
+  matrix *arg4 = 0 ;
+  matrix *arg5 = 0 ;
+  opa_struct *arg6 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  double val3 ;
+  int ecode3 = 0 ;
+  void *argp4 = 0 ;
+  int res4 = 0 ;
+  void *argp5 = 0 ;
+  int res5 = 0 ;
+  void *argp6 = 0 ;
+  int res6 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOO:opa_houdek_context_evaluate",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_opa_houdek_context, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "opa_houdek_context_evaluate" "', argument " "1"" of type '" "opa_houdek_context const *""'"); 
+  }
+  arg1 = reinterpret_cast< opa_houdek_context * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "opa_houdek_context_evaluate" "', argument " "2"" of type '" "matrix const &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "opa_houdek_context_evaluate" "', argument " "2"" of type '" "matrix const &""'"); 
+  }
+  arg2 = reinterpret_cast< matrix * >(argp2);
+  ecode3 = SWIG_AsVal_double(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "opa_houdek_context_evaluate" "', argument " "3"" of type '" "double""'");
+  } 
+  arg3 = static_cast< double >(val3);
+  res4 = SWIG_ConvertPtr(obj3, &argp4, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res4)) {
+    SWIG_exception_fail(SWIG_ArgError(res4), "in method '" "opa_houdek_context_evaluate" "', argument " "4"" of type '" "matrix const &""'"); 
+  }
+  if (!argp4) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "opa_houdek_context_evaluate" "', argument " "4"" of type '" "matrix const &""'"); 
+  }
+  arg4 = reinterpret_cast< matrix * >(argp4);
+  res5 = SWIG_ConvertPtr(obj4, &argp5, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res5)) {
+    SWIG_exception_fail(SWIG_ArgError(res5), "in method '" "opa_houdek_context_evaluate" "', argument " "5"" of type '" "matrix const &""'"); 
+  }
+  if (!argp5) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "opa_houdek_context_evaluate" "', argument " "5"" of type '" "matrix const &""'"); 
+  }
+  arg5 = reinterpret_cast< matrix * >(argp5);
+  res6 = SWIG_ConvertPtr(obj5, &argp6, SWIGTYPE_p_opa_struct,  0 );
+  if (!SWIG_IsOK(res6)) {
+    SWIG_exception_fail(SWIG_ArgError(res6), "in method '" "opa_houdek_context_evaluate" "', argument " "6"" of type '" "opa_struct &""'"); 
+  }
+  if (!argp6) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "opa_houdek_context_evaluate" "', argument " "6"" of type '" "opa_struct &""'"); 
+  }
+  arg6 = reinterpret_cast< opa_struct * >(argp6);
+  result = (int)((opa_houdek_context const *)arg1)->evaluate((matrix const &)*arg2,arg3,(matrix const &)*arg4,(matrix const &)*arg5,*arg6);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_delete_opa_houdek_context(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  opa_houdek_context *arg1 = (opa_houdek_context *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:delete_opa_houdek_context",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_opa_houdek_context, SWIG_POINTER_DISOWN |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "delete_opa_houdek_context" "', argument " "1"" of type '" "opa_houdek_context *""'"); 
+  }
+  arg1 = reinterpret_cast< opa_houdek_context * >(argp1);
+  delete arg1;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *opa_houdek_context_swigregister(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *obj;
+  if (!PyArg_ParseTuple(args,(char *)"O:swigregister", &obj)) return NULL;
+  SWIG_TypeNewClientData(SWIGTYPE_p_opa_houdek_context, SWIG_NewClientData(obj));
+  return SWIG_Py_Void();
+}
+
 SWIGINTERN PyObject *_wrap_opa_kramer(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   matrix *arg1 = 0 ;
@@ -14750,6 +15230,170 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_eos_freeeos(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  matrix *arg1 = 0 ;
+  double arg2 ;
+  matrix *arg3 = 0 ;
+  matrix *arg4 = 0 ;
+  matrix *arg5 = 0 ;
+  eos_struct *arg6 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  double val2 ;
+  int ecode2 = 0 ;
+  void *argp3 = 0 ;
+  int res3 = 0 ;
+  void *argp4 = 0 ;
+  int res4 = 0 ;
+  void *argp5 = 0 ;
+  int res5 = 0 ;
+  void *argp6 = 0 ;
+  int res6 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOO:eos_freeeos",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "eos_freeeos" "', argument " "1"" of type '" "matrix const &""'"); 
+  }
+  if (!argp1) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos" "', argument " "1"" of type '" "matrix const &""'"); 
+  }
+  arg1 = reinterpret_cast< matrix * >(argp1);
+  ecode2 = SWIG_AsVal_double(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "eos_freeeos" "', argument " "2"" of type '" "double""'");
+  } 
+  arg2 = static_cast< double >(val2);
+  res3 = SWIG_ConvertPtr(obj2, &argp3, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res3)) {
+    SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "eos_freeeos" "', argument " "3"" of type '" "matrix const &""'"); 
+  }
+  if (!argp3) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos" "', argument " "3"" of type '" "matrix const &""'"); 
+  }
+  arg3 = reinterpret_cast< matrix * >(argp3);
+  res4 = SWIG_ConvertPtr(obj3, &argp4, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res4)) {
+    SWIG_exception_fail(SWIG_ArgError(res4), "in method '" "eos_freeeos" "', argument " "4"" of type '" "matrix const &""'"); 
+  }
+  if (!argp4) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos" "', argument " "4"" of type '" "matrix const &""'"); 
+  }
+  arg4 = reinterpret_cast< matrix * >(argp4);
+  res5 = SWIG_ConvertPtr(obj4, &argp5, SWIGTYPE_p_matrix,  0 );
+  if (!SWIG_IsOK(res5)) {
+    SWIG_exception_fail(SWIG_ArgError(res5), "in method '" "eos_freeeos" "', argument " "5"" of type '" "matrix &""'"); 
+  }
+  if (!argp5) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos" "', argument " "5"" of type '" "matrix &""'"); 
+  }
+  arg5 = reinterpret_cast< matrix * >(argp5);
+  res6 = SWIG_ConvertPtr(obj5, &argp6, SWIGTYPE_p_eos_struct,  0 );
+  if (!SWIG_IsOK(res6)) {
+    SWIG_exception_fail(SWIG_ArgError(res6), "in method '" "eos_freeeos" "', argument " "6"" of type '" "eos_struct &""'"); 
+  }
+  if (!argp6) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos" "', argument " "6"" of type '" "eos_struct &""'"); 
+  }
+  arg6 = reinterpret_cast< eos_struct * >(argp6);
+  result = (int)eos_freeeos((matrix const &)*arg1,arg2,(matrix const &)*arg3,(matrix const &)*arg4,*arg5,*arg6);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_eos_freeeos_tab(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  matrix *arg1 = 0 ;
+  double arg2 ;
+  matrix *arg3 = 0 ;
+  matrix *arg4 = 0 ;
+  matrix *arg5 = 0 ;
+  eos_struct *arg6 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  double val2 ;
+  int ecode2 = 0 ;
+  void *argp3 = 0 ;
+  int res3 = 0 ;
+  void *argp4 = 0 ;
+  int res4 = 0 ;
+  void *argp5 = 0 ;
+  int res5 = 0 ;
+  void *argp6 = 0 ;
+  int res6 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOO:eos_freeeos_tab",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "eos_freeeos_tab" "', argument " "1"" of type '" "matrix const &""'"); 
+  }
+  if (!argp1) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos_tab" "', argument " "1"" of type '" "matrix const &""'"); 
+  }
+  arg1 = reinterpret_cast< matrix * >(argp1);
+  ecode2 = SWIG_AsVal_double(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "eos_freeeos_tab" "', argument " "2"" of type '" "double""'");
+  } 
+  arg2 = static_cast< double >(val2);
+  res3 = SWIG_ConvertPtr(obj2, &argp3, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res3)) {
+    SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "eos_freeeos_tab" "', argument " "3"" of type '" "matrix const &""'"); 
+  }
+  if (!argp3) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos_tab" "', argument " "3"" of type '" "matrix const &""'"); 
+  }
+  arg3 = reinterpret_cast< matrix * >(argp3);
+  res4 = SWIG_ConvertPtr(obj3, &argp4, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res4)) {
+    SWIG_exception_fail(SWIG_ArgError(res4), "in method '" "eos_freeeos_tab" "', argument " "4"" of type '" "matrix const &""'"); 
+  }
+  if (!argp4) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos_tab" "', argument " "4"" of type '" "matrix const &""'"); 
+  }
+  arg4 = reinterpret_cast< matrix * >(argp4);
+  res5 = SWIG_ConvertPtr(obj4, &argp5, SWIGTYPE_p_matrix,  0 );
+  if (!SWIG_IsOK(res5)) {
+    SWIG_exception_fail(SWIG_ArgError(res5), "in method '" "eos_freeeos_tab" "', argument " "5"" of type '" "matrix &""'"); 
+  }
+  if (!argp5) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos_tab" "', argument " "5"" of type '" "matrix &""'"); 
+  }
+  arg5 = reinterpret_cast< matrix * >(argp5);
+  res6 = SWIG_ConvertPtr(obj5, &argp6, SWIGTYPE_p_eos_struct,  0 );
+  if (!SWIG_IsOK(res6)) {
+    SWIG_exception_fail(SWIG_ArgError(res6), "in method '" "eos_freeeos_tab" "', argument " "6"" of type '" "eos_struct &""'"); 
+  }
+  if (!argp6) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "eos_freeeos_tab" "', argument " "6"" of type '" "eos_struct &""'"); 
+  }
+  arg6 = reinterpret_cast< eos_struct * >(argp6);
+  result = (int)eos_freeeos_tab((matrix const &)*arg1,arg2,(matrix const &)*arg3,(matrix const &)*arg4,*arg5,*arg6);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_atm_onelayer(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   matrix *arg1 = 0 ;
@@ -26425,6 +27069,110 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_star2d_test_energy_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  double arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  double val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:star2d_test_energy_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_test_energy_set" "', argument " "1"" of type '" "star2d *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  ecode2 = SWIG_AsVal_double(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "star2d_test_energy_set" "', argument " "2"" of type '" "double""'");
+  } 
+  arg2 = static_cast< double >(val2);
+  if (arg1) (arg1)->test_energy = arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_star2d_test_energy_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  double result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:star2d_test_energy_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_test_energy_get" "', argument " "1"" of type '" "star2d *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  result = (double) ((arg1)->test_energy);
+  resultobj = SWIG_From_double(static_cast< double >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_star2d_test_virial_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  double arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  double val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:star2d_test_virial_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_test_virial_set" "', argument " "1"" of type '" "star2d *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  ecode2 = SWIG_AsVal_double(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "star2d_test_virial_set" "', argument " "2"" of type '" "double""'");
+  } 
+  arg2 = static_cast< double >(val2);
+  if (arg1) (arg1)->test_virial = arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_star2d_test_virial_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  double result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:star2d_test_virial_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_test_virial_get" "', argument " "1"" of type '" "star2d *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  result = (double) ((arg1)->test_virial);
+  resultobj = SWIG_From_double(static_cast< double >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_star2d_stream(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   star2d *arg1 = (star2d *) 0 ;
@@ -26447,7 +27195,7 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_star2d_apparent_luminosity(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_star2d_apparent_luminosity__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   star2d *arg1 = (star2d *) 0 ;
   double arg2 ;
@@ -26478,6 +27226,90 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_star2d_apparent_luminosity__SWIG_1(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  matrix *arg2 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  matrix result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:star2d_apparent_luminosity",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_apparent_luminosity" "', argument " "1"" of type '" "star2d const *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_matrix,  0  | 0);
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "star2d_apparent_luminosity" "', argument " "2"" of type '" "matrix const &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "star2d_apparent_luminosity" "', argument " "2"" of type '" "matrix const &""'"); 
+  }
+  arg2 = reinterpret_cast< matrix * >(argp2);
+  result = ((star2d const *)arg1)->apparent_luminosity((matrix const &)*arg2);
+  resultobj = SWIG_NewPointerObj((new matrix(static_cast< const matrix& >(result))), SWIGTYPE_p_matrix, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_star2d_apparent_luminosity(PyObject *self, PyObject *args) {
+  Py_ssize_t argc;
+  PyObject *argv[3] = {
+    0
+  };
+  Py_ssize_t ii;
+  
+  if (!PyTuple_Check(args)) SWIG_fail;
+  argc = args ? PyObject_Length(args) : 0;
+  for (ii = 0; (ii < 2) && (ii < argc); ii++) {
+    argv[ii] = PyTuple_GET_ITEM(args,ii);
+  }
+  if (argc == 2) {
+    int _v;
+    void *vptr = 0;
+    int res = SWIG_ConvertPtr(argv[0], &vptr, SWIGTYPE_p_star2d, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      int res = SWIG_ConvertPtr(argv[1], 0, SWIGTYPE_p_matrix, 0);
+      _v = SWIG_CheckState(res);
+      if (_v) {
+        return _wrap_star2d_apparent_luminosity__SWIG_1(self, args);
+      }
+    }
+  }
+  if (argc == 2) {
+    int _v;
+    void *vptr = 0;
+    int res = SWIG_ConvertPtr(argv[0], &vptr, SWIGTYPE_p_star2d, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      {
+        int res = SWIG_AsVal_double(argv[1], NULL);
+        _v = SWIG_CheckState(res);
+      }
+      if (_v) {
+        return _wrap_star2d_apparent_luminosity__SWIG_0(self, args);
+      }
+    }
+  }
+  
+fail:
+  SWIG_SetErrorMsg(PyExc_NotImplementedError,"Wrong number or type of arguments for overloaded function 'star2d_apparent_luminosity'.\n"
+    "  Possible C/C++ prototypes are:\n"
+    "    star2d::apparent_luminosity(double) const\n"
+    "    star2d::apparent_luminosity(matrix const &) const\n");
+  return 0;
+}
+
+
 SWIGINTERN PyObject *_wrap_star2d_Lz(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   star2d *arg1 = (star2d *) 0 ;
@@ -26566,6 +27398,72 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_star2d_Iz(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  double result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:star2d_Iz",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_Iz" "', argument " "1"" of type '" "star2d const *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  result = (double)((star2d const *)arg1)->Iz();
+  resultobj = SWIG_From_double(static_cast< double >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_star2d_Ic(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  double result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:star2d_Ic",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_Ic" "', argument " "1"" of type '" "star2d const *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  result = (double)((star2d const *)arg1)->Ic();
+  resultobj = SWIG_From_double(static_cast< double >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_star2d_J2MR2(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  star2d *arg1 = (star2d *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  double result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:star2d_J2MR2",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_star2d, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "star2d_J2MR2" "', argument " "1"" of type '" "star2d const *""'"); 
+  }
+  arg1 = reinterpret_cast< star2d * >(argp1);
+  result = (double)((star2d const *)arg1)->J2MR2();
+  resultobj = SWIG_From_double(static_cast< double >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_star2d_fill(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   star2d *arg1 = (star2d *) 0 ;
@@ -29130,6 +30028,55 @@ SWIGINTERN PyObject *star_evol_swigregister(PyObject *SWIGUNUSEDPARM(self), PyOb
   return SWIG_Py_Void();
 }
 
+SWIGINTERN PyObject *_wrap_solve_poly1d(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  double arg1 ;
+  double arg2 ;
+  int arg3 ;
+  double arg4 ;
+  double val1 ;
+  int ecode1 = 0 ;
+  double val2 ;
+  int ecode2 = 0 ;
+  int val3 ;
+  int ecode3 = 0 ;
+  double val4 ;
+  int ecode4 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  matrix result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOO:solve_poly1d",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  ecode1 = SWIG_AsVal_double(obj0, &val1);
+  if (!SWIG_IsOK(ecode1)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "solve_poly1d" "', argument " "1"" of type '" "double""'");
+  } 
+  arg1 = static_cast< double >(val1);
+  ecode2 = SWIG_AsVal_double(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "solve_poly1d" "', argument " "2"" of type '" "double""'");
+  } 
+  arg2 = static_cast< double >(val2);
+  ecode3 = SWIG_AsVal_int(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "solve_poly1d" "', argument " "3"" of type '" "int""'");
+  } 
+  arg3 = static_cast< int >(val3);
+  ecode4 = SWIG_AsVal_double(obj3, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "solve_poly1d" "', argument " "4"" of type '" "double""'");
+  } 
+  arg4 = static_cast< double >(val4);
+  result = solve_poly1d(arg1,arg2,arg3,arg4);
+  resultobj = SWIG_NewPointerObj((new matrix(static_cast< const matrix& >(result))), SWIGTYPE_p_matrix, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_plt_init__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   bool arg1 ;
@@ -31181,6 +32128,7 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"pow", _wrap_pow, METH_VARARGS, NULL},
 	 { (char *)"matrix_solve", _wrap_matrix_solve, METH_VARARGS, NULL},
 	 { (char *)"matrix_inv", _wrap_matrix_inv, METH_VARARGS, NULL},
+	 { (char *)"matrix_data_address", _wrap_matrix_data_address, METH_VARARGS, NULL},
 	 { (char *)"matrix_swigregister", matrix_swigregister, METH_VARARGS, NULL},
 	 { (char *)"delete_matrix_block_diag", _wrap_delete_matrix_block_diag, METH_VARARGS, NULL},
 	 { (char *)"new_matrix_block_diag", _wrap_new_matrix_block_diag, METH_VARARGS, NULL},
@@ -31300,6 +32248,8 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"new_atm_struct", _wrap_new_atm_struct, METH_VARARGS, NULL},
 	 { (char *)"delete_atm_struct", _wrap_delete_atm_struct, METH_VARARGS, NULL},
 	 { (char *)"atm_struct_swigregister", atm_struct_swigregister, METH_VARARGS, NULL},
+	 { (char *)"composition_map_species_set", _wrap_composition_map_species_set, METH_VARARGS, NULL},
+	 { (char *)"composition_map_species_get", _wrap_composition_map_species_get, METH_VARARGS, NULL},
 	 { (char *)"composition_map_dt_set", _wrap_composition_map_dt_set, METH_VARARGS, NULL},
 	 { (char *)"composition_map_dt_get", _wrap_composition_map_dt_get, METH_VARARGS, NULL},
 	 { (char *)"composition_map_jac_set", _wrap_composition_map_jac_set, METH_VARARGS, NULL},
@@ -31308,6 +32258,12 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"composition_map_X", _wrap_composition_map_X, METH_VARARGS, NULL},
 	 { (char *)"composition_map_Y", _wrap_composition_map_Y, METH_VARARGS, NULL},
 	 { (char *)"composition_map_Z", _wrap_composition_map_Z, METH_VARARGS, NULL},
+	 { (char *)"composition_map_nspecies", _wrap_composition_map_nspecies, METH_VARARGS, NULL},
+	 { (char *)"composition_map_index_species", _wrap_composition_map_index_species, METH_VARARGS, NULL},
+	 { (char *)"composition_map_index", _wrap_composition_map_index, METH_VARARGS, NULL},
+	 { (char *)"composition_map_dense", _wrap_composition_map_dense, METH_VARARGS, NULL},
+	 { (char *)"composition_map_get_dt", _wrap_composition_map_get_dt, METH_VARARGS, NULL},
+	 { (char *)"composition_map_get_jac", _wrap_composition_map_get_jac, METH_VARARGS, NULL},
 	 { (char *)"delete_composition_map", _wrap_delete_composition_map, METH_VARARGS, NULL},
 	 { (char *)"composition_map_swigregister", composition_map_swigregister, METH_VARARGS, NULL},
 	 { (char *)"opa_calc", _wrap_opa_calc, METH_VARARGS, NULL},
@@ -31316,6 +32272,10 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"atm_calc", _wrap_atm_calc, METH_VARARGS, NULL},
 	 { (char *)"opa_opal", _wrap_opa_opal, METH_VARARGS, NULL},
 	 { (char *)"opa_houdek", _wrap_opa_houdek, METH_VARARGS, NULL},
+	 { (char *)"new_opa_houdek_context", _wrap_new_opa_houdek_context, METH_VARARGS, NULL},
+	 { (char *)"opa_houdek_context_evaluate", _wrap_opa_houdek_context_evaluate, METH_VARARGS, NULL},
+	 { (char *)"delete_opa_houdek_context", _wrap_delete_opa_houdek_context, METH_VARARGS, NULL},
+	 { (char *)"opa_houdek_context_swigregister", opa_houdek_context_swigregister, METH_VARARGS, NULL},
 	 { (char *)"opa_kramer", _wrap_opa_kramer, METH_VARARGS, NULL},
 	 { (char *)"opa_cesam", _wrap_opa_cesam, METH_VARARGS, NULL},
 	 { (char *)"nuc_simple", _wrap_nuc_simple, METH_VARARGS, NULL},
@@ -31324,6 +32284,8 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"eos_ideal", _wrap_eos_ideal, METH_VARARGS, NULL},
 	 { (char *)"eos_idealrad", _wrap_eos_idealrad, METH_VARARGS, NULL},
 	 { (char *)"eos_opal", _wrap_eos_opal, METH_VARARGS, NULL},
+	 { (char *)"eos_freeeos", _wrap_eos_freeeos, METH_VARARGS, NULL},
+	 { (char *)"eos_freeeos_tab", _wrap_eos_freeeos_tab, METH_VARARGS, NULL},
 	 { (char *)"atm_onelayer", _wrap_atm_onelayer, METH_VARARGS, NULL},
 	 { (char *)"initial_composition", _wrap_initial_composition, METH_VARARGS, NULL},
 	 { (char *)"mapping_gl_set", _wrap_mapping_gl_set, METH_VARARGS, NULL},
@@ -31652,12 +32614,19 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"star2d_virial_ps", _wrap_star2d_virial_ps, METH_VARARGS, NULL},
 	 { (char *)"star2d_virial", _wrap_star2d_virial, METH_VARARGS, NULL},
 	 { (char *)"star2d_energy_test", _wrap_star2d_energy_test, METH_VARARGS, NULL},
+	 { (char *)"star2d_test_energy_set", _wrap_star2d_test_energy_set, METH_VARARGS, NULL},
+	 { (char *)"star2d_test_energy_get", _wrap_star2d_test_energy_get, METH_VARARGS, NULL},
+	 { (char *)"star2d_test_virial_set", _wrap_star2d_test_virial_set, METH_VARARGS, NULL},
+	 { (char *)"star2d_test_virial_get", _wrap_star2d_test_virial_get, METH_VARARGS, NULL},
 	 { (char *)"star2d_stream", _wrap_star2d_stream, METH_VARARGS, NULL},
 	 { (char *)"star2d_apparent_luminosity", _wrap_star2d_apparent_luminosity, METH_VARARGS, NULL},
 	 { (char *)"star2d_Lz", _wrap_star2d_Lz, METH_VARARGS, NULL},
 	 { (char *)"star2d_Mcore", _wrap_star2d_Mcore, METH_VARARGS, NULL},
 	 { (char *)"star2d_Lzcore", _wrap_star2d_Lzcore, METH_VARARGS, NULL},
 	 { (char *)"star2d_Rcore", _wrap_star2d_Rcore, METH_VARARGS, NULL},
+	 { (char *)"star2d_Iz", _wrap_star2d_Iz, METH_VARARGS, NULL},
+	 { (char *)"star2d_Ic", _wrap_star2d_Ic, METH_VARARGS, NULL},
+	 { (char *)"star2d_J2MR2", _wrap_star2d_J2MR2, METH_VARARGS, NULL},
 	 { (char *)"star2d_fill", _wrap_star2d_fill, METH_VARARGS, NULL},
 	 { (char *)"star2d_remap", _wrap_star2d_remap, METH_VARARGS, NULL},
 	 { (char *)"star2d_remap_domains", _wrap_star2d_remap_domains, METH_VARARGS, NULL},
@@ -31715,6 +32684,7 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"star_evol_solve_Omega", _wrap_star_evol_solve_Omega, METH_VARARGS, NULL},
 	 { (char *)"delete_star_evol", _wrap_delete_star_evol, METH_VARARGS, NULL},
 	 { (char *)"star_evol_swigregister", star_evol_swigregister, METH_VARARGS, NULL},
+	 { (char *)"solve_poly1d", _wrap_solve_poly1d, METH_VARARGS, NULL},
 	 { (char *)"plt_init", _wrap_plt_init, METH_VARARGS, NULL},
 	 { (char *)"plt_subplot", _wrap_plt_subplot, METH_VARARGS, NULL},
 	 { (char *)"plt_plot", _wrap_plt_plot, METH_VARARGS, NULL},
@@ -31785,6 +32755,7 @@ static swig_type_info _swigt__p_matrix_block_diag = {"_p_matrix_block_diag", "ma
 static swig_type_info _swigt__p_matrix_map = {"_p_matrix_map", "matrix_map *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_matrix_map_elem = {"_p_matrix_map_elem", "matrix_map_elem *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_nuc_struct = {"_p_nuc_struct", "nuc_struct *", 0, 0, (void*)0, 0};
+static swig_type_info _swigt__p_opa_houdek_context = {"_p_opa_houdek_context", "opa_houdek_context *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_opa_struct = {"_p_opa_struct", "opa_struct *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_p_char = {"_p_p_char", "char **", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_p_int = {"_p_p_int", "int **", 0, 0, (void*)0, 0};
@@ -31798,9 +32769,9 @@ static swig_type_info _swigt__p_star2d__config_struct = {"_p_star2d__config_stru
 static swig_type_info _swigt__p_star2d__units_struct = {"_p_star2d__units_struct", "star2d::units_struct *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_star2d__version_struct = {"_p_star2d__version_struct", "star2d::version_struct *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_star_evol = {"_p_star_evol", "star_evol *", 0, 0, (void*)0, 0};
-static swig_type_info _swigt__p_std__mapT_std__string_matrix_map_t = {"_p_std__mapT_std__string_matrix_map_t", "std::map< std::string,matrix_map > *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_std__string = {"_p_std__string", "std::string *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_std__vectorT_int_t = {"_p_std__vectorT_int_t", "std::vector< int > *", 0, 0, (void*)0, 0};
+static swig_type_info _swigt__p_std__vectorT_std__string_t = {"_p_std__vectorT_std__string_t", "std::vector< std::string > *", 0, 0, (void*)0, 0};
 static swig_type_info _swigt__p_tiempo = {"_p_tiempo", "tiempo *", 0, 0, (void*)0, 0};
 
 static swig_type_info *swig_type_initial[] = {
@@ -31824,6 +32795,7 @@ static swig_type_info *swig_type_initial[] = {
   &_swigt__p_matrix_map,
   &_swigt__p_matrix_map_elem,
   &_swigt__p_nuc_struct,
+  &_swigt__p_opa_houdek_context,
   &_swigt__p_opa_struct,
   &_swigt__p_p_char,
   &_swigt__p_p_int,
@@ -31837,9 +32809,9 @@ static swig_type_info *swig_type_initial[] = {
   &_swigt__p_star2d__units_struct,
   &_swigt__p_star2d__version_struct,
   &_swigt__p_star_evol,
-  &_swigt__p_std__mapT_std__string_matrix_map_t,
   &_swigt__p_std__string,
   &_swigt__p_std__vectorT_int_t,
+  &_swigt__p_std__vectorT_std__string_t,
   &_swigt__p_tiempo,
 };
 
@@ -31863,6 +32835,7 @@ static swig_cast_info _swigc__p_matrix_block_diag[] = {  {&_swigt__p_matrix_bloc
 static swig_cast_info _swigc__p_matrix_map[] = {  {&_swigt__p_composition_map, _p_composition_mapTo_p_matrix_map, 0, 0},  {&_swigt__p_matrix_map, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_matrix_map_elem[] = {  {&_swigt__p_matrix_map_elem, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_nuc_struct[] = {  {&_swigt__p_nuc_struct, 0, 0, 0},{0, 0, 0, 0}};
+static swig_cast_info _swigc__p_opa_houdek_context[] = {  {&_swigt__p_opa_houdek_context, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_opa_struct[] = {  {&_swigt__p_opa_struct, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_p_char[] = {  {&_swigt__p_p_char, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_p_intArray[] = {{&_swigt__p_p_intArray, 0, 0, 0},{0, 0, 0, 0}};
@@ -31876,9 +32849,9 @@ static swig_cast_info _swigc__p_star2d__config_struct[] = {  {&_swigt__p_star2d_
 static swig_cast_info _swigc__p_star2d__units_struct[] = {  {&_swigt__p_star2d__units_struct, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_star2d__version_struct[] = {  {&_swigt__p_star2d__version_struct, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_star_evol[] = {  {&_swigt__p_star_evol, 0, 0, 0},{0, 0, 0, 0}};
-static swig_cast_info _swigc__p_std__mapT_std__string_matrix_map_t[] = {  {&_swigt__p_std__mapT_std__string_matrix_map_t, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_std__string[] = {  {&_swigt__p_std__string, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_std__vectorT_int_t[] = {  {&_swigt__p_std__vectorT_int_t, 0, 0, 0},{0, 0, 0, 0}};
+static swig_cast_info _swigc__p_std__vectorT_std__string_t[] = {  {&_swigt__p_std__vectorT_std__string_t, 0, 0, 0},{0, 0, 0, 0}};
 static swig_cast_info _swigc__p_tiempo[] = {  {&_swigt__p_tiempo, 0, 0, 0},{0, 0, 0, 0}};
 
 static swig_cast_info *swig_cast_initial[] = {
@@ -31902,6 +32875,7 @@ static swig_cast_info *swig_cast_initial[] = {
   _swigc__p_matrix_map,
   _swigc__p_matrix_map_elem,
   _swigc__p_nuc_struct,
+  _swigc__p_opa_houdek_context,
   _swigc__p_opa_struct,
   _swigc__p_p_char,
   _swigc__p_p_int,
@@ -31915,9 +32889,9 @@ static swig_cast_info *swig_cast_initial[] = {
   _swigc__p_star2d__units_struct,
   _swigc__p_star2d__version_struct,
   _swigc__p_star_evol,
-  _swigc__p_std__mapT_std__string_matrix_map_t,
   _swigc__p_std__string,
   _swigc__p_std__vectorT_int_t,
+  _swigc__p_std__vectorT_std__string_t,
   _swigc__p_tiempo,
 };
 
@@ -306,6 +306,19 @@ class matrix(_object):
 
     def inv(self):
         return _ester_wrap.matrix_inv(self)
+
+    def data_address(self):
+        return _ester_wrap.matrix_data_address(self)
+
+    @property
+    def __array_interface__(self):
+        import sys
+        return {'version': 3,
+                'typestr': ('<f8' if sys.byteorder == 'little' else '>f8'),
+                'shape': (self.nrows(), self.ncols()),
+                'strides': (8, 8*self.nrows()),
+                'data': (self.data_address(), False)}
+
 matrix_swigregister = _ester_wrap.matrix_swigregister
 matrix_swigregister(matrix)
 
@@ -812,6 +825,10 @@ class composition_map(matrix_map):
         __swig_getmethods__.update(getattr(_s, '__swig_getmethods__', {}))
     __getattr__ = lambda self, name: _swig_getattr(self, composition_map, name)
     __repr__ = _swig_repr
+    __swig_setmethods__["species"] = _ester_wrap.composition_map_species_set
+    __swig_getmethods__["species"] = _ester_wrap.composition_map_species_get
+    if _newclass:
+        species = _swig_property(_ester_wrap.composition_map_species_get, _ester_wrap.composition_map_species_set)
     __swig_setmethods__["dt"] = _ester_wrap.composition_map_dt_set
     __swig_getmethods__["dt"] = _ester_wrap.composition_map_dt_get
     if _newclass:
@@ -836,6 +853,24 @@ class composition_map(matrix_map):
 
     def Z(self):
         return _ester_wrap.composition_map_Z(self)
+
+    def nspecies(self):
+        return _ester_wrap.composition_map_nspecies(self)
+
+    def index_species(self):
+        return _ester_wrap.composition_map_index_species(self)
+
+    def index(self, name):
+        return _ester_wrap.composition_map_index(self, name)
+
+    def dense(self):
+        return _ester_wrap.composition_map_dense(self)
+
+    def get_dt(self, name):
+        return _ester_wrap.composition_map_get_dt(self, name)
+
+    def get_jac(self, name1, name2):
+        return _ester_wrap.composition_map_get_jac(self, name1, name2)
     __swig_destroy__ = _ester_wrap.delete_composition_map
     __del__ = lambda self: None
 composition_map_swigregister = _ester_wrap.composition_map_swigregister
@@ -865,6 +900,27 @@ opa_opal = _ester_wrap.opa_opal
 def opa_houdek(X, Z, T, rho, opa):
     return _ester_wrap.opa_houdek(X, Z, T, rho, opa)
 opa_houdek = _ester_wrap.opa_houdek
+class opa_houdek_context(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, opa_houdek_context, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, opa_houdek_context, name)
+    __repr__ = _swig_repr
+
+    def __init__(self, *args):
+        this = _ester_wrap.new_opa_houdek_context(*args)
+        try:
+            self.this.append(this)
+        except __builtin__.Exception:
+            self.this = this
+
+    def evaluate(self, X, Z, T, rho, opa):
+        return _ester_wrap.opa_houdek_context_evaluate(self, X, Z, T, rho, opa)
+    __swig_destroy__ = _ester_wrap.delete_opa_houdek_context
+    __del__ = lambda self: None
+opa_houdek_context_swigregister = _ester_wrap.opa_houdek_context_swigregister
+opa_houdek_context_swigregister(opa_houdek_context)
+
 
 def opa_kramer(T, rho, opa):
     return _ester_wrap.opa_kramer(T, rho, opa)
@@ -898,6 +954,14 @@ def eos_opal(X, Z, T, p, rho, eos):
     return _ester_wrap.eos_opal(X, Z, T, p, rho, eos)
 eos_opal = _ester_wrap.eos_opal
 
+def eos_freeeos(X, Z, T, p, rho, eos):
+    return _ester_wrap.eos_freeeos(X, Z, T, p, rho, eos)
+eos_freeeos = _ester_wrap.eos_freeeos
+
+def eos_freeeos_tab(X, Z, T, p, rho, eos):
+    return _ester_wrap.eos_freeeos_tab(X, Z, T, p, rho, eos)
+eos_freeeos_tab = _ester_wrap.eos_freeeos_tab
+
 def atm_onelayer(X, Z, g, Teff, eos_name, opa_name, atm):
     return _ester_wrap.atm_onelayer(X, Z, g, Teff, eos_name, opa_name, atm)
 atm_onelayer = _ester_wrap.atm_onelayer
@@ -1719,12 +1783,20 @@ class star2d(_object):
 
     def energy_test(self):
         return _ester_wrap.star2d_energy_test(self)
+    __swig_setmethods__["test_energy"] = _ester_wrap.star2d_test_energy_set
+    __swig_getmethods__["test_energy"] = _ester_wrap.star2d_test_energy_get
+    if _newclass:
+        test_energy = _swig_property(_ester_wrap.star2d_test_energy_get, _ester_wrap.star2d_test_energy_set)
+    __swig_setmethods__["test_virial"] = _ester_wrap.star2d_test_virial_set
+    __swig_getmethods__["test_virial"] = _ester_wrap.star2d_test_virial_get
+    if _newclass:
+        test_virial = _swig_property(_ester_wrap.star2d_test_virial_get, _ester_wrap.star2d_test_virial_set)
 
     def stream(self):
         return _ester_wrap.star2d_stream(self)
 
-    def apparent_luminosity(self, i):
-        return _ester_wrap.star2d_apparent_luminosity(self, i)
+    def apparent_luminosity(self, *args):
+        return _ester_wrap.star2d_apparent_luminosity(self, *args)
 
     def Lz(self):
         return _ester_wrap.star2d_Lz(self)
@@ -1738,6 +1810,15 @@ class star2d(_object):
     def Rcore(self):
         return _ester_wrap.star2d_Rcore(self)
 
+    def Iz(self):
+        return _ester_wrap.star2d_Iz(self)
+
+    def Ic(self):
+        return _ester_wrap.star2d_Ic(self)
+
+    def J2MR2(self):
+        return _ester_wrap.star2d_J2MR2(self)
+
     def fill(self):
         return _ester_wrap.star2d_fill(self)
 
@@ -1933,6 +2014,10 @@ class star_evol(star2d):
 star_evol_swigregister = _ester_wrap.star_evol_swigregister
 star_evol_swigregister(star_evol)
 
+
+def solve_poly1d(n, tol, nr, hsurf):
+    return _ester_wrap.solve_poly1d(n, tol, nr, hsurf)
+solve_poly1d = _ester_wrap.solve_poly1d
 class plt(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, plt, name, value)
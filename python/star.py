@@ -1,8 +1,34 @@
 from numpy import *
 from matplotlib.pyplot import *
 import os
-import struct
-import tempfile
+import subprocess
+
+try:
+	from ester import meridional_plane
+except ImportError:
+	# star.py used without the ester package
+	class meridional_plane:
+		# Mesh of the whole meridional plane, made of the four quadrants
+		# mirrored from a (nr,nth) grid (equator first, pole last), see
+		# ester.meridional_plane
+		def __init__(self,x,y):
+			n=x.shape[-1]
+			i=arange(n)
+			self.columns=r_[i,i[-2::-1],i[1:],i[-2::-1]]
+			one=ones(n-1)
+			sx=r_[ones(n),-one,-one,one]
+			sy=r_[ones(n),one,-one,-one]
+			self._sign11=sx*sy
+			self.x=self.mirror(x)
+			self.x*=sx
+			self.y=self.mirror(y)
+			self.y*=sy
+
+		def mirror(self,f,parity=0,out=None):
+			out=take(f,self.columns,axis=-1,out=out)
+			if parity:
+				out*=self._sign11
+			return out
 
 rcParams['patch.antialiased']=False
 
@@ -17,6 +43,83 @@ M_SUN=1.9891e33;
 R_SUN=6.95508e10;
 L_SUN=3.8396e33;
 
+# Fields of 'ester output' that are not (nr,nth) matrices, by shape
+_SCALARS=set(['M','L','R','Omega','Omega_bk','Omegac','R_R_SUN','M_M_SUN','L_L_SUN',
+		'virial','energy_test','surff','X','Z','Xc','rhoc','pc','Tc','Rp','Re',
+		'Rp_R_SUN','Re_R_SUN','Mcore','Lz','Lzcore'])
+_STRINGS=('opa','eos')
+
+def _shape(x,A):
+	# shape (in Fortran order) of the field x of model A
+	nr,nth=A.nr,A.nth
+	shapes={'Teff':(nth,),'gsup':(nth,),'It':(nth,),'I':(nr,),
+		'th':(1,nth),'z':(nr,1),'D':(nr,nr),'Dt':(nth,nth),'Dt2':(nth,nth),
+		'Dtodd':(nth,nth)}
+	if x in _SCALARS:
+		return ()
+	if x in shapes:
+		return shapes[x]
+	if x=='xif':
+		return (A.ndomains+1,1)
+	if x=='map_R':
+		return (A.ndomains,nth)
+	if x=='rex' or x=='phiex':
+		return (A.nex,nth)
+	if x=='Dex':
+		return (A.nex,A.nex)
+	return (nr,nth)
+
+def _readinto(fp,a):
+	# fill the contiguous array a from the stream fp
+	b=a.reshape(-1).view(uint8)
+	n=0
+	while n<b.size:
+		k=fp.readinto(b[n:])
+		if not k:
+			raise ValueError("Error reading file")
+		n+=k
+	return a
+
+def _read(fp,n,dtype='d'):
+	return _readinto(fp,empty(n,dtype))
+
+class _output(object):
+	# 'ester output' of a model for the template conf+fields, as a stream of
+	# binary values. Strings (null-terminated) are output last, so that all
+	# the other fields can be read directly into arrays of known sizes.
+	def __init__(self,file,conf,header,names):
+		self.names=[x for x in names if x not in _STRINGS]
+		self.strings=[x for x in names if x in _STRINGS]
+		template=conf+''.join(['${'+x+'}' for x in header+self.names+self.strings])
+		self.proc=subprocess.Popen(['ester','output',file],
+				stdin=subprocess.PIPE,stdout=subprocess.PIPE)
+		self.fp=self.proc.stdout
+		try:
+			self.proc.stdin.write(template.encode())
+			self.proc.stdin.close()
+		except (IOError,OSError):
+			# ester exited early: reading its output fails below
+			pass
+
+	def read_fields(self,A):
+		# fields and strings, once the dimensions of A are known
+		for x in self.names:
+			x=x.replace('/','_').replace('.','_')
+			shape=_shape(x,A)
+			a=_read(self.fp,int(prod(shape)))
+			setattr(A,x,float(a[0]) if shape==() else a.reshape(shape,order='F'))
+		strings=self.fp.read().split(b'\x00')
+		if self.proc.wait() or len(strings)<len(self.strings):
+			raise ValueError("Error reading file")
+		for x,v in zip(self.strings,strings):
+			setattr(A,x,v.decode())
+
+	def close(self):
+		self.fp.close()
+		if self.proc.poll() is None:
+			self.proc.kill()
+			self.proc.wait()
+
 class star2d:
 	def __init__(self,file):
 		names=['th','z','D','r','Dt','Dt2','xif','surff','Omega','Omega_bk','Omegac','X','Z','Xc',
@@ -28,70 +131,16 @@ class star2d:
 				'It','map.R','vr','vt','virial','energy_test','eos.s','opa','eos',
 				'Xr','Yr','Zr','X_H','X_He3','X_He4','X_C12','X_C13','X_N14','X_N15','X_O16',
 				'X_O17','Mcore','Lz','Lzcore']
-		fd,template_file=tempfile.mkstemp(prefix='star_template_',suffix='.tmp')
-		fp=os.fdopen(fd,'w')
-		fp.write('\\conf{equator=0}\n\\conf{pole=0}\n\\conf{dim=1}\n')
-		fp.write('${nr}${nth}${nex}${ndomains}${npts}${conv}')
-		for x in names:
-			fp.write('${'+x+'}')
-		fp.close()
-		fd,out_file=tempfile.mkstemp(prefix='star_out_',suffix='.tmp')
-		status=os.system('ester output '+file+' < '+template_file+' > '+out_file)
-		if status:
-			raise ValueError("Error reading file")
-		fp=os.fdopen(fd,'rb')
-		self.nr=struct.unpack('i',fp.read(4))[0]
-		self.nth=struct.unpack('i',fp.read(4))[0]+2
-		self.nex=struct.unpack('i',fp.read(4))[0]
-		self.ndomains=struct.unpack('i',fp.read(4))[0]
-		self.npts=fromfile(fp,'i',self.ndomains)
-		self.conv=struct.unpack('i',fp.read(4))[0]
-		for x in names:
-			x=x.replace('/','_')
-			x=x.replace('.','_')
-			if x=='eps' or x=='eps_c' or x=='M' or x=='L' or x=='Omega_bk' or x=='R' or x=='Omega' \
-				 or x=='Omegac' or x=='R_R_SUN' or x=='Omega_bk' or x=='M_M_SUN' or x=='L_L_SUN' \
-				 or x=='virial' or x=='energy_test' or x=='surff' or x=='X' or x=='Z' or x=='Xc' \
-				 or x=='rhoc' or x=='pc' or x=='Tc' or x=='Rp' or x=='Re' or x=='Rp_R_SUN' or x=='Re_R_SUN' \
-				 or x=='Mcore' or x=='Lz' or x=='Lzcore':
-				s="self."+x+"=struct.unpack('d',fp.read(8))[0]"
-			elif x=='opa' or x=='eos':
-				c=list();
-				cc=fp.read(1);
-				while not cc=='\x00':
-					c.append(cc);
-					cc=fp.read(1);
-				s=str();
-				s=s.join(c);
-				s="self."+x+"='"+s+"'"
-			elif x=='Teff' or x=='gsup':
-				s="self."+x+"=fromfile(fp,'d',"+str(self.nth)+")"
-			elif x=='I':
-				s="self."+x+"=fromfile(fp,'d',"+str(self.nr)+")"
-			elif x=='It':
-				s="self."+x+"=fromfile(fp,'d',"+str(self.nth)+")"
-			elif x=='th':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nth)+"),[1,"+str(self.nth)+"],'F')"
-			elif x=='z':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nr)+"),["+str(self.nr)+",1],'F')"
-			elif x=='xif':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.ndomains+1)+"),["+str(self.ndomains+1)+",1],'F')"
-			elif x=='D':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nr*self.nr)+"),["+str(self.nr)+","+str(self.nr)+"],'F')"
-			elif x=='Dt' or x=='Dt2' or x=='Dtodd':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nth*self.nth)+"),["+str(self.nth)+","+str(self.nth)+"],'F')"
-			elif x=='map_R':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str((self.ndomains)*self.nth)+"),["+str(self.ndomains)+","+str(self.nth)+"],'F')"
-			elif x=='rex' or x=='phiex':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nex*self.nth)+"),["+str(self.nex)+","+str(self.nth)+"],'F')"
-			elif x=='Dex':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nex*self.nex)+"),["+str(self.nex)+","+str(self.nex)+"],'F')"
-			else:
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nr*self.nth)+"),["+str(self.nr)+","+str(self.nth)+"],'F')"
-			exec(s)
-		fp.close()
-		os.system('rm '+template_file)
-		os.system('rm '+out_file)
+		out=_output(file,'\\conf{equator=1}\n\\conf{pole=1}\n\\conf{dim=1}\n',
+				['nr','nth','nex','ndomains','npts','conv'],names)
+		try:
+			self.nr,self.nth,self.nex,self.ndomains=[int(n) for n in _read(out.fp,4,'i')]
+			self.nth+=2
+			self.npts=_read(out.fp,self.ndomains,'i')
+			self.conv=int(_read(out.fp,1,'i')[0])
+			out.read_fields(self)
+		finally:
+			out.close()
 		self.th=dot(ones((self.nr,1)),self.th)
 		self.z=dot(self.z,ones((1,self.nth)))
 		self.rz=dot(self.D,self.r)
@@ -105,63 +154,38 @@ class star2d:
 		self.gzt[0,:]=0
 		self.gtt=1./self.r**2
 	
+	def plane(self):
+		# mirrored mesh of the meridional plane, in units of R_SUN, built
+		# once and shared by all the draw functions
+		if getattr(self,'_plane',None) is None:
+			self._plane=meridional_plane(self.r*sin(self.th)/R_SUN,self.r*cos(self.th)/R_SUN)
+		return self._plane
+
 	def draw(self,z,**kwargs):
-		x=self.r*sin(self.th)/R_SUN
-		y=self.r*cos(self.th)/R_SUN
-		x=c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-		y=c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
-		z=c_[z,z[:,-2::-1],z[:,1:],z[:,-2::-1]]
-		h=pcolor(x,y,z,**kwargs)
+		P=self.plane()
+		h=pcolor(P.x,P.y,P.mirror(z),**kwargs)
 		axis('scaled')
 		return h
 		
 	def draw11(self,z,**kwargs):
-		x=self.r*sin(self.th)/R_SUN
-		y=self.r*cos(self.th)/R_SUN
-		x=c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-		y=c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
-		z=c_[z,-z[:,-2::-1],z[:,1:],-z[:,-2::-1]]
-		h=pcolor(x,y,z,**kwargs)
+		P=self.plane()
+		h=pcolor(P.x,P.y,P.mirror(z,1),**kwargs)
 		axis('scaled')
 		return h
 		
-	def drawc(self,z,N=7,**kwargs):
-		x=self.r*sin(self.th)/R_SUN
-		y=self.r*cos(self.th)/R_SUN
-		x=c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-		y=c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
-		z=c_[z,z[:,-2::-1],z[:,1:],z[:,-2::-1]]
+	def drawc(self,z,N=7,parity=0,**kwargs):
+		P=self.plane()
 		hh=ishold()
-		xs=self.r[-1]*sin(self.th[-1])/R_SUN
-		ys=self.r[-1]*cos(self.th[-1])/R_SUN
-		xs=r_[xs,-xs[-2::-1],-xs[1:],xs[-2::-1]]
-		ys=r_[ys,ys[-2::-1],-ys[1:],-ys[-2::-1]]
-		plot(xs,ys,'k')
+		plot(P.x[-1],P.y[-1],'k')
 		if not hh:
 			hold(True)
-		h=contour(x,y,z,N,**kwargs)
+		h=contour(P.x,P.y,P.mirror(z,parity),N,**kwargs)
 		axis('scaled')
 		hold(hh)
 		return h
 	
 	def drawc11(self,z,N=7,**kwargs):
-		x=self.r*sin(self.th)/R_SUN
-		y=self.r*cos(self.th)/R_SUN
-		x=c_[x,-x[:,-2::-1],-x[:,1:],x[:,-2::-1]]
-		y=c_[y,y[:,-2::-1],-y[:,1:],-y[:,-2::-1]]
-		z=c_[z,-z[:,-2::-1],z[:,1:],-z[:,-2::-1]]
-		hh=ishold()
-		xs=self.r[-1]*sin(self.th[-1])/R_SUN
-		ys=self.r[-1]*cos(self.th[-1])/R_SUN
-		xs=r_[xs,-xs[-2::-1],-xs[1:],xs[-2::-1]]
-		ys=r_[ys,ys[-2::-1],-ys[1:],-ys[-2::-1]]
-		plot(xs,ys,'k')
-		if not hh:
-			hold(True)
-		h=contour(x,y,z,N,**kwargs)
-		axis('scaled')
-		hold(hh)
-		return h
+		return self.drawc(z,N,parity=1,**kwargs)
 		
 class star1d:
 	def __init__(self,file):
@@ -174,56 +198,15 @@ class star1d:
 				'eos.s','opa','eos',
 				'Xr','Yr','Zr','X_H','X_He3','X_He4','X_C12','X_C13','X_N14','X_N15','X_O16'
 				,'X_O17','Mcore']
-		fd,template_file=tempfile.mkstemp(prefix='star_template_',suffix='.tmp')
-		fp=os.fdopen(fd,'w')
-		fp.write('\\conf{dim=1}\n')
-		fp.write('${nr}${ndomains}${npts}${conv}')
-		for x in names:
-			fp.write('${'+x+'}')
-		fp.close()
-		fd,out_file=tempfile.mkstemp(prefix='star_out_',suffix='.tmp')
-		status=os.system('ester output '+file+' < '+template_file+' > '+out_file)
-		if status:
-			raise ValueError("Error reading file")
-		fp=os.fdopen(fd,'rb')
-		self.nr=struct.unpack('i',fp.read(4))[0]
-		self.ndomains=struct.unpack('i',fp.read(4))[0]
-		self.npts=fromfile(fp,'i',self.ndomains)
-		self.conv=struct.unpack('i',fp.read(4))[0]
-		self.nth=1
-		for x in names:
-			x=x.replace('/','_')
-			x=x.replace('.','_')
-			if x=='eps' or x=='eps_c' or x=='M' or x=='L' or x=='R' \
-				 or x=='R_R_SUN' or x=='M_M_SUN' or x=='L_L_SUN' \
-				 or x=='virial' or x=='energy_test' or x=='surff' or x=='X' or x=='Z' or x=='Xc' \
-				 or x=='rhoc' or x=='pc' or x=='Tc' or x=='Mcore':
-				s="self."+x+"=struct.unpack('d',fp.read(8))[0]"
-			elif x=='opa' or x=='eos':
-				c=list();
-				cc=fp.read(1);
-				while not cc=='\x00':
-					c.append(cc);
-					cc=fp.read(1);
-				s=str();
-				s=s.join(c);
-				s="self."+x+"='"+s+"'"
-			elif x=='Teff' or x=='gsup':
-				s="self."+x+"=fromfile(fp,'d',"+str(self.nth)+")"
-			elif x=='I':
-				s="self."+x+"=fromfile(fp,'d',"+str(self.nr)+")"
-			elif x=='xif':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.ndomains+1)+"),["+str(self.ndomains+1)+",1],'F')"
-			elif x=='D':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nr*self.nr)+"),["+str(self.nr)+","+str(self.nr)+"],'F')"
-			elif x=='map_R':
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str((self.ndomains)*self.nth)+"),["+str(self.ndomains)+","+str(self.nth)+"],'F')"
-			else:
-				s="self."+x+"=reshape(fromfile(fp,'d',"+str(self.nr*self.nth)+"),["+str(self.nr)+","+str(self.nth)+"],'F')"
-			exec(s)
-		fp.close()
-		os.system('rm '+template_file)
-		os.system('rm '+out_file)
+		out=_output(file,'\\conf{dim=1}\n',['nr','ndomains','npts','conv'],names)
+		try:
+			self.nr,self.ndomains=[int(n) for n in _read(out.fp,2,'i')]
+			self.npts=_read(out.fp,self.ndomains,'i')
+			self.conv=int(_read(out.fp,1,'i')[0])
+			self.nth=1
+			out.read_fields(self)
+		finally:
+			out.close()
 		self.z=self.r
 		self.rz=dot(self.D,self.r)
 		self.rzz=dot(self.D,self.rz)
@@ -236,23 +219,50 @@ class star1d:
 		self.gzt[0,:]=0
 		self.gtt=1./self.r**2
 		
-def star_evol(file):
-	
-	n=0
-	A=list();
-	while(True):
-		try:
-			B=star2d(file+'_'+str(n).zfill(4));
-		except:
-			return A;
-		print(file+'_'+str(n).zfill(4));
-		A.append(B)
-		n+=1;
-		
-	
-	
-	
-	
-	
-	
+class star_summary:
+	# Scalars and surface values of a model: (nr,nth) fields are reduced to
+	# their last (surface) row, other arrays are kept only if smaller
+	def __init__(self,A):
+		for x,v in A.__dict__.items():
+			if x.startswith('_'):
+				continue
+			if isinstance(v,ndarray) and v.size>A.nr:
+				if v.shape!=(A.nr,A.nth):
+					continue
+				v=v[-1,:].copy()
+			setattr(self,x,v)
+
+def star_evol_files(file):
+# files file_0000, file_0001, ... of an evolution sequence, in order
+	files=list()
+	while os.path.exists(file+'_'+str(len(files)).zfill(4)):
+		files.append(file+'_'+str(len(files)).zfill(4))
+	return files
+
+def _load_evol(args):
+	file,dim,summary=args
+	A=(star2d if dim==2 else star1d)(file)
+	if summary:
+		A=star_summary(A)
+	return A
 
+def star_evol(file,processes=None,summary=False,dim=2):
+	"""
+	Read all the models of an evolution sequence, using a pool of
+	`processes` workers (default: number of CPUs, 1 to read them in this
+	process). With summary=True, only scalars and surface values of each
+	model are kept (see star_summary). Models are returned in order.
+	"""
+	files=star_evol_files(file)
+	if not files:
+		return []
+	args=[(f,dim,summary) for f in files]
+	if processes==1:
+		return [_load_evol(a) for a in args]
+	from multiprocessing import Pool
+	pool=Pool(processes)
+	try:
+		return pool.map(_load_evol,args)
+	finally:
+		pool.close()
+		pool.join()
@@ -10,6 +10,7 @@ void dgeequ_( int* m, int* n, double* a, int* lda, double* r, double* c, double*
 void dgecon_( char* norm, int* n, double* a, int* lda, double* anorm, double* rcond, double* work, int* iwork, int* info );
 double dlange_( char* norm, int* m, int* n, double* a, int* lda, double* work );
 void dgels_( char* trans, int* m, int* n, int* nrhs, double* a, int* lda, double* b, int* ldb, double* work, int* lwork, int* info );
+void dlaswp_( int* n, double* a, int* lda, int* k1, int* k2, int* ipiv, int* incx );
 
 void sgetrf_( int* m, int* n, float* a, int* lda, int* ipiv, int* info );
 void sgetrs_( char* trans, int* n, int* nrhs, float* a, int* lda, int* ipiv, float* b, int* ldb, int* info );
@@ -19,6 +20,7 @@ void sgeequ_( int* m, int* n, float* a, int* lda, float* r, float* c, float* row
 void sgecon_( char* norm, int* n, float* a, int* lda, float* anorm, float* rcond, float* work, int* iwork, int* info );
 float slange_( char* norm, int* m, int* n, float* a, int* lda, float* work );
 void sgels_( char* trans, int* m, int* n, int* nrhs, float* a, int* lda, float* b, int* ldb, float* work, int* lwork, int* info );
+void slaswp_( int* n, float* a, int* lda, int* k1, int* k2, int* ipiv, int* incx );
 
 }
 #endif
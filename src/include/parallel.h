@@ -0,0 +1,58 @@
+#ifndef _PARALLEL_H
+#define _PARALLEL_H
+
+#include <cstdlib>
+#include <exception>
+#include <thread>
+#include <vector>
+
+/// \brief Number of threads used by the parallel loops of ESTER.
+///
+/// It is given by the environment variable ESTER_NUM_THREADS, and defaults to
+/// the number of cores of the machine.
+inline int ester_nthreads() {
+    static const int n = [] {
+        const char *env = getenv("ESTER_NUM_THREADS");
+        int n = env ? atoi(env) : (int) std::thread::hardware_concurrency();
+        return n > 0 ? n : 1;
+    }();
+    return n;
+}
+
+/// \brief Calls \p f(begin, end) on contiguous slices of [0, \p n), in
+/// parallel.
+///
+/// The slices have at least \p grain items, so that small loops run in the
+/// calling thread only. \p f must be safe to call from several threads at
+/// once, on disjoint slices. An exception thrown by \p f is rethrown in the
+/// calling thread, once all the slices are done.
+template <class F>
+void parallel_for(int n, F f, int grain = 1) {
+    int nt = ester_nthreads();
+    if (grain < 1) grain = 1;
+    if (nt > n / grain) nt = n / grain;
+    if (nt <= 1) {
+        if (n > 0) f(0, n);
+        return;
+    }
+
+    std::vector<std::exception_ptr> err(nt);
+    std::vector<std::thread> threads;
+    threads.reserve(nt - 1);
+    auto slice = [&](int k) {
+        try {
+            f((int) ((long) n * k / nt), (int) ((long) n * (k + 1) / nt));
+        } catch (...) {
+            err[k] = std::current_exception();
+        }
+    };
+    for (int k = 1; k < nt; k++)
+        threads.emplace_back(slice, k);
+    slice(0);
+    for (auto &t : threads)
+        t.join();
+    for (auto &e : err)
+        if (e) std::rethrow_exception(e);
+}
+
+#endif
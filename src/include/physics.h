@@ -2,6 +2,9 @@
 #define _PHYSICS_H
 
 #include "matrix.h"
+#include <memory>
+#include <string>
+#include <vector>
 
 struct nuc_struct {
 	matrix eps,pp,cno,dlneps_lnrho,dlneps_lnT;
@@ -23,13 +26,24 @@ struct atm_struct {
 
 class composition_map : public matrix_map {
 public:
-	matrix_map dt;
-	std::map<std::string,matrix_map> jac;
+	// Time derivatives of the abundances and their jacobian, as given by
+	// nuc_cesam_dcomp. They are stored densely, the species being numbered
+	// as in the vector species: column i of dt is dX_i/dt on the whole grid
+	// (in the order of the elements of a matrix), and column i+nspecies*j of
+	// jac is d(dX_i/dt)/dX_j.
+	std::vector<std::string> species;
+	matrix dt,jac;
 	composition_map() {};
 	composition_map(const matrix_map &map) : matrix_map(map) {};
 	matrix X() const;
 	matrix Y() const;
 	matrix Z() const;
+	int nspecies() const {return species.size();}
+	void index_species();
+	int index(const std::string &name) const;
+	matrix dense() const;
+	matrix get_dt(const std::string &name) const;
+	matrix get_jac(const std::string &name1,const std::string &name2) const;
 };
 
 int opa_calc(const matrix &X,double Z,const matrix &T,const matrix &rho,
@@ -45,6 +59,17 @@ int opa_opal(const matrix &X,double Z,const matrix &T,const matrix &rho,
 		opa_struct &opa);
 int opa_houdek(const matrix &X,double Z,const matrix &T,const matrix &rho,
 		opa_struct &opa);
+// Houdek (v9) opacities. The tables are loaded once, by the constructor, and
+// only read by evaluate(), that can be called from several threads.
+class opa_houdek_context {
+	struct tables;
+	std::shared_ptr<const tables> tab;
+public:
+	explicit opa_houdek_context(const std::string &tabnam="");
+	int evaluate(const matrix &X,double Z,const matrix &T,const matrix &rho,
+			opa_struct &opa) const;
+};
+
 int opa_kramer(const matrix &T,const matrix &rho,
 		opa_struct &opa);
 int opa_cesam(const matrix& X, double Z, const matrix& T, const matrix& rho,
@@ -66,6 +91,8 @@ int eos_opal(const matrix &X,double Z,const matrix &T,const matrix &p,
 		matrix &rho,eos_struct &eos);
 int eos_freeeos(const matrix &X, double Z, const matrix &T, const matrix &p,
 		matrix &rho, eos_struct &eos);
+int eos_freeeos_tab(const matrix &X, double Z, const matrix &T,
+		const matrix &p, matrix &rho, eos_struct &eos);
 
 int atm_onelayer(const matrix &X,double Z,const matrix &g,const matrix &Teff,
 		const char *eos_name,const char *opa_name,atm_struct &atm);
@@ -2,6 +2,8 @@
 #define _SOLVER_H
 
 #include "matrix.h"
+#include <thread>
+#include <vector>
 
 /// \page term_representation Term representation in the equations
 /// A term in an equation is stored in the form
@@ -22,8 +24,31 @@ class solver_full: public solver_operator {
 	matrix *m,*msup,*minf,*c,*r;	
 	matrix blk_index,ipiv_flag;
 	int nb,lu_flag,*N,oc;
-	char tempdir[50];
 	int **ipiv;
+	// Out of core mode: the blocks are stored in regions of a memory-mapped
+	// file (block i: region i, blockinf i: nb+i, blocksup i: 2*nb+i)
+	struct oc_region {
+		size_t offset,capacity;
+		int nrows,ncols;
+		double *map;
+	};
+	// Unused parts of the backing file, sorted by offset
+	struct oc_extent {
+		size_t offset,size;
+	};
+	int oc_fd;
+	size_t oc_size;
+	std::vector<oc_region> oc_reg;
+	std::vector<oc_extent> oc_free;
+	std::vector<matrix> oc_buf;
+	std::vector<int> oc_loaded,oc_queue;
+	std::thread oc_thread;
+	size_t oc_alloc(size_t size);
+	void oc_release(size_t offset,size_t size);
+	void oc_write(int id,const matrix &);
+	void oc_read(int id,matrix &);
+	void oc_prefetch(const std::vector<int> &ids);
+	void oc_wait();
 	void lu_calc();
 	void lu_block(int i);
 	void solve_block(int i,char trans,matrix &x);
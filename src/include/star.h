@@ -12,6 +12,7 @@
 #include "symbolic.h"
 
 #include <cmath>
+#include <mutex>
 #include <vector>
 
 #define PRES T
@@ -24,8 +25,28 @@
 
 class star1d;
 
+// Inputs of the last evaluation of a physics module (eos, opacity or nuclear
+// reactions) at each point of the grid, and its outputs. Used to evaluate
+// only the points whose inputs have changed (see star2d::config.phys_tol).
+struct phys_cache {
+    std::string name;
+    double Z;
+    matrix_map in, out;
+};
+
+// Surface terms of star2d::apparent_luminosity, interpolated on its fine
+// grid, for the surface values (Teff, r and rt) stored in key. The mutex
+// guards them, as apparent_luminosity may be called on the same model from
+// several threads.
+struct app_lum_cache {
+    matrix key, int_s, int_c, int_p;
+    std::mutex lock;
+};
+
 class star2d {
     protected:
+        phys_cache eos_cache, opa_cache, nuc_cache;
+        mutable app_lum_cache app_lum;
         virtual void copy(const star2d &);
         void init1d(const star1d &A, int npts_th, int npts_ex);
         virtual bool check_tag(const char *tag) const;
@@ -81,6 +102,12 @@ class star2d {
             int verbose;
             int dump_iter;
             bool init_poly;
+            // If > 0, the eos, opacity and nuclear reactions are only
+            // evaluated again at the points where T, p (or rho) or the
+            // composition changed by more than phys_tol (relative change)
+            double phys_tol;
+            // Keep the blocks of the solver in a file instead of memory
+            bool out_of_core;
         } config;
 
         virtual void opacity();
@@ -133,6 +160,7 @@ class star2d {
         double test_energy,test_virial;
         virtual matrix stream() const;
         virtual double apparent_luminosity(double i) const;
+        virtual matrix apparent_luminosity(const matrix &i) const;
         virtual double Lz() const;
         virtual double Mcore() const;
         virtual double Lzcore() const;
@@ -14,7 +14,7 @@ int main(int argc,char *argv[]) {
 	configuration config(argc,argv);
 	cmdline_parser cmd;
 	
-	double dXc=0.05,Xcmin=0.05;
+	double dXc=0.05,Xcmin=0.05,phys_tol=0;
 	
 	char *arg,*val;
 	cmd.open(argc,argv);
@@ -27,6 +27,9 @@ int main(int argc,char *argv[]) {
 		} else if(!strcmp(arg,"Xcmin")) {
 			if(val==NULL) err_code=2;
 			else Xcmin=atof(val);
+		} else if(!strcmp(arg,"phys_tol")) {
+			if(val==NULL) err_code=2;
+			else phys_tol=atof(val);
 		} else err_code=1;
 		if(err_code==1) {
 			fprintf(stderr,"Unknown parameter %s\n",arg);
@@ -64,6 +67,7 @@ int main(int argc,char *argv[]) {
 	op=A.init_solver();
 	if(config.verbose>2) op->verbose=1;
 	A.config.newton_dmax=config.newton_dmax;
+	A.config.phys_tol=phys_tol;
 	if(config.verbose>1) A.config.verbose=1;
 	
 	double Xc=A.Xc;
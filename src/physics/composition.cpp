@@ -1,6 +1,7 @@
 #ifndef WITH_CMAKE
 #include "ester-config.h"
 #endif
+#include "utils.h"
 #include "physics.h"
 
 double_map initial_composition(double X, double Z) {
@@ -44,3 +45,62 @@ matrix composition_map::Z() const {
 
 }
 
+
+// Numbers the species in the order of the map. Must be called again when
+// species are added to or removed from the map.
+void composition_map::index_species() {
+
+	species.clear();
+	for(const_iterator it=begin();it!=end();it++)
+		species.push_back(it->first);
+
+}
+
+// Index of a species in species, -1 if it is not there
+int composition_map::index(const std::string &name) const {
+
+	for(int i=0;i<nspecies();i++)
+		if(species[i]==name) return i;
+	return -1;
+
+}
+
+// Abundances of the species, with the same layout as dt
+matrix composition_map::dense() const {
+
+	if(!nspecies()) ester_err("composition_map: species not indexed");
+	const matrix &m0=find(species[0])->second;
+	int N=m0.nrows()*m0.ncols();
+	matrix ab(N,nspecies());
+	for(int i=0;i<nspecies();i++) {
+		const double *x=find(species[i])->second.data();
+		double *y=ab.data()+i*N;
+		for(int k=0;k<N;k++) y[k]=x[k];
+	}
+	return ab;
+
+}
+
+matrix composition_map::get_dt(const std::string &name) const {
+
+	int i=index(name);
+	if(i<0) ester_err("composition_map: unknown species %s",name.c_str());
+	const matrix &m=find(name)->second;
+	matrix res=dt.col(i);
+	res.redim(m.nrows(),m.ncols());
+	return res;
+
+}
+
+matrix composition_map::get_jac(const std::string &name1,
+		const std::string &name2) const {
+
+	int i=index(name1),j=index(name2);
+	if(i<0||j<0) ester_err("composition_map: unknown species %s",
+			(i<0?name1:name2).c_str());
+	const matrix &m=find(name1)->second;
+	matrix res=jac.col(i+nspecies()*j);
+	res.redim(m.nrows(),m.ncols());
+	return res;
+
+}
@@ -4,9 +4,20 @@
 #include "utils.h"
 #include "physics.h"
 #include "constants.h"
+#include "parallel.h"
 
 #include <iostream>
 #include <cmath>
+#include <cerrno>
+#include <cstring>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <sys/wait.h>
+#include <unistd.h>
 
 extern "C" {
     void free_eos_(int *ifoption, int *ifmodified, int *ifion, int *kif_in,
@@ -21,126 +32,426 @@ extern "C" {
             double *entropy, int *iteration_count);
 }
 
-int eos_freeeos(const matrix &X, double Z, const matrix &T, const matrix &p,
-        matrix &rho, eos_struct &eos) {
+namespace {
+
+// Quantities computed for each point: rho, then the fields of eos_struct
+enum {
+    FREEEOS_RHO, FREEEOS_S, FREEEOS_G1, FREEEOS_DEL_AD, FREEEOS_G3_1,
+    FREEEOS_D, FREEEOS_CP, FREEEOS_CV, FREEEOS_CHI_RHO, FREEEOS_CHI_T,
+    FREEEOS_NQ
+};
+
+// Calls free_eos_ for one point, and returns its iteration_count (negative if
+// it did not converge). Not thread-safe, as FreeEOS keeps its state in
+// common blocks.
+int freeeos_point(double X, double Z, double T, double p, double *q) {
 
-    double t;
     int ifoption = 1;
     int ifmodified = 2;
     int ifion = 0;
     int kif_in = 1;
     int neps = 20;
-    double *eps = new double[neps];
-    double tl;
-    double fl;
-    double rl;
-    double pl;
-    double cf;
-    double cp;
-    double qf;
-    double qp;
-    double sf;
-    double st;
-    double grada;
-    double rtp;
-
-    double rmue;
-    double fh2;
-    double fhe2;
-    double fhe3;
-    double xmu1;
-    double xmu3;
-    double eta;
-
-    double gamma1;
-    double gamma2;
-    double gamma3;
-    double h2rat;
-    double h2plusrat;
-    double lambda;
-    double gamma_e;
-
-    double degeneracy[3];
-    double pressure[3];
-    double density[3];
-    double energy[3];
-    double enthalpy[3];
-    double entropy[3];
-
+    double eps[20];
+    double tl, fl, rl, pl, cf, cp, qf, qp, sf, st, grada, rtp;
+    double rmue, fh2, fhe2, fhe3, xmu1, xmu3, eta;
+    double gamma1, gamma2, gamma3, h2rat, h2plusrat, lambda, gamma_e;
+    double degeneracy[3], pressure[3], density[3], energy[3], enthalpy[3],
+           entropy[3];
     int iteration_count;
 
+    double_map comp = initial_composition(X, Z);
+
+    eps[0] = comp["H"] / 1.008e0;                       // H
+    eps[1] = (comp["He3"] + comp["He4"]) / 4.0026e0;   // He3 + He4
+    eps[2] = (comp["C12"] + comp["C13"]) / 12.0111e0; // C12 + C13
+    eps[3] = (comp["N14"] + comp["N15"]) / 14.0067e0; // N14 + N15
+    eps[4] = (comp["O16"] + comp["O17"]) / 15.9994e0; // O16 + O17
+    for (int k = 5; k < neps; k++) eps[k] = 0.0; // Ne to Ni
+
+    double match_variable = log(p);
+    double rho;
+    tl = log(T);
+    pl = log(p);
+    free_eos_(&ifoption, &ifmodified,
+            &ifion, &kif_in, eps, &neps, &match_variable, &tl, &fl,
+            &T, &rho, &rl, &p, &pl, &cf, &cp, &qf, &qp, &sf, &st, &grada, &rtp,
+            &rmue, &fh2, &fhe2, &fhe3, &xmu1, &xmu3, &eta,
+            &gamma1, &gamma2, &gamma3, &h2rat, &h2plusrat, &lambda, &gamma_e,
+            degeneracy, pressure, density, energy, enthalpy, entropy,
+            &iteration_count);
+
+    q[FREEEOS_RHO] = rho;
+    q[FREEEOS_S] = entropy[0];
+    q[FREEEOS_G1] = gamma1;
+    q[FREEEOS_DEL_AD] = grada;
+    q[FREEEOS_G3_1] = gamma1*(gamma2-1.0)/gamma2;
+    q[FREEEOS_D] = -density[2];          // -d(lnRho)/d(lnT)
+    q[FREEEOS_CP] = cp;
+    q[FREEEOS_CV] = energy[2] * (1.0/T); // dE/dT (energy[2] is dE/dlnT)
+    q[FREEEOS_CHI_RHO] = 1.0/density[1];   // dlogP/dlogRho
+    q[FREEEOS_CHI_T] = -density[2] / density[1];     // dlogP/dlogT
+
+    return iteration_count;
+}
+
+// Grid of the tabulated FreeEOS, uniform in log10(T), log10(p) and X
+const double FREEEOS_LOGT_MIN = 3.3;
+const double FREEEOS_DLOGT = 0.02;
+const int FREEEOS_NT = 261;     // up to log10(T) = 8.5
+const double FREEEOS_LOGP_MIN = -1.;
+const double FREEEOS_DLOGP = 0.1;
+const int FREEEOS_NP = 201;     // up to log10(p) = 19
+const int FREEEOS_NX = 11;      // from X = 0 to X = 1 - Z
+
+// Header of the table files, to check that a file matches the current grid
+struct freeeos_header {
+    char magic[8];
+    int nq, nt, np, nx;
+    double Z, logt_min, dlogt, logp_min, dlogp;
+};
+
+// FreeEOS tabulated for a given Z, and the mixture of initial_composition.
+// The table is computed once, or read from the cache directory, and only read
+// afterwards by eval(), that is thread-safe. The interpolation is cubic
+// (Catmull-Rom) in each direction, so that the derivatives are continuous,
+// and is done on log(rho) rather than rho.
+class freeeos_table {
+    double Z;
+    freeeos_header header;
+    std::vector<double> q;
+
+    size_t index(int ix, int ip, int it) const {
+        return ((size_t) (ix*FREEEOS_NP+ip)*FREEEOS_NT+it)*FREEEOS_NQ;
+    }
+    void compute_row(int k, double *qk) const;
+    void compute();
+    bool read(const std::string &file);
+    void write(const std::string &file) const;
+public:
+    explicit freeeos_table(double Z);
+    double get_Z() const {return Z;}
+    bool eval(double X, double T, double p, double *res) const;
+};
+
+// Directory where the tables are kept: $ESTER_CACHE_DIR, or ester/ in the
+// user's cache directory. Empty if there is none.
+std::string freeeos_cache_dir() {
+
+    const char *env;
+    std::string dir;
+
+    if ((env = getenv("ESTER_CACHE_DIR")) && *env) return env;
+    if ((env = getenv("XDG_CACHE_HOME")) && *env) dir = env;
+    else if ((env = getenv("HOME")) && *env) dir = std::string(env) + "/.cache";
+    else return "";
+    return dir + "/ester";
+}
+
+bool make_dirs(const std::string &dir) {
+
+    for (size_t k = 1; k <= dir.size(); k++) {
+        if (k < dir.size() && dir[k] != '/') continue;
+        if (mkdir(dir.substr(0, k).c_str(), 0755) && errno != EEXIST)
+            return false;
+    }
+    return true;
+}
+
+freeeos_table::freeeos_table(double Z) : Z(Z) {
+
+    memset(&header, 0, sizeof(header));
+    memcpy(header.magic, "FREEEOS1", 8);
+    header.nq = FREEEOS_NQ;
+    header.nt = FREEEOS_NT;
+    header.np = FREEEOS_NP;
+    header.nx = FREEEOS_NX;
+    header.Z = Z;
+    header.logt_min = FREEEOS_LOGT_MIN;
+    header.dlogt = FREEEOS_DLOGT;
+    header.logp_min = FREEEOS_LOGP_MIN;
+    header.dlogp = FREEEOS_DLOGP;
+
+    std::string dir = freeeos_cache_dir();
+    char name[64];
+    snprintf(name, sizeof(name), "/freeeos_Z%.17g.tab", Z);
+    std::string file = dir.empty() ? "" : dir + name;
+
+    if (!file.empty() && read(file)) return;
+
+    compute();
+
+    if (file.empty())
+        ester_warn("No cache directory for the FreeEOS table "
+                "(set ESTER_CACHE_DIR)");
+    else if (!make_dirs(dir))
+        ester_warn("Could not create directory %s", dir.c_str());
+    else
+        write(file);
+}
+
+void freeeos_table::compute_row(int k, double *qk) const {
+
+    double X = (1.-Z)*(k/FREEEOS_NP)/(FREEEOS_NX-1);
+    double p = pow(10., FREEEOS_LOGP_MIN+(k%FREEEOS_NP)*FREEEOS_DLOGP);
+    for (int it = 0; it < FREEEOS_NT; it++) {
+        double T = pow(10., FREEEOS_LOGT_MIN+it*FREEEOS_DLOGT);
+        double *qi = qk + it*FREEEOS_NQ;
+        // Points where FreeEOS fails are marked, and reported as outside of
+        // the table by eval()
+        if (freeeos_point(X, Z, T, p, qi) < 0)
+            for (int j = 0; j < FREEEOS_NQ; j++) qi[j] = NAN;
+        qi[FREEEOS_RHO] = log(qi[FREEEOS_RHO]);
+    }
+}
+
+void freeeos_table::compute() {
+
+    const int nrows = FREEEOS_NX*FREEEOS_NP;
+    const size_t row = (size_t) FREEEOS_NT*FREEEOS_NQ;
+
+    LOGI("Computing FreeEOS table for Z = %g (%d points)...\n", Z,
+            FREEEOS_NT*FREEEOS_NP*FREEEOS_NX);
+
+    q.resize(nrows*row);
+    std::vector<char> done(nrows, 0);
+
+    // FreeEOS keeps its state in common blocks, so that the slices of the
+    // parallel loop are computed by child processes, in shared memory. The
+    // rows they could not compute are done afterwards, in this process.
+    size_t size = q.size()*sizeof(double) + nrows;
+    void *shm = MAP_FAILED;
+    if (ester_nthreads() > 1)
+        shm = mmap(NULL, size, PROT_READ | PROT_WRITE,
+                MAP_SHARED | MAP_ANONYMOUS, -1, 0);
+    if (shm != MAP_FAILED) {
+        double *sq = (double *) shm;
+        char *sdone = (char *) (sq + q.size());
+        parallel_for(nrows, [&](int begin, int end) {
+            pid_t pid = fork();
+            if (pid == 0) {
+                for (int k = begin; k < end; k++) {
+                    compute_row(k, sq + k*row);
+                    sdone[k] = 1;
+                }
+                _exit(0);
+            }
+            if (pid > 0)
+                while (waitpid(pid, NULL, 0) < 0 && errno == EINTR);
+        });
+        for (int k = 0; k < nrows; k++) {
+            if (!sdone[k]) continue;
+            memcpy(&q[k*row], sq + k*row, row*sizeof(double));
+            done[k] = 1;
+        }
+        munmap(shm, size);
+    }
+    for (int k = 0; k < nrows; k++)
+        if (!done[k]) compute_row(k, &q[k*row]);
+}
+
+bool freeeos_table::read(const std::string &file) {
+
+    FILE *fp = fopen(file.c_str(), "rb");
+    if (!fp) return false;
+
+    freeeos_header h;
+    bool ok = fread(&h, sizeof(h), 1, fp) == 1 &&
+        !memcmp(&h, &header, sizeof(h));
+    if (ok) {
+        q.resize((size_t) FREEEOS_NX*FREEEOS_NP*FREEEOS_NT*FREEEOS_NQ);
+        ok = fread(&q[0], sizeof(double), q.size(), fp) == q.size();
+    }
+    fclose(fp);
+    if (!ok) {
+        ester_warn("Ignoring FreeEOS table %s (wrong format)", file.c_str());
+        q.clear();
+    }
+    return ok;
+}
+
+void freeeos_table::write(const std::string &file) const {
+
+    // Written under a temporary name first, so that other processes never
+    // read an incomplete table
+    std::string tmp = file + "." + std::to_string(getpid());
+    FILE *fp = fopen(tmp.c_str(), "wb");
+    bool ok = fp &&
+        fwrite(&header, sizeof(header), 1, fp) == 1 &&
+        fwrite(&q[0], sizeof(double), q.size(), fp) == q.size();
+    if (fp && fclose(fp)) ok = false;
+    if (ok && !rename(tmp.c_str(), file.c_str())) return;
+    ester_warn("Could not write FreeEOS table %s", file.c_str());
+    remove(tmp.c_str());
+}
+
+// Catmull-Rom weights for the nodes i0..i0+3 of a grid of n nodes (n >= 4),
+// u being the position in units of the grid step. At both ends of the grid,
+// the missing node is extrapolated linearly. Returns false if u is outside of
+// the grid.
+bool cr_weights(double u, int n, int &i0, double *w) {
+
+    const double eps = 1e-9;
+
+    if (!(u >= -eps && u <= n-1+eps)) return false;
+    int i = (int) floor(u);
+    if (i < 0) i = 0;
+    if (i > n-2) i = n-2;
+    double t = u - i, t2 = t*t, t3 = t2*t;
+    double a = 0.5*(-t3+2*t2-t), b = 0.5*(3*t3-5*t2+2),
+           c = 0.5*(-3*t3+4*t2+t), d = 0.5*(t3-t2);
+    if (i == 0) {
+        i0 = 0;
+        w[0] = b+2*a; w[1] = c-a; w[2] = d; w[3] = 0;
+    } else if (i == n-2) {
+        i0 = n-4;
+        w[0] = 0; w[1] = a; w[2] = b-d; w[3] = c+2*d;
+    } else {
+        i0 = i-1;
+        w[0] = a; w[1] = b; w[2] = c; w[3] = d;
+    }
+    return true;
+}
+
+bool freeeos_table::eval(double X, double T, double p, double *res) const {
+
+    int ix, ip, it;
+    double wx[4], wp[4], wt[4];
+
+    if (!cr_weights(X/(1.-Z)*(FREEEOS_NX-1), FREEEOS_NX, ix, wx) ||
+            !cr_weights((log10(p)-FREEEOS_LOGP_MIN)/FREEEOS_DLOGP,
+                FREEEOS_NP, ip, wp) ||
+            !cr_weights((log10(T)-FREEEOS_LOGT_MIN)/FREEEOS_DLOGT,
+                FREEEOS_NT, it, wt))
+        return false;
+
+    for (int k = 0; k < FREEEOS_NQ; k++) res[k] = 0;
+    for (int jx = 0; jx < 4; jx++) {
+        if (wx[jx] == 0) continue;
+        for (int jp = 0; jp < 4; jp++) {
+            if (wp[jp] == 0) continue;
+            for (int jt = 0; jt < 4; jt++) {
+                if (wt[jt] == 0) continue;
+                double w = wx[jx]*wp[jp]*wt[jt];
+                const double *qi = &q[index(ix+jx, ip+jp, it+jt)];
+                for (int k = 0; k < FREEEOS_NQ; k++) res[k] += w*qi[k];
+            }
+        }
+    }
+    res[FREEEOS_RHO] = exp(res[FREEEOS_RHO]);
+    // Nodes where FreeEOS failed make the result NaN
+    return !std::isnan(res[FREEEOS_RHO]);
+}
+
+// Table for the last value of Z. Threads asking for another Z get their own
+// table, the one in use by the others staying alive until they are done. The
+// tables are built without holding the lock, so that the threads using the
+// current one are not held up, and one at a time.
+std::shared_ptr<const freeeos_table> freeeos_get_table(double Z) {
+
+    static std::mutex mtx, build;
+    static std::shared_ptr<const freeeos_table> table;
+
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if (table && table->get_Z() == Z) return table;
+    }
+    std::lock_guard<std::mutex> building(build);
+    {
+        // Built by another thread in the meantime
+        std::lock_guard<std::mutex> lock(mtx);
+        if (table && table->get_Z() == Z) return table;
+    }
+    std::shared_ptr<const freeeos_table> t =
+        std::make_shared<freeeos_table>(Z);
+    std::lock_guard<std::mutex> lock(mtx);
+    table = t;
+    return t;
+}
+
+void freeeos_dim(int nr, int nc, matrix &rho, eos_struct &eos) {
+
+    rho.dim(nr, nc);
+    eos.s.dim(nr, nc);
+    eos.G1.dim(nr, nc);
+    eos.del_ad.dim(nr, nc);
+    eos.G3_1.dim(nr, nc);
+    eos.d.dim(nr, nc);
+    eos.cp.dim(nr, nc);
+    eos.cv.dim(nr, nc);
+    eos.chi_rho.dim(nr, nc);
+    eos.chi_T.dim(nr, nc);
+}
+
+void freeeos_set(int i, const double *q, matrix &rho, eos_struct &eos) {
+
+    rho(i) = q[FREEEOS_RHO];
+    eos.s(i) = q[FREEEOS_S];
+    eos.G1(i) = q[FREEEOS_G1];
+    eos.del_ad(i) = q[FREEEOS_DEL_AD];
+    eos.G3_1(i) = q[FREEEOS_G3_1];
+    eos.d(i) = q[FREEEOS_D];
+    eos.cp(i) = q[FREEEOS_CP];
+    eos.cv(i) = q[FREEEOS_CV];
+    eos.chi_rho(i) = q[FREEEOS_CHI_RHO];
+    eos.chi_T(i) = q[FREEEOS_CHI_T];
+}
+
+}
+
+int eos_freeeos(const matrix &X, double Z, const matrix &T, const matrix &p,
+        matrix &rho, eos_struct &eos) {
+
+    double q[FREEEOS_NQ];
     int N=T.nrows()*T.ncols();
 
-    rho.dim(T.nrows(), T.ncols());
-    eos.s.dim(T.nrows(), T.ncols());
-    eos.G1.dim(T.nrows(), T.ncols());
-    eos.del_ad.dim(T.nrows(), T.ncols());
-    eos.G3_1.dim(T.nrows(), T.ncols());
-    eos.d.dim(T.nrows(), T.ncols());
-    eos.cp.dim(T.nrows(), T.ncols());
-    eos.cv.dim(T.nrows(), T.ncols());
-    eos.chi_rho.dim(T.nrows(), T.ncols());
-    eos.chi_T.dim(T.nrows(), T.ncols());
+    freeeos_dim(T.nrows(), T.ncols(), rho, eos);
 
     for (int i=0; i<N; i++) {
-
-        double_map comp = initial_composition(X(i), Z);
-
-        eps[0] = comp["H"] / 1.008e0;                       // H
-        eps[1] = (comp["He3"] + comp["He4"]) / 4.0026e0;   // He3 + He4
-        eps[2] = (comp["C12"] + comp["C13"]) / 12.0111e0; // C12 + C13
-        eps[3] = (comp["N14"] + comp["N15"]) / 14.0067e0; // N14 + N15
-        eps[4] = (comp["O16"] + comp["O17"]) / 15.9994e0; // O16 + O17
-        eps[5] = 0.0; // Ne
-        eps[6] = 0.0; // Na
-        eps[7] = 0.0; // Mg
-        eps[8] = 0.0; // AL
-        eps[9] = 0.0; // Si
-        eps[10] = .0; // P
-        eps[11] = .0; // S
-        eps[12] = .0; // Cl
-        eps[13] = .0; // A
-        eps[14] = .0; // Ca
-        eps[15] = .0; // Ti
-        eps[16] = .0; // Cr
-        eps[17] = .0; // Mn
-        eps[18] = .0; // Fe
-        eps[19] = .0; // Ni
-
-        double pi = p(i);
-        double match_variable = log(pi);
-        double rhoi;
-        t = T(i);
-        tl = log(t);
-        pl = log(pi);
-        free_eos_(&ifoption, &ifmodified,
-                &ifion, &kif_in, eps, &neps, &match_variable, &tl, &fl,
-                &t, &rhoi, &rl, &pi, &pl, &cf, &cp, &qf, &qp, &sf, &st, &grada, &rtp,
-                &rmue, &fh2, &fhe2, &fhe3, &xmu1, &xmu3, &eta,
-                &gamma1, &gamma2, &gamma3, &h2rat, &h2plusrat, &lambda, &gamma_e,
-                degeneracy, pressure, density, energy, enthalpy, entropy,
-                &iteration_count);
-        rho(i) = rhoi;
-        if (iteration_count < 0) {
+        if (freeeos_point(X(i), Z, T(i), p(i), q) < 0) {
             ester_err(
                     "Values outside freeEOS eos table:\n"
                     "  X = %e\n"
                     "  Z = %e\n"
                     "  T = %e\n"
-                    "  p = %e", X(i), Z, t, p(i));
+                    "  p = %e", X(i), Z, T(i), p(i));
+        }
+        freeeos_set(i, q, rho, eos);
+    }
+
+    return 0;
+}
+
+int eos_freeeos_tab(const matrix &X, double Z, const matrix &T,
+        const matrix &p, matrix &rho, eos_struct &eos) {
+
+    std::shared_ptr<const freeeos_table> table = freeeos_get_table(Z);
+
+    int N=T.nrows()*T.ncols();
+    std::vector<char> out(N, 0);
+
+    freeeos_dim(T.nrows(), T.ncols(), rho, eos);
+
+    parallel_for(N, [&](int begin, int end) {
+        double q[FREEEOS_NQ];
+        for (int i=begin; i<end; i++) {
+            if (!table->eval(X(i), T(i), p(i), q)) {
+                out[i] = 1;
+                continue;
+            }
+            freeeos_set(i, q, rho, eos);
+        }
+    }, 64);
+
+    for (int i=0; i<N; i++) {
+        if (out[i]) {
+            LOGE("Values outside freeEOS eos table:\n"
+                    "  X = %e\n"
+                    "  Z = %e\n"
+                    "  T = %e\n"
+                    "  p = %e\n", X(i), Z, T(i), p(i));
+            return 1;
         }
-        eos.s(i) = entropy[0];
-        eos.G1(i) = gamma1;
-        eos.del_ad(i) = grada;
-        eos.G3_1(i) = gamma1*(gamma2-1.0)/gamma2;
-        eos.d(i) = -density[2];          // -d(lnRho)/d(lnT)
-        eos.cp(i) = cp;
-    	// eos.cv(i)=1e6*(*(eeos_.eos+4));
-        eos.cv(i) = energy[2] * (1.0/t); // dE/dT (energy[2] is dE/dlnT)
-        eos.chi_rho(i) = 1.0/density[1];   // dlogP/dlogRho
-        eos.chi_T(i) = -density[2] / density[1];     // dlogP/dlogT
     }
-    delete[] eps;
 
     return 0;
 }
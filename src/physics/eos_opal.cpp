@@ -4,87 +4,480 @@
 #include "utils.h"
 #include "physics.h"
 #include "constants.h"
+#include "parallel.h"
 
 #include <iostream>
 #include <cmath>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+// OPAL EOS5 tables, as loaded by the Fortran code (EOS5_xtrin.F)
+#define OPAL_MX 5
+#define OPAL_MV 10
+#define OPAL_NR 169
+#define OPAL_NT 197
 
 extern"C" {
 	void zfs_interp_eos5_(double *z);
-	void eos5_xtrin_(double *x,double *ztab,double *t6,double *p,double *r);
-	extern struct{
-		double esact,eos[10];
-	} eeos_;
 	extern struct{
 		int itime;
 	} lreadco_;
+	extern struct{
+		double xz[OPAL_NR][OPAL_NT][OPAL_MV][OPAL_MX];
+		double t6list[OPAL_NT][OPAL_NR];
+		double rho[OPAL_NR];
+		double t6a[OPAL_NT];
+	} aeos_;
+}
+
+namespace {
+
+const double OPAL_OUT=-9e99;
+
+// Number of densities of the table at each temperature (nra in rhoofp)
+const int opal_nra[OPAL_NT]={
+	169,169,169,169,169,169,169,169,169,169,169,169,169,169,169,169,169,169,
+	169,169,169,169,169,169,169,169,168,167,167,166,165,164,163,163,162,161,
+	160,159,159,158,130,130,129,128,128,126,126,125,125,124,122,121,120,120,
+	119,119,118,118,118,118,118,118,117,117,116,116,115,115,114,114,114,114,
+	113,113,113,113,113,113,113,113,111,111,111,111,111,111,111,111,111,111,
+	111,111,111,111,111,111,111,111,111,111,111,111,110,110,110,110,110,109,
+	109,109,109,109,109,108,108,107,107,107,107,107,106,106,105,104,104,103,
+	103,103,103,103,103,103,103,102,102,102,102,102,102,102,102,102,102,102,
+	102,102,102,102,102,100,100,100,100,100,100,100,100,100,100,100,100,100,
+	100,100,100,100,100,100,100,100, 99, 99, 99, 99, 99, 99, 99, 99, 99, 98,
+	 98, 98, 98, 98, 98, 97, 97, 97, 97, 95, 94, 87, 87, 87, 87, 87, 87};
+
+double quadeos(double x,double y1,double y2,double y3,
+		double x1,double x2,double x3) {
+	double xx12=1./(x1-x2),xx13=1./(x1-x3),xx23=1./(x2-x3);
+	double c3=(y1-y2)*xx12;
+	c3=c3-(y2-y3)*xx23;
+	c3=c3*xx13;
+	double c2=(y1-y2)*xx12-(x1+x2)*c3;
+	double c1=y1-x1*c2-x1*x1*c3;
+	return c1+x*(c2+x*c3);
+}
+
+// Reentrant version of the interpolation of EOS5_xtrin.F: the table is loaded
+// once (for a given Z) and only read afterwards, the state of the
+// interpolation of a point being kept on the stack. The results are the
+// ones of EOS5_xtrin, point by point.
+class opal_eos_table {
+	double Z;
+	std::vector<double> xz;
+	double xa[OPAL_MX+1],dfsx[OPAL_MX+1];
+	double rho[OPAL_NR+1],dfsr[OPAL_NR+1];
+	double t6a[OPAL_NT+1],dfs[OPAL_NT+1];
+
+	// Fortran (1-based) indexing of the table
+	double table(int m,int iv,int it,int ir) const {
+		return xz[(((ir-1)*OPAL_NT+it-1)*OPAL_MV+iv-1)*OPAL_MX+m-1];
+	}
+	void esac(double xh,double t6,double r,int iorder,int irad,
+			double *eos) const;
+	double rhoofp(double x,double t6,double p,int irad) const;
+	void radsub(double t6,double density,double moles,double tmass,
+			double *eos) const;
+public:
+	explicit opal_eos_table(double Z);
+	double get_Z() const {return Z;}
+	double eval(double X,double t6,double p_mb,double *eos) const;
+};
+
+double gmass(double x,double z,double &amoles) {
+	const double eion[6]={-3394.873554,-1974.86545,-1433.92718,
+		-993.326315,-76.1959403,-15.29409};
+	const double anum[6]={10.,8.,7.,6.,2.,1.};
+	const double amas[7]={0.00054858,20.179,15.9994,14.0067,12.011,
+		4.0026,1.0079};
+	const double xc=0.247137766,xn=.0620782,xo=.52837118,xne=.1624188;
+	double fracz,frac[6];
+
+	fracz=z/(xc*amas[4]+xn*amas[3]+xo*amas[2]+xne*amas[1]);
+	double xh=x/amas[6];
+	double xhe=(1.-x-z)/amas[5];
+	double xtot=xh+xhe+fracz*xc+fracz*xn+fracz*xo+fracz*xne;
+	frac[5]=xh/xtot;
+	frac[4]=xhe/xtot;
+	frac[3]=fracz*xc/xtot;
+	frac[2]=fracz*xn/xtot;
+	frac[1]=fracz*xo/xtot;
+	frac[0]=fracz*xne/xtot;
+	amoles=0;
+	for(int i=0;i<6;i++) amoles+=(1.+anum[i])*frac[i];
+	double tmass=0;
+	for(int i=1;i<7;i++) tmass+=amas[i]*frac[i-1];
+	return tmass;
+}
+
+opal_eos_table::opal_eos_table(double Z) : Z(Z) {
+
+	// The Fortran code interpolates the tables in Z and loads the result
+	// in its common blocks, from where we copy it
+	lreadco_.itime=0;
+	zfs_interp_eos5_(&Z);
+
+	const double *p=&aeos_.xz[0][0][0][0];
+	xz.assign(p,p+OPAL_MX*OPAL_MV*OPAL_NT*OPAL_NR);
+	const double x[OPAL_MX]={0.0,0.2,0.4,0.6,0.8};
+	for(int i=1;i<=OPAL_MX;i++) xa[i]=x[i-1];
+	for(int i=1;i<=OPAL_NT;i++) t6a[i]=aeos_.t6a[i-1];
+	for(int i=1;i<=OPAL_NR;i++) rho[i]=aeos_.rho[i-1];
+	for(int i=2;i<=OPAL_MX;i++) dfsx[i]=1./(xa[i]-xa[i-1]);
+	for(int i=2;i<=OPAL_NT;i++) dfs[i]=1./(t6a[i]-t6a[i-1]);
+	for(int i=2;i<=OPAL_NR;i++) dfsr[i]=1./(rho[i]-rho[i-1]);
+
+}
+
+// EOS5_xtrin: density (OPAL_OUT outside of the table) and
+// eos[0..8] for hydrogen abundance X, temperature t6 (1e6 K) and pressure
+// p_mb (Mbar)
+double opal_eos_table::eval(double X,double t6,double p_mb,double *eos) const {
+
+	double r=rhoofp(X,t6,p_mb,1);
+	if(r==OPAL_OUT) return r;
+	esac(X,t6,r,9,1,eos);
+	if(eos[0]==OPAL_OUT) r=OPAL_OUT;
+	return r;
+
+}
+
+void opal_eos_table::esac(double xh,double t6,double r,int iorder,int irad,
+		double *eos) const {
+
+	const double aprop=83.14511;
+	double slt=t6,slr=r;
+	int ilo,ihi,imd,i;
+	int mf,mg,mh,mi,mf2,l1,l3,k1,k3,iqu,ipu,ip,iq;
+
+	if(slt>t6a[1]||slt<t6a[OPAL_NT]||slr<rho[1]||slr>rho[OPAL_NR]) {
+		eos[0]=OPAL_OUT;
+		return;
+	}
+
+	// Table indices to use in X, rho and T6
+	ilo=2;ihi=OPAL_MX;
+	while(ihi-ilo>1) {
+		imd=(ihi+ilo)/2;
+		if(xh<=xa[imd]+1.e-7) ihi=imd;
+		else ilo=imd;
+	}
+	i=ihi;
+	mf=i-2;mg=i-1;mh=i;mi=i+1;mf2=mi;
+	if(xh<1.e-6) {
+		mf=mg=mh=1;mi=2;mf2=1;
+	}
+	if(xh<=xa[2]+1.e-7||xh>=xa[OPAL_MX-2]-1.e-7) mf2=mh;
+
+	ilo=2;ihi=OPAL_NR;
+	while(ihi-ilo>1) {
+		imd=(ihi+ilo)/2;
+		if(slr==rho[imd]) {
+			ihi=imd;
+			break;
+		}
+		if(slr<=rho[imd]) ihi=imd;
+		else ilo=imd;
+	}
+	l3=ihi;l1=l3-2;
+	iqu=l3+1>OPAL_NR?2:3;
+
+	ilo=OPAL_NT;ihi=2;
+	while(ilo-ihi>1) {
+		imd=(ihi+ilo)/2;
+		if(t6==t6a[imd]) {
+			ilo=imd;
+			break;
+		}
+		if(t6<=t6a[imd]) ihi=imd;
+		else ilo=imd;
+	}
+	k3=ilo;k1=k3-2;
+	ipu=k3+1>OPAL_NT?2:3;
+
+	// Largest interpolation stencil within the (non-empty part of the) table
+	double sum1=0,sum2=0,sum23=0,sum33=0;
+	for(int m=mf;m<=mf2;m++) {
+		for(int ir=l1;ir<=l1+1;ir++)
+			for(int it=k1;it<=k1+1;it++) sum1+=table(m,1,it,ir);
+		for(int ir=l1;ir<=l1+2;ir++)
+			for(int it=k1;it<=k1+2;it++) sum2+=table(m,1,it,ir);
+		if(ipu==3) {
+			for(int ir=l1;ir<=l1+2;ir++)
+				for(int it=k1;it<=k1+ipu;it++) sum23+=table(m,1,it,ir);
+		} else sum23=2.e30;
+		if(iqu==3) {
+			for(int ir=l1;ir<=l1+3;ir++)
+				for(int it=k1;it<=k1+ipu;it++) sum33+=table(m,1,it,ir);
+		} else sum33=2.e30;
+	}
+	iq=2;ip=2;
+	if(sum2>1.e30) {
+		if(sum1>=1.e25||k3<4||l3<4) {
+			eos[0]=OPAL_OUT;
+			return;
+		}
+		k1=k3-3;k3=k1+2;
+		l1=l3-3;l3=l1+2;
+	} else {
+		if(sum23<1.e30) ip=3;
+		if(sum33<1.e30) iq=3;
+		if(t6>=t6a[2]+1.e-7) ip=2;
+		if(slr<=rho[2]+1.e-7) iq=2;
+		if(l3==OPAL_NR||k3==OPAL_NT) iq=ip=2;
+	}
+
+	for(int iv=1;iv<=iorder;iv++) {
+		// Interpolation in X
+		double esk[4][4];
+		for(int ir=0;ir<=iq;ir++) for(int it=0;it<=ip;it++) {
+			if(mf2==1) {
+				esk[it][ir]=table(mf,iv,k1+it,l1+ir);
+				continue;
+			}
+			esk[it][ir]=quadeos(xh,table(mf,iv,k1+it,l1+ir),
+				table(mg,iv,k1+it,l1+ir),table(mh,iv,k1+it,l1+ir),
+				xa[mf],xa[mg],xa[mh]);
+		}
+		if(mi==mf2) {
+			double dixr=(xa[mh]-xh)*dfsx[mh];
+			for(int ir=0;ir<=iq;ir++) for(int it=0;it<=ip;it++) {
+				double esk2=quadeos(xh,table(mg,iv,k1+it,l1+ir),
+					table(mh,iv,k1+it,l1+ir),table(mi,iv,k1+it,l1+ir),
+					xa[mg],xa[mh],xa[mi]);
+				esk[it][ir]=esk[it][ir]*dixr+esk2*(1.-dixr);
+			}
+		}
+
+		// Interpolation in T6 and rho (t6rinteos), mixing overlapping
+		// quadratics to obtain smoothed derivatives
+		double h[4],q[4],esact,esactq=0;
+		for(int it=0;it<=ip;it++) {
+			h[it]=quadeos(slr,esk[it][0],esk[it][1],esk[it][2],
+				rho[l1],rho[l1+1],rho[l1+2]);
+			if(iq==3)
+				q[it]=quadeos(slr,esk[it][1],esk[it][2],esk[it][3],
+					rho[l1+1],rho[l1+2],rho[l1+3]);
+		}
+		esact=quadeos(slt,h[0],h[1],h[2],t6a[k1],t6a[k1+1],t6a[k1+2]);
+		if(iq==3)
+			esactq=quadeos(slt,q[0],q[1],q[2],t6a[k1],t6a[k1+1],t6a[k1+2]);
+		if(ip==3) {
+			double esact2=quadeos(slt,h[1],h[2],h[3],
+				t6a[k1+1],t6a[k1+2],t6a[k1+3]);
+			double dix=(t6a[k3]-slt)*dfs[k3];
+			esact=esact*dix+esact2*(1.-dix);
+			if(iq==3) {
+				double esactq2=quadeos(slt,q[1],q[2],q[3],
+					t6a[k1+1],t6a[k1+2],t6a[k1+3]);
+				esactq=esactq*dix+esactq2*(1.-dix);
+			}
+		}
+		if(iq==3) {
+			double dix2=(rho[l3]-slr)*dfsr[l3];
+			if(ip==3) esact=esact*dix2+esactq*(1-dix2);
+		}
+		if(esact>1.e15) {
+			// Interpolation indices out of range
+			eos[0]=OPAL_OUT;
+			return;
+		}
+		eos[iv-1]=esact;
+	}
+
+	eos[0]*=t6*r; // interpolated in p/p0
+	eos[1]*=t6;   // interpolated in E/T6
+	double moles,tmass=gmass(xh,Z,moles);
+	if(irad==1) radsub(t6,r,moles,tmass,eos);
+	else eos[4]*=moles*aprop/tmass;
+
+}
+
+// Adds the radiation to the results of esac
+void opal_eos_table::radsub(double t6,double density,double moles,
+		double tmass,double *eos) const {
+
+	const double sigmacc=1.8914785e-3,aprop=83.14510;
+	double molenak=moles*aprop;
+
+	double pt=eos[0];
+	double chir=eos[5]*eos[0]/pt;
+	double chitt=(eos[0]*eos[6])/pt;
+	double cvtt=(eos[4]*molenak/tmass);
+	double gam3pt_norad=pt*chitt/(cvtt*density*t6);
+	double gam1t_norad=chir+chitt*gam3pt_norad;
+	double gam2pt_norad=gam1t_norad/gam3pt_norad;
+
+	double pr=4./3.*sigmacc*(t6*t6*(t6*t6));
+	double er=3.*pr/density;
+	double sr=4./3.*er/t6;
+	pt=eos[0]+pr;
+	double et=eos[1]+er;
+	double st=eos[2]+sr;
+	double dedrho=eos[3]-er/density;
+	chir=eos[5]*eos[0]/pt;
+	chitt=(eos[0]*eos[6]+4.*pr)/pt;
+	cvtt=(eos[4]*molenak/tmass+4.*er/t6);
+	double gam3pt=pt*chitt/(cvtt*density*t6);
+	double gam1t=chir+chitt*gam3pt;
+	double gam2pt=gam1t/gam3pt;
+
+	eos[7]=eos[7]+gam1t-gam1t_norad;
+	eos[8]=eos[8]+gam2pt-gam2pt_norad;
+	eos[0]=pt;
+	eos[1]=et;
+	eos[2]=st;
+	eos[3]=dedrho;
+	eos[4]=cvtt;
+	eos[5]=chir;
+	eos[6]=chitt;
+
+}
+
+// Density for a given pressure, by the secant method
+double opal_eos_table::rhoofp(double x,double t6,double p,int irad) const {
+
+	const double sigmacc=1.8914785e-3;
+	double eos[OPAL_MV]={0};
+	int ilo,ihi,imd,mlo,klo;
+
+	double pr=0;
+	if(irad==1) pr=4./3.*sigmacc*(t6*t6*(t6*t6));
+	double pnr=p-pr;
+
+	ilo=2;ihi=OPAL_MX;
+	while(ihi-ilo>1) {
+		imd=(ihi+ilo)/2;
+		if(x<=xa[imd]+1.e-7) ihi=imd;
+		else ilo=imd;
+	}
+	mlo=ilo;
+
+	ilo=OPAL_NT;ihi=2;
+	while(ilo-ihi>1) {
+		imd=(ihi+ilo)/2;
+		if(t6==t6a[imd]) {
+			ilo=imd;
+			break;
+		}
+		if(t6<=t6a[imd]) ihi=imd;
+		else ilo=imd;
+	}
+	klo=ilo;
+
+	int nra=opal_nra[klo-1];
+	double pmax=table(mlo,1,klo,nra)*t6*rho[nra];
+
+	double rhog1=rho[nra]*pnr/pmax,rhog2,rhog3,p1,p2,p3;
+	esac(x,t6,rhog1,1,0,eos);
+	p1=eos[0];
+	if(p1>pnr) {
+		p2=p1;
+		rhog2=rhog1;
+		rhog1=0.2*rhog1;
+		if(rhog1<1.e-14) rhog1=1.e-14;
+		esac(x,t6,rhog1,1,0,eos);
+		p1=eos[0];
+	} else {
+		// rho(klo) in EOS5_xtrin.F, which reads past the end of rho for the
+		// lowest temperatures (klo>nr): these points are out of table
+		if(klo>OPAL_NR) return OPAL_OUT;
+		rhog2=5.*rhog1;
+		if(rhog2>rho[klo]) rhog2=rho[klo];
+		esac(x,t6,rhog2,1,0,eos);
+		p2=eos[0];
+	}
+
+	for(int icount=1;icount<=31;icount++) {
+		rhog3=rhog1+(rhog2-rhog1)*(pnr-p1)/(p2-p1);
+		esac(x,t6,rhog3,1,0,eos);
+		p3=eos[0];
+		if(fabs((p3-pnr)/pnr)<1.e-12) return rhog3;
+		if(p3>pnr) {
+			rhog2=rhog3;
+			p2=p3;
+		} else {
+			rhog1=rhog3;
+			p1=p3;
+		}
+	}
+	// No convergence after 30 tries
+	return OPAL_OUT;
+
+}
+
+// Table for the last value of Z. Threads asking for another Z get their own
+// table, the one in use by the others staying alive until they are done.
+std::shared_ptr<const opal_eos_table> opal_eos_get_table(double Z) {
+
+	static std::mutex mtx;
+	static std::shared_ptr<const opal_eos_table> table;
+
+	std::lock_guard<std::mutex> lock(mtx);
+	if(!table||table->get_Z()!=Z) table=std::make_shared<opal_eos_table>(Z);
+	return table;
+
+}
+
 }
 
 int eos_opal(const matrix &X,double Z,const matrix &T,const matrix &p,
 		matrix &rho,eos_struct &eos) {
-    
+
+    std::shared_ptr<const opal_eos_table> table=opal_eos_get_table(Z);
+
     matrix t6,p_mb;
-    int i,N,error=0;
-    
-    static double Z_table=-99;
+    int N=T.nrows()*T.ncols();
 
     t6=T*1e-6;
     p_mb=p*1e-12;
 
-    if(Z!=Z_table) {
-    	lreadco_.itime=0;
-    	zfs_interp_eos5_(&Z);
-	    Z_table=Z;
-    }
-    
-    if(error) {
-    	printf("Can't initialize OPAL EOS table\n");
-    	return error;
-    }
-
+    // Outputs of EOS5_xtrin: eos(3) and eos(5) to eos(9)
+    matrix s(T.nrows(),T.ncols()),
+        cv(T.nrows(),T.ncols()),chir(T.nrows(),T.ncols()),
+        chit(T.nrows(),T.ncols()),gam1(T.nrows(),T.ncols()),
+        gam2p(T.nrows(),T.ncols());
     rho.dim(T.nrows(),T.ncols());
-    eos.s.dim(T.nrows(),T.ncols());
-    eos.G1.dim(T.nrows(),T.ncols());
-    eos.del_ad.dim(T.nrows(),T.ncols());
-    eos.G3_1.dim(T.nrows(),T.ncols());
-    eos.d.dim(T.nrows(),T.ncols());
-    eos.cp.dim(T.nrows(),T.ncols());
-    eos.cv.dim(T.nrows(),T.ncols());
-    eos.chi_rho.dim(T.nrows(),T.ncols());
-    eos.chi_T.dim(T.nrows(),T.ncols());
-        
-    eos.prad=A_RAD/3*pow(T,4);
-    
-    N=T.nrows()*T.ncols();
-
-	double Xi,Zi,t6i,p_mbi,rhoi;
-    for(i=0;i<N;i++) {
-    	Xi=X(i);Zi=Z;t6i=t6(i);p_mbi=p_mb(i);
-    	eos5_xtrin_(&Xi,&Zi,&t6i,&p_mbi,&rhoi);
-    	rho(i)=rhoi;
-    	eos.s(i)=1e6*(*(eeos_.eos+2));
-		eos.G1(i)=*(eeos_.eos+7);
-		eos.del_ad(i)=1/(*(eeos_.eos+8));
-    	eos.G3_1(i)=*(eeos_.eos+7)/(*(eeos_.eos+8));
-    	eos.d(i)=(*(eeos_.eos+6))/(*(eeos_.eos+5));
-    	eos.cp(i)=1e6*(*(eeos_.eos+7))*(*(eeos_.eos+4))/(*(eeos_.eos+5));
-    	eos.cv(i)=1e6*(*(eeos_.eos+4));
-    	eos.chi_rho(i)=*(eeos_.eos+5);
-    	eos.chi_T(i)=*(eeos_.eos+6);
-        if (fabs(rhoi - (-9e99)) < 1e-10) {
+
+    parallel_for(N,[&](int begin,int end) {
+        double e[OPAL_MV];
+        for(int i=begin;i<end;i++) {
+            if(X(i)==0) {
+                rho(i)=OPAL_OUT;
+                continue;
+            }
+            rho(i)=table->eval(X(i),t6(i),p_mb(i),e);
+            if(rho(i)==OPAL_OUT) continue;
+            s(i)=e[2];cv(i)=e[4];chir(i)=e[5];
+            chit(i)=e[6];gam1(i)=e[7];gam2p(i)=e[8];
+        }
+    },64);
+
+    for(int i=0;i<N;i++) {
+        if(rho(i)==OPAL_OUT) {
             ester_err(
                     "Values outside OPAL eos table:\n"
                     "  X = %e\n"
                     "  Z = %e\n"
                     "  T = %e\n"
-                    "  p = %e", Xi, Zi, t6i, p_mbi);
+                    "  p = %e", X(i), Z, t6(i), p_mb(i));
+            return 1;
         }
     }
-    if(exist(rho==-9e99)) {
-        ester_err("Values outside OPAL eos table");
-   		return 1;
-    }
+
+    eos.prad=A_RAD/3*pow(T,4);
+    eos.s=1e6*s;
+    eos.G1=gam1;
+    eos.del_ad=1/gam2p;
+    eos.G3_1=gam1/gam2p;
+    eos.d=chit/chir;
+    eos.cp=1e6*gam1*cv/chir;
+    eos.cv=1e6*cv;
+    eos.chi_rho=chir;
+    eos.chi_T=chit;
 
     return 0;
-	
-}
 
+}
@@ -1,7 +1,14 @@
 #ifndef WITH_CMAKE
 #include "ester-config.h"
 #endif
+#include"utils.h"
 #include"physics.h"
+#include"parallel.h"
+
+#include<cmath>
+#include<memory>
+#include<mutex>
+#include<vector>
 
 static bool init=false;
 
@@ -12,6 +19,10 @@ extern "C" {
             double *epsilon, double *et, double *ero, double *ex);
     void nuc_cesam_dcomp_(double *t, double *ro, double *comp,
             double *dcomp, double *jac);
+    void nuc_cesam_rates_(double *t, double *r, double *dr);
+    void nuc_cesam_consts_(int *nreac, int *nchim, double *q0,
+    		double *nucleo, double *zi, double *t_inf, double *t_sup,
+    		int *mitler);
 }
 
 void nuc_cesam_init() {
@@ -24,95 +35,199 @@ void nuc_cesam_init() {
 
 }
 
-matrix nuc_cesam_abon(double_map comp) {
+namespace {
 
-	matrix ab(10);	
-	
-	ab(0) = comp["H"];
-	ab(1) = comp["He3"];
-	ab(2) = comp["He4"];
-	ab(3) = comp["C12"];
-	ab(4) = comp["C13"];
-	ab(5) = comp["N14"];
-	ab(6) = comp["N15"];
-	ab(7) = comp["O16"];
-	ab(8) = comp["O17"];
-    ab(9) = 1.-comp["H"]-comp["He3"]-comp["He4"]
-        -comp["C12"]-comp["C13"]-comp["N14"]
-        -comp["N15"]-comp["O16"]-comp["O17"];
-	return ab;
-}
+// Reactions and species of the ppcno9 network
+#define CESAM_NREAC 14
+#define CESAM_NCHIM 10
 
-double_map nuc_cesam_abon(matrix ab) {
+const char *const cesam_species[CESAM_NCHIM-1]=
+	{"H","He3","He4","C12","C13","N14","N15","O16","O17"};
+
+// Z1*Z2 for each reaction (izz in taux_nuc.f). It is 0 for the electron
+// capture on Be7, that is not screened.
+const double cesam_z1z2[CESAM_NREAC]={1,1,4,4,3,0,4,6,6,7,7,7,8,8};
+
+// Number of intervals of the table of the rates, in log(T)
+#define CESAM_NTAB 1024
+
+// Rates of the reactions of ppcno9, tabulated on a fine grid in log(T) from
+// the B-splines of tabul_nuc, so that eps() can be called from several
+// threads. eps() gives the results of nuc_cesam_eps_ (ppcno9 with fait=3,
+// and weak screening), up to the interpolation in the table.
+class nuc_cesam_table {
+	double q0[CESAM_NREAC],nucleo[CESAM_NCHIM],zi[CESAM_NCHIM];
+	double t_inf,t_sup,lnt0,dlnt;
+	// ln(r) and dln(r)/dln(T) at the nodes, for r without screening and ro=1
+	std::vector<double> lnr,dlnr;
+public:
+	nuc_cesam_table();
+	void eps(double t,double ro,const double *ab,double *epsilon,
+			double &et,double &ero) const;
+	double get_t_sup() const {return t_sup;}
+};
+
+nuc_cesam_table::nuc_cesam_table() {
+
+	if(!init) nuc_cesam_init();
+
+	int nreac,nchim,mitler;
+	nuc_cesam_consts_(&nreac,&nchim,q0,nucleo,zi,&t_inf,&t_sup,&mitler);
+	if(nreac!=CESAM_NREAC||nchim!=CESAM_NCHIM||mitler)
+		ester_err("nuc_cesam: unexpected nuclear reaction network");
+
+	lnt0=log(t_inf);
+	dlnt=(log(t_sup)-lnt0)/CESAM_NTAB;
+	lnr.resize((CESAM_NTAB+1)*CESAM_NREAC);
+	dlnr.resize((CESAM_NTAB+1)*CESAM_NREAC);
+	for(int k=0;k<=CESAM_NTAB;k++) {
+		double t=k==CESAM_NTAB?t_sup:exp(lnt0+k*dlnt);
+		nuc_cesam_rates_(&t,&lnr[k*CESAM_NREAC],&dlnr[k*CESAM_NREAC]);
+	}
 
-	double_map comp;	
-	
-	comp["H"]=ab(0);
-	comp["He3"]=ab(1);
-	comp["He4"]=ab(2);
-	comp["C12"]=ab(3);
-	comp["C13"]=ab(4);
-	comp["N14"]=ab(5);
-	comp["N15"]=ab(6);
-	comp["O16"]=ab(7);
-	comp["O17"]=ab(8);
-	
-	return comp;
 }
 
-void nuc_cesam_init_jac(composition_map &comp) {
-	composition_map::iterator it;
-	
-	for(it=comp.begin(); it!=comp.end(); it++) 
-		comp.jac[it->first] = 0*comp;
+void nuc_cesam_table::eps(double t,double ro,const double *ab,
+		double *epsilon,double &et,double &ero) const {
+
+	double c[CESAM_NCHIM],r[CESAM_NREAC],drt[CESAM_NREAC],dro[CESAM_NREAC],
+		q[CESAM_NREAC],dqt[CESAM_NREAC],dqo[CESAM_NREAC];
+
+	epsilon[0]=epsilon[1]=epsilon[2]=0;et=ero=0;
+	if(t<=t_inf) return;
+
+	for(int i=0;i<CESAM_NCHIM;i++) c[i]=ab[i]/nucleo[i];
+
+	// Cubic Hermite interpolation of ln(r) in the table
+	double u=(log(t)-lnt0)/dlnt;
+	int k=(int)u;
+	if(k>CESAM_NTAB-1) k=CESAM_NTAB-1;
+	double s=u-k,s2=s*s,s3=s2*s;
+	double h00=2*s3-3*s2+1,h10=(s3-2*s2+s)*dlnt,h01=3*s2-2*s3,
+		h11=(s3-s2)*dlnt;
+	double g00=(6*s2-6*s)/dlnt,g10=3*s2-4*s+1,g01=(6*s-6*s2)/dlnt,
+		g11=3*s2-2*s;
+	const double *f0=&lnr[k*CESAM_NREAC],*f1=f0+CESAM_NREAC,
+		*d0=&dlnr[k*CESAM_NREAC],*d1=d0+CESAM_NREAC;
+
+	// Weak screening
+	double mue=0,zstar=0;
+	for(int i=0;i<CESAM_NCHIM;i++) {
+		mue+=zi[i]*fabs(c[i]);
+		zstar+=zi[i]*(zi[i]+1.)*fabs(c[i]);
+	}
+	double sc=1.88e8*sqrt(zstar*ro/(t*t*t));
+
+	for(int i=0;i<CESAM_NREAC;i++) {
+		double lnri=h00*f0[i]+h10*d0[i]+h01*f1[i]+h11*d1[i];
+		double dri=g00*f0[i]+g10*d0[i]+g01*f1[i]+g11*d1[i];
+		double ecran=cesam_z1z2[i]*sc;
+		r[i]=exp(lnri)*ro*exp(ecran);
+		drt[i]=r[i]*(dri-1.5*ecran)/t;
+		dro[i]=r[i]*(1.+0.5*ecran)/ro;
+		q[i]=r[i]*q0[i];dqt[i]=drt[i]*q0[i];dqo[i]=dro[i]*q0[i];
+	}
+
+	double h2,be7,li7,den;
+	if(c[0]>0) {
+		h2=r[0]/r[1]*c[0];den=r[5]*mue+r[6]*c[0];
+		be7=r[3]*c[1]*c[2]/den;li7=r[5]*be7*mue/r[4]/c[0];
+	} else {
+		h2=0;be7=0;li7=0;den=0;
+	}
+	epsilon[1]=(q[0]*c[0]+q[1]*h2+q[4]*li7+q[6]*be7)*c[0]
+		+(q[2]*c[1]+q[3]*c[2])*c[1]+q[5]*mue*be7;
+	epsilon[2]=(q[7]*c[3]+q[8]*c[4]+q[9]*c[5]
+		+(q[10]+q[11])*c[6]+q[12]*c[7]+q[13]*c[8])*c[0];
+	epsilon[0]=epsilon[1]+epsilon[2];
+
+	double dh2t=0,dh2ro=0,dbe7t=0,dbe7ro=0,dli7t=0,dli7ro=0;
+	if(h2>0) {
+		dh2t=h2*(drt[0]/r[0]-drt[1]/r[1]);
+		dh2ro=h2*(dro[0]/r[0]-dro[1]/r[1]);
+	}
+	if(be7>0) {
+		double dent=drt[5]*mue+drt[6]*c[0];
+		double denro=dro[5]*mue+dro[6]*c[0];
+		dbe7t=be7*(drt[3]/r[3]-dent/den);
+		dbe7ro=be7*(dro[3]/r[3]-denro/den);
+	}
+	if(li7>0) {
+		dli7t=li7*(drt[5]/r[5]+dbe7t/be7-drt[4]/r[4]);
+		dli7ro=li7*(dro[5]/r[5]+dbe7ro/be7-dro[4]/r[4]);
+	}
+	et=(dqt[0]*c[0]+dqt[1]*h2+dqt[4]*li7+dqt[6]*be7)*c[0]
+		+(dqt[2]*c[1]+dqt[3]*c[2])*c[1]
+		+dqt[5]*mue*be7+(dqt[7]*c[3]+dqt[8]*c[4]
+		+dqt[9]*c[5]+(dqt[10]+dqt[11])*c[6]+dqt[12]*c[7]
+		+dqt[13]*c[8])*c[0]
+		+(q[1]*dh2t+q[4]*dli7t+q[6]*dbe7t)*c[0]+q[5]*mue*dbe7t;
+	ero=(dqo[0]*c[0]+dqo[1]*h2+dqo[4]*li7+dqo[6]*be7)*c[0]
+		+(dqo[2]*c[1]+dqo[3]*c[2])*c[1]
+		+dqo[5]*mue*be7+(dqo[7]*c[3]+dqo[8]*c[4]
+		+dqo[9]*c[5]+(dqo[10]+dqo[11])*c[6]+dqo[12]*c[7]
+		+dqo[13]*c[8])*c[0]
+		+(q[1]*dh2ro+q[4]*dli7ro+q[6]*dbe7ro)*c[0]+q[5]*mue*dbe7ro;
+
 }
 
-void nuc_cesam_jac(composition_map &comp, const matrix &J, int i, int j) {
+std::shared_ptr<const nuc_cesam_table> nuc_cesam_get_table() {
+
+	static std::mutex mtx;
+	static std::shared_ptr<const nuc_cesam_table> table;
 
-	std::map<std::string,matrix_map> &jac=comp.jac;
+	std::lock_guard<std::mutex> lock(mtx);
+	if(!table) table=std::make_shared<nuc_cesam_table>();
+	return table;
 
-	jac["H"](i,j)=nuc_cesam_abon(J.row(0));
-	jac["He3"](i,j)=nuc_cesam_abon(J.row(1));
-	jac["He4"](i,j)=nuc_cesam_abon(J.row(2));
-	jac["C12"](i,j)=nuc_cesam_abon(J.row(3));
-	jac["C13"](i,j)=nuc_cesam_abon(J.row(4));
-	jac["N14"](i,j)=nuc_cesam_abon(J.row(5));
-	jac["N15"](i,j)=nuc_cesam_abon(J.row(6));
-	jac["O16"](i,j)=nuc_cesam_abon(J.row(7));
-	jac["O17"](i,j)=nuc_cesam_abon(J.row(8));
+}
 
 }
 
 int nuc_cesam(const composition_map &comp,const matrix &T,const matrix &rho,
 		nuc_struct &nuc) {
-		
-	if(!init) nuc_cesam_init();
-	
-	nuc.eps=zeros(T.nrows(),T.ncols());
-	nuc.pp=zeros(T.nrows(),T.ncols());
-	nuc.cno=zeros(T.nrows(),T.ncols());
-	nuc.dlneps_lnrho=zeros(T.nrows(),T.ncols());
-	nuc.dlneps_lnT=zeros(T.nrows(),T.ncols());
-	matrix epsilon(4),ex(10);
-	double et,ero,t,ro;
-	for(int j=0;j<T.ncols();j++) {
-		for(int i=0;i<T.nrows();i++) {
-			matrix ab;
-			ab=nuc_cesam_abon(comp(i,j));
-			t=T(i,j);ro=rho(i,j);
-			nuc_cesam_eps_(&t,&ro,ab.data(),epsilon.data(),&et,&ero,ex.data());
-			nuc.eps(i,j)=epsilon(0);
-			nuc.pp(i,j)=epsilon(1);
-			nuc.cno(i,j)=epsilon(2);
-			if(epsilon(0)==0) {
-				nuc.dlneps_lnrho(i,j)=0;
-				nuc.dlneps_lnT(i,j)=0;
+
+	std::shared_ptr<const nuc_cesam_table> table=nuc_cesam_get_table();
+
+	int N=T.nrows()*T.ncols();
+	const double *X[CESAM_NCHIM-1];
+	for(int k=0;k<CESAM_NCHIM-1;k++)
+		X[k]=comp[cesam_species[k]].data();
+
+	for(int i=0;i<N;i++) {
+		if(T(i)>table->get_t_sup())
+			ester_err("nuc_cesam: T = %e above the tabulation of the "
+				"nuclear reactions (%e)",T(i),table->get_t_sup());
+	}
+
+	nuc.eps.dim(T.nrows(),T.ncols());
+	nuc.pp.dim(T.nrows(),T.ncols());
+	nuc.cno.dim(T.nrows(),T.ncols());
+	nuc.dlneps_lnrho.dim(T.nrows(),T.ncols());
+	nuc.dlneps_lnT.dim(T.nrows(),T.ncols());
+
+	parallel_for(N,[&](int begin,int end) {
+		double ab[CESAM_NCHIM],epsilon[3],et,ero;
+		for(int i=begin;i<end;i++) {
+			ab[CESAM_NCHIM-1]=1;
+			for(int k=0;k<CESAM_NCHIM-1;k++) {
+				ab[k]=X[k][i];
+				ab[CESAM_NCHIM-1]-=ab[k];
+			}
+			table->eps(T(i),rho(i),ab,epsilon,et,ero);
+			nuc.eps(i)=epsilon[0];
+			nuc.pp(i)=epsilon[1];
+			nuc.cno(i)=epsilon[2];
+			if(epsilon[0]==0) {
+				nuc.dlneps_lnrho(i)=0;
+				nuc.dlneps_lnT(i)=0;
 			} else {
-				nuc.dlneps_lnrho(i,j)=ero/epsilon(0)*rho(i,j);
-				nuc.dlneps_lnT(i,j)=et/epsilon(0)*T(i,j);
+				nuc.dlneps_lnrho(i)=ero/epsilon[0]*rho(i);
+				nuc.dlneps_lnT(i)=et/epsilon[0]*T(i);
 			}
 		}
-	}
+	},64);
+
 	return 0;
 }
 
@@ -121,21 +236,37 @@ int nuc_cesam_dcomp(composition_map &comp,const matrix &T,const matrix &rho,
 	
 	if(!init) nuc_cesam_init();
 	
-	comp.dt=0*comp;
-	nuc_cesam_init_jac(comp);
-	double t,ro;
-	for(int j=0;j<T.ncols();j++) {
-		for(int i=0;i<T.nrows();i++) {
-			matrix ab,dab(10),jac(10,10);
-			ab=nuc_cesam_abon(comp(i,j));
-			t=T(i,j);ro=rho(i,j);
-			nuc_cesam_dcomp_(&t,&ro,ab.data(),dab.data(),jac.data());
-			
-			comp.dt(i,j)=nuc_cesam_abon(dab);
-			nuc_cesam_jac(comp,jac,i,j);
-		}
+	comp.index_species();
+	int ns=comp.nspecies();
+	int N=T.nrows()*T.ncols();
+	
+	// Index in comp of the species of the network
+	int ind[CESAM_NCHIM-1];
+	for(int k=0;k<CESAM_NCHIM-1;k++) {
+		ind[k]=comp.index(cesam_species[k]);
+		if(ind[k]<0) ester_err("nuc_cesam_dcomp: missing species %s",
+				cesam_species[k]);
 	}
 	
+	matrix X=comp.dense();
+	comp.dt=zeros(N,ns);
+	comp.jac=zeros(N,ns*ns);
+	double *dt=comp.dt.data(),*jac=comp.jac.data();
+	double ab[CESAM_NCHIM],dab[CESAM_NCHIM],J[CESAM_NCHIM*CESAM_NCHIM];
+	for(int i=0;i<N;i++) {
+		ab[CESAM_NCHIM-1]=1;
+		for(int k=0;k<CESAM_NCHIM-1;k++) {
+			ab[k]=X(i,ind[k]);
+			ab[CESAM_NCHIM-1]-=ab[k];
+		}
+		double t=T(i),ro=rho(i);
+		nuc_cesam_dcomp_(&t,&ro,ab,dab,J);
+		for(int k=0;k<CESAM_NCHIM-1;k++) {
+			dt[i+N*ind[k]]=dab[k];
+			for(int l=0;l<CESAM_NCHIM-1;l++)
+				jac[i+N*(ind[k]+ns*ind[l])]=J[k+CESAM_NCHIM*l];
+		}
+	}
 	
 	// As part of the mass is transformed in energy (and neutrinos), the
     // temporal derivatives given by cesam doesn't verify Sum(dXi/dt)=0. We need
@@ -154,25 +285,17 @@ int nuc_cesam_dcomp(composition_map &comp,const matrix &T,const matrix &rho,
     // participate in the reaction we will have dXi/dt!=0. This is a consequence
     // of the change in the total mass caused by the reaction.
 	
-	matrix dXtot;
-	dXtot=comp.dt.sum();
-	composition_map::iterator it,it2;
-	std::map<std::string,matrix_map> Jnew;
-	matrix_map Jsum;
-	for(it=comp.begin();it!=comp.end();it++) {
-		Jsum[it->first]=zeros(T.nrows(),T.ncols());
-		for(it2=comp.begin();it2!=comp.end();it2++) {
-			Jsum[it->first]+=comp.jac[it2->first][it->first];
-		}
-	}
-	for(it=comp.begin();it!=comp.end();it++) {
-		for(it2=comp.begin();it2!=comp.end();it2++) {
-			Jnew[it->first][it2->first]=comp.jac[it->first][it2->first]-comp[it->first]*Jsum[it2->first];
+	for(int i=0;i<N;i++) {
+		double dXtot=0;
+		for(int k=0;k<ns;k++) dXtot+=dt[i+N*k];
+		for(int l=0;l<ns;l++) {
+			double Jsum=0;
+			for(int k=0;k<ns;k++) Jsum+=jac[i+N*(k+ns*l)];
+			for(int k=0;k<ns;k++) jac[i+N*(k+ns*l)]-=X(i,k)*Jsum;
+			jac[i+N*(l+ns*l)]-=dXtot;
 		}
-		Jnew[it->first][it->first]-=dXtot;
+		for(int k=0;k<ns;k++) dt[i+N*k]-=X(i,k)*dXtot;
 	}
-	comp.jac=Jnew;
-	comp.dt-=comp*dXtot;
 	
 	return 0;
 
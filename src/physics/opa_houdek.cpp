@@ -3,68 +3,715 @@
 #endif
 #include <cmath>
 #include <string.h>
+#include <mutex>
+#include <vector>
+#include "utils.h"
 #include "matrix.h"
 #include "constants.h"
 #include "physics.h"
+#include "parallel.h"
+
+// Houdek (v9) tables, as loaded by opinit (dopinit.f)
+#define HOUDEK_NTAB 7
+#define HOUDEK_NZVA 13
+#define HOUDEK_NXIR 19
+#define HOUDEK_NYIR 70
+#define HOUDEK_NYIF 96
+#define HOUDEK_NEL 10
 
 extern"C" {
 	void maceps_(double *eps);
 	void opinit_(double *eps,int *iorder,char *tabnam,int *imode,int tabnamlen);
-	void opints_(double *x,double *z,double *tlg,double *rlg,double *opalg,
-			double *opr,double *opt,double *opx,double *opz,int *iexp,int *ier);
+	extern struct {
+		int nzvai,ntabi,nxiri,nyiri,nyisi,nyifi,mdi,nti,iali;
+	} tabdim_;
+	extern struct {
+		double pp,tls[HOUDEK_NYIF];
+		double ra[HOUDEK_NZVA][HOUDEK_NTAB][4][4][HOUDEK_NYIF][HOUDEK_NXIR];
+	} birasp_;
+	extern struct {
+		double opa[HOUDEK_NZVA][HOUDEK_NTAB][HOUDEK_NYIR][HOUDEK_NXIR];
+		double rlg[HOUDEK_NZVA][HOUDEK_NTAB][HOUDEK_NXIR];
+		double tlg[HOUDEK_NZVA][HOUDEK_NTAB][HOUDEK_NYIR];
+	} opadat_;
+	// Commons are not aligned (-fno-align-commons)
+	extern struct __attribute__((packed)) {
+		double xtab[HOUDEK_NTAB];
+		int iorder;
+		char lec;
+	} tablex_;
+	extern struct {
+		double ztab[HOUDEK_NZVA],ztabl[HOUDEK_NZVA];
+	} tablez_;
 }
 
-double opa_houdek_i(double X,double Z,double T,double rho,double &dlogkt,double &dlogkr) {
-    
-    double logT,t6,logR,logk,dlogkx,dlogkz;
-    int iexp,ier;
-        
-    logT=log10(T);
-    t6=T*1e-6;
-    logR=log10(rho/t6/t6/t6);
-    
-    opints_(&X,&Z,&logT,&logR,&logk,&dlogkr,&dlogkt,&dlogkx,&dlogkz,&iexp,&ier);
-    
-	return logk;
+namespace {
+
+// Electron conduction (Itoh et al.), from itoh_*.f, condux_*.f and sfa_*.f
+const double itoh_z[HOUDEK_NEL]={1.,2.,6.,8.,10.,12.,14.,16.,20.,26.};
+const double itoh_atw[HOUDEK_NEL]={1.008,4.003,12.011,15.9994,20.179,24.305,
+	28.0855,32.06,40.,55.847};
+const double itoh_a[HOUDEK_NEL]={12.00,11.00,8.55,8.87,8.07,7.58,7.55,7.21,
+	6.36,7.50};
+const double itoh_ca[HOUDEK_NEL][4]={
+	{0.34542,-0.28157,0.09184,-0.03734},{0.62199,-0.16110,0.15574,-0.02893},
+	{0.9896,-0.1851,0.1019,-0.0360},{1.0779,-0.1838,0.1059,-0.029},
+	{1.148,-0.1779,0.1115,-0.0233},{1.206,-0.1703,0.1128,-0.0237},
+	{1.255,-0.1658,0.1099,-0.0254},{1.2969,-0.162,0.1052,-0.0279},
+	{1.3661,-0.1588,0.0981,-0.03},{1.4453,-0.1561,0.0941,-0.0263}};
+const double itoh_cb[HOUDEK_NEL][3]={
+	{-0.61919,0.40004,-0.16585},{-0.65222,.48601,-.18266},{-.8825,.6675,-.3798},
+	{-.9743,.6955,-.3966},{-1.0553,.7336,-0.4147},{-1.1345,.7534,-.4078},
+	{-1.2026,.7749,-.4166},{-1.2607,.7862,-.4339},{-1.3763,.8039,-.4304},
+	{-1.5213,0.8369,-0.4364}};
+const double itoh_cc[HOUDEK_NEL][3]={
+	{0.35742,-0.41151,0.21552},{0.3658,-.52176,.2624},{-.0915,-1.5848,1.1882},
+	{-.104,-1.7692,1.3546},{-0.0548,-2.0486,1.55},{0.0403,-2.2084,1.5097},
+	{0.1085,-2.4057,1.6373},{0.1566,-2.5275,1.8014},{0.3382,-2.7239,1.7889},
+	{.6087,-3.1264,1.8772}};
+const double itoh_cd[HOUDEK_NEL][4]={
+	{0.21512,-0.10843,-0.00596,-0.0095},{0.3609,.02576,.05061,.00015},
+	{.4406,-.0161,-.0093,-.0028},{.4486,-0.016,-.0014,.0039},
+	{0.4557,-0.0096,0.0063,0.0065},{0.4612,-0.0041,0.0087,.0052},
+	{.4656,-0.001,.0068,.0016},{.4688,.0002,.0039,-0.0015},
+	{0.473,-0.0006,-0.0001,-0.0036},{.4764,-0.0024,-0.0003,-0.0014}};
+const double itoh_ce[HOUDEK_NEL][3]={
+	{-0.36667,0.1404,-0.04588},{-0.40559,.15316,-.04058},{-.4821,.0826,-.0557},
+	{-.5193,.0822,-.0467},{-0.5463,.0848,-0.0395},{-.5672,.0851,-0.0363},
+	{-0.586,.0833,-.0385},{-0.6021,.0802,-0.0405},{-0.6295,.0719,-0.0399},
+	{-0.664,.0656,-.0346}};
+const double itoh_cf[HOUDEK_NEL][3]={
+	{0.10493,-0.09537,0.04682},{0.1214,-.11621,.04939},{-.5193,-.083,.0147},
+	{-.5403,-.1022,.0416},{-0.5448,-.1146,.0664},{-0.5673,-.1412,.0883},
+	{-0.5637,-0.1621,.114},{-0.5644,-.1831,.1333},{-.5588,-.1857,.116},
+	{-.5154,-.194,.0982}};
+
+// x**n, as computed by the Fortran runtime
+double ipow(double x,int n) {
+	double p=1;
+	unsigned u=n;
+	if(n<0) {
+		u=-n;
+		x=p/x;
+	}
+	for(;;) {
+		if(u&1) p*=x;
+		u>>=1;
+		if(u) x*=x;
+		else break;
+	}
+	return p;
 }
 
-int opa_houdek(const matrix &X,double Z,const matrix &T,const matrix &rho,
-		opa_struct &opa) {
+// Number abundances of the elements (itohin)
+void itohin(double xa,double ya,double za,double *y) {
+
+	double aa[HOUDEK_NEL],at,atw_m,x_r,y_r,z_r;
+	int i;
+
+	for(i=2;i<HOUDEK_NEL;i++) aa[i]=pow(10.,itoh_a[i]-itoh_a[2]);
+	at=0;
+	for(i=2;i<HOUDEK_NEL;i++) at=at+aa[i];
+	for(i=2;i<HOUDEK_NEL;i++) y[i]=aa[i]/at;
+	atw_m=0;
+	for(i=2;i<HOUDEK_NEL;i++) atw_m=atw_m+itoh_atw[i]*y[i];
+	if(za>0) {
+		z_r=1./(1.+xa*atw_m/(za*itoh_atw[0])+ya*atw_m/(za*itoh_atw[1]));
+		x_r=z_r*xa*atw_m/(za*itoh_atw[0]);
+		y_r=z_r*ya*atw_m/(za*itoh_atw[1]);
+	} else if(xa>0) {
+		z_r=0;
+		x_r=1./(1.+ya*itoh_atw[0]/(xa*itoh_atw[1]));
+		y_r=x_r*ya*itoh_atw[0]/(xa*itoh_atw[1]);
+	} else {
+		z_r=0;
+		x_r=0;
+		y_r=1;
+	}
+	y[0]=x_r;
+	y[1]=y_r;
+	for(i=2;i<HOUDEK_NEL;i++) y[i]=y[i]*z_r;
+
+}
+
+// Fits of the conductivity of element iel (sfa), and their derivatives
+// with respect to rs and xx (adsfa)
+void sfa(double rs,double xx,int iel,double &s1,double &s2,
+		double ads1=0,double ads2=0,double *adrs=NULL,double *adxx=NULL) {
+
+	double v1=0,v2=0,v3=0,v4=0,v5=0,v6=0;
+	for(int k=0;k<4;k++) {
+		v1=v1+itoh_ca[iel][k]*ipow(xx,k);
+		v4=v4+itoh_cd[iel][k]*ipow(xx,k);
+		if(k<3) {
+			v2=v2+itoh_cb[iel][k]*ipow(xx,k);
+			v5=v5+itoh_ce[iel][k]*ipow(xx,k);
+			v3=v3+itoh_cc[iel][k]*ipow(xx,k);
+			v6=v6+itoh_cf[iel][k]*ipow(xx,k);
+		}
+	}
+	s1=v1*(1.+v2*rs+v3*rs*rs);
+	s2=v4*(1.+v5*rs+v6*rs*rs);
+	if(adrs==NULL) return;
+
+	*adrs=*adrs+ads2*v4*(v5+2*v6*rs);
+	double adv4=ads2*(1+v5*rs+v6*rs*rs);
+	double adv5=ads2*v4*rs;
+	double adv6=ads2*v4*rs*rs;
+	*adrs=*adrs+ads1*v1*(v2+2*v3*rs);
+	double adv1=ads1*(1+v2*rs+v3*rs*rs);
+	double adv2=ads1*v1*rs;
+	double adv3=ads1*v1*rs*rs;
+	for(int k=3;k>=0;k--) {
+		if(k<3) {
+			*adxx=*adxx+adv6*itoh_cf[iel][k]*k*ipow(xx,k-1);
+			*adxx=*adxx+adv3*itoh_cc[iel][k]*k*ipow(xx,k-1);
+			*adxx=*adxx+adv5*itoh_ce[iel][k]*k*ipow(xx,k-1);
+			*adxx=*adxx+adv2*itoh_cb[iel][k]*k*ipow(xx,k-1);
+		}
+		*adxx=*adxx+adv4*itoh_cd[iel][k]*k*ipow(xx,k-1);
+		*adxx=*adxx+adv1*itoh_ca[iel][k]*k*ipow(xx,k-1);
+	}
+
+}
+
+// Conductivity of element iel (condux), and the derivatives of adcond*cond
+// with respect to ro6 and t8, added to adro6 and adt8 (adcondux)
+double condux(double ro6,double t8,int iel,
+		double adcond=0,double *adro6=NULL,double *adt8=NULL) {
+
+	double zz=itoh_z[iel];
+	double a=zz*2.;
+	double gam=0.2275*(zz*zz)/t8*pow(ro6/a,1./3.);
+	double xx=0.45641*log(gam)-1.31636;
+	double rs=0.01388*pow(a/zz,1./3.)/pow(ro6,1./3.);
+	if(rs>1e1) rs=1e1;
+	double s1,s2;
+	sfa(rs,xx,iel,s1,s2);
+	double fact=1.018*pow(zz/a,2./3.)*pow(ro6,2./3.);
+	double s=s1-fact/(1.+fact)*s2;
+	if(s<0.1) s=0.1;
+	double cond=2.363e+17*(ro6*t8/a)/((1.+fact)*s);
+	if(adro6==NULL) return cond;
+
+	// Reverse mode derivatives, as generated in condux_ad.f
+	double adfact=0-adcond*(2.363e+17*ro6*t8/a*s/((1.+fact)*s*(1.+fact)*s));
+	*adro6=*adro6+adcond*(2.363e+17*(t8/a)/((1.+fact)*s));
+	double ads=0-adcond*(2.363e+17*ro6*t8/a*(1.+fact)/((1.+fact)*s*(1.+fact)*s));
+	*adt8=*adt8+adcond*(2.363e+17*(ro6/a)/((1.+fact)*s));
+	s=s1-fact/(1.+fact)*s2;
+	if(s<0.1) ads=0;
+	adfact=adfact-ads*(1/(1.+fact)-fact/((1.+fact)*(1.+fact)))*s2;
+	double ads1=0+ads;
+	double ads2=0-ads*(fact/(1.+fact));
+	*adro6=*adro6+0.66666666666667*1.018*adfact*pow(zz/a,0.66666666666667)
+		*pow(ro6,-0.33333333333333);
+	double adrs=0,adxx=0;
+	sfa(rs,xx,iel,s1,s2,ads1,ads2,&adrs,&adxx);
+	rs=0.01388*pow(a/zz,1./3.)/pow(ro6,1./3.);
+	if(rs>1e1) adrs=0;
+	*adro6=*adro6-adrs*(0.33333333333333*0.01388*pow(a/zz,0.33333333333333)
+		*pow(ro6,-0.66666666666667)
+		/(pow(ro6,0.33333333333333)*pow(ro6,0.33333333333333)));
+	double adgam=0+0.45641*adxx*(1/gam);
+	*adro6=*adro6+0.33333333333333*adgam*0.2275*(zz*zz)/t8/a
+		*pow(ro6/a,-0.66666666666667);
+	*adt8=*adt8-adgam*0.2275*(zz*zz)/(t8*t8)*pow(ro6/a,0.33333333333333);
+
+	return cond;
+
+}
+
+// log10 of the electron conduction opacity (itohec), and its derivatives
+// with respect to log10(T) and log10(rho) (aditohec)
+double itohec(double xch,double zch,double t,double rho,
+		double &ect,double &ecrho) {
+
+	double y[HOUDEK_NEL],conmed,t8,ro6;
+	int i;
 
-	int i,N,error=0;
-	matrix dlnkT,dlnkrho;
-    static int init=0;
-	char tabnam[80];
-	int iorder,imode;
+	itohin(xch,1.-xch-zch,zch,y);
+	t8=pow(10.,t-8.);
+	ro6=pow(10.,rho-6.);
+	conmed=0;
+	for(i=0;i<HOUDEK_NEL;i++) conmed=conmed+condux(ro6,t8,i)*y[i];
+
+	double adconmed=0-1*(1./(conmed*log(10.)));
+	double adro6=0,adt8=0;
+	for(i=HOUDEK_NEL-1;i>=0;i--) condux(ro6,t8,i,0+adconmed*y[i],&adro6,&adt8);
+	ecrho=-1+adro6*pow(10.,rho-6.)*log(10.);
+	ect=3+adt8*pow(10.,t-8.)*log(10.);
+
+	return log10(3.024272)-4.+3.*t-rho-log10(conmed);
+
+}
+
+// Locates x in xx(1..n) (hunt)
+void hunt(const double *xx,int n,double x,int &jlo) {
+
+	int jhi,jm,inc;
+	bool ascnd;
+
+	xx--;
+	ascnd=xx[n]>xx[1];
+	if(jlo<=0||jlo>n) {
+		jlo=0;
+		jhi=n+1;
+	} else {
+		inc=1;
+		if((x>=xx[jlo])==ascnd) {
+			for(;;) {
+				jhi=jlo+inc;
+				if(jhi>n) {
+					jhi=n+1;
+					break;
+				}
+				if((x>=xx[jhi])!=ascnd) break;
+				jlo=jhi;
+				inc+=inc;
+			}
+		} else {
+			jhi=jlo;
+			for(;;) {
+				jlo=jhi-inc;
+				if(jlo<1) {
+					jlo=0;
+					break;
+				}
+				if((x<xx[jlo])!=ascnd) break;
+				jhi=jlo;
+				inc+=inc;
+			}
+		}
+	}
+	while(jhi-jlo!=1) {
+		jm=(jhi+jlo)/2;
+		if((x>=xx[jm])==ascnd) jlo=jm;
+		else jhi=jm;
+	}
+
+}
+
+// Univariate interpolation (uvip3d, for np=3 and nd>4) at x, in xd(1..nd),
+// yd(1..nd). Returns the interpolated value, and its derivative in d.
+double uvip3(int nd,const double *xd,const double *yd,double x,double &d) {
+
+	double x0,x1,x2,x3,y0,y1,y2,y3,dlt,a0,a1,a2,a3,dx,dy,xx;
+	int iint;
+
+	xd--;yd--;
+	if(x<=xd[1]) iint=0;
+	else if(x<xd[nd]) {
+		int idmn=1,idmx=nd,idmd=(idmn+idmx)/2;
+		do {
+			if(x>=xd[idmd]) idmn=idmd;
+			else idmx=idmd;
+			idmd=(idmn+idmx)/2;
+		} while(idmd>idmn);
+		iint=idmd;
+	} else iint=nd;
+
+	if(iint<=0||iint>=nd) {
+		// Linear extrapolation
+		int i0=iint<=0?1:nd,s=iint<=0?1:-1;
+		x0=xd[i0];
+		x1=xd[i0+s]-x0;
+		x2=xd[i0+2*s]-x0;
+		x3=xd[i0+3*s]-x0;
+		y0=yd[i0];
+		y1=yd[i0+s]-y0;
+		y2=yd[i0+2*s]-y0;
+		y3=yd[i0+3*s]-y0;
+		dlt=x1*x2*x3*(x2-x1)*(x3-x2)*(x3-x1);
+		a1=(((x2*x3)*(x2*x3))*(x3-x2)*y1
+			+((x3*x1)*(x3*x1))*(x1-x3)*y2
+			+((x1*x2)*(x1*x2))*(x2-x1)*y3)/dlt;
+		d=a1;
+		return y0+a1*(x-x0);
+	}
+
+	// Derivatives at both ends of the interval, from the weighted slopes of
+	// the cubics through 4 neighbouring points
+	double yp[2];
+	for(int iept=0;iept<2;iept++) {
+		int id0=iint+iept,id1=0,id2=0,id3=0;
+		double smpef=0,smwtf=0,smpei=0,smwti=0;
+		x0=xd[id0];
+		y0=yd[id0];
+		for(int ipe=1;ipe<=4;ipe++) {
+			if(ipe==1) {
+				id1=id0-3;
+				id2=id0-2;
+				id3=id0-1;
+			} else if(ipe==2) id1=id0+1;
+			else if(ipe==3) id2=id0+2;
+			else id3=id0+3;
+			if(id1<1||id2<1||id3<1||id1>nd||id2>nd||id3>nd) continue;
+			x1=xd[id1]-x0;
+			x2=xd[id2]-x0;
+			x3=xd[id3]-x0;
+			y1=yd[id1]-y0;
+			y2=yd[id2]-y0;
+			y3=yd[id3]-y0;
+			dlt=x1*x2*x3*(x2-x1)*(x3-x2)*(x3-x1);
+			double pe=(((x2*x3)*(x2*x3))*(x3-x2)*y1
+				+((x3*x1)*(x3*x1))*(x1-x3)*y2
+				+((x1*x2)*(x1*x2))*(x2-x1)*y3)/dlt;
+			double sx=x1+x2+x3;
+			double sy=y1+y2+y3;
+			double sxx=x1*x1+x2*x2+x3*x3;
+			double sxy=x1*y1+x2*y2+x3*y3;
+			double dnm=4.*sxx-sx*sx;
+			double b0=(sxx*sy-sx*sxy)/dnm;
+			double b1=(4.*sxy-sx*sy)/dnm;
+			double dy0=-b0;
+			double dy1=y1-(b0+b1*x1);
+			double dy2=y2-(b0+b1*x2);
+			double dy3=y3-(b0+b1*x3);
+			double vol=dy0*dy0+dy1*dy1+dy2*dy2+dy3*dy3;
+			double epsln=(yd[id0]*yd[id0]+yd[id1]*yd[id1]
+				+yd[id2]*yd[id2]+yd[id3]*yd[id3])*1e-12;
+			if(vol>epsln) {
+				double wt=1./(vol*sxx);
+				smpef=smpef+pe*wt;
+				smwtf=smwtf+wt;
+			} else {
+				smpei=smpei+pe;
+				smwti=smwti+1.;
+			}
+		}
+		yp[iept]=smwti<0.5?smpef/smwtf:smpei/smwti;
+	}
+	dx=xd[iint+1]-xd[iint];
+	dy=yd[iint+1]-yd[iint];
+	a0=yd[iint];
+	a1=yp[0];
+	yp[1]=yp[1]-yp[0];
+	yp[0]=yp[0]-dy/dx;
+	a2=-(3.*yp[0]+yp[1])/dx;
+	a3=(2.*yp[0]+yp[1])/(dx*dx);
+	xx=x-xd[iint];
+	d=a1+xx*(2.*a2+xx*3.*a3);
+	return a0+xx*(a1+xx*(a2+xx*a3));
+
+}
+
+double uvip3(int nd,const double *xd,const double *yd,double x) {
+	double d;
+	return uvip3(nd,xd,yd,x,d);
+}
+
+// Basis functions of the rational splines (gi, gid)
+double gi(int i,double x,double pp) {
+	double h=1.-x;
+	if(i==1) return h;
+	if(i==2) return x;
+	if(i==3) return h*h*h/(pp*x+1.);
+	return x*x*x/(pp*h+1.);
+}
+
+double gid(int i,double x,double pp) {
+	if(i==1) return -1.;
+	if(i==2) return 1.;
+	if(i==3) return -((x-1.)*(x-1.))*(2.*pp*x+3.+pp)/((pp*x+1.)*(pp*x+1.));
+	return -x*x*(-3.*pp+2.*pp*x-3.)/((-pp+pp*x-1.)*(-pp+pp*x-1.));
+}
+
+}
+
+// Tables, copied from the commons filled by opinit
+struct opa_houdek_context::tables {
+	int nzvai,ntabi,nxiri,nyiri,nyifi,iorder;
+	bool lec;
+	double pp;
+	double tls[HOUDEK_NYIF+1];
+	double xtab[HOUDEK_NTAB+1],ztab[HOUDEK_NZVA+1],ztabl[HOUDEK_NZVA+1];
+	std::vector<double> rlg,tlg,ra;
+
+	explicit tables(const std::string &tabnam);
+	const double *rlgp(int itab,int l) const {
+		return &rlg[((l-1)*HOUDEK_NTAB+itab-1)*HOUDEK_NXIR];
+	}
+	const double *tlgp(int itab,int l) const {
+		return &tlg[((l-1)*HOUDEK_NTAB+itab-1)*HOUDEK_NYIR];
+	}
+	double rat(int i,int j,int k,int m,int itab,int l) const {
+		return ra[(((((l-1)*HOUDEK_NTAB+itab-1)*4+m-1)*4+k-1)*HOUDEK_NYIF
+			+j-1)*HOUDEK_NXIR+i-1];
+	}
+	bool rbivpd(double u,double v,int itab,int l,
+			double &z,double &zx,double &zy) const;
+	double eval(double X,double Z,double logT,double logR,
+			double &dlogkr,double &dlogkt,bool &extrapolated) const;
+};
+
+opa_houdek_context::tables::tables(const std::string &tabnam) {
+
+	// opinit reads the tables into common blocks, shared by all the contexts
+	static std::mutex mtx;
+	std::lock_guard<std::mutex> lock(mtx);
+
+	char name[80];
+	int iorder=4,imode=2;
 	double eps;
 
-	if(!init) {
-    	iorder=4;
-		imode=2;
-		maceps_(&eps);
-		sprintf(tabnam, "%s/ester/tables/houdek/v9/OPINTPATH_AX", ESTER_DATADIR);
-		for(i=strlen(tabnam);i<80;i++) tabnam[i]=' ';
-		opinit_(&eps,&iorder,tabnam,&imode,80);	
-    	init=1;
-    }
-
-	opa.k.dim(T.nrows(),T.ncols());
-	dlnkT.dim(T.nrows(),T.ncols());
-	dlnkrho.dim(T.nrows(),T.ncols());
-	N=T.nrows()*T.ncols();
-	double dlogkt,dlogkr;
-	
-	for(i=0;i<N;i++) {
-		opa.k(i)=opa_houdek_i(X(i),Z,T(i),rho(i),dlogkt,dlogkr);
-		dlnkT(i)=dlogkt;
-		dlnkrho(i)=dlogkr;
-	}
-	opa.k=pow(10,opa.k);
+	if(tabnam.size()>80)
+		ester_err("Houdek opacity: path too long: %s",tabnam.c_str());
+	memset(name,' ',80);
+	memcpy(name,tabnam.c_str(),tabnam.size());
+	maceps_(&eps);
+	opinit_(&eps,&iorder,name,&imode,80);
+
+	nzvai=tabdim_.nzvai;
+	ntabi=tabdim_.ntabi;
+	nxiri=tabdim_.nxiri;
+	nyiri=tabdim_.nyiri;
+	nyifi=tabdim_.nyifi;
+	this->iorder=tablex_.iorder;
+	lec=tablex_.lec;
+	pp=birasp_.pp;
+	for(int i=1;i<=HOUDEK_NYIF;i++) tls[i]=birasp_.tls[i-1];
+	for(int i=1;i<=HOUDEK_NTAB;i++) xtab[i]=tablex_.xtab[i-1];
+	for(int i=1;i<=HOUDEK_NZVA;i++) {
+		ztab[i]=tablez_.ztab[i-1];
+		ztabl[i]=tablez_.ztabl[i-1];
+	}
+	rlg.assign(&opadat_.rlg[0][0][0],
+		&opadat_.rlg[0][0][0]+HOUDEK_NZVA*HOUDEK_NTAB*HOUDEK_NXIR);
+	tlg.assign(&opadat_.tlg[0][0][0],
+		&opadat_.tlg[0][0][0]+HOUDEK_NZVA*HOUDEK_NTAB*HOUDEK_NYIR);
+	ra.assign(&birasp_.ra[0][0][0][0][0][0],&birasp_.ra[0][0][0][0][0][0]
+		+HOUDEK_NZVA*HOUDEK_NTAB*16*HOUDEK_NYIF*HOUDEK_NXIR);
+
+}
+
+// Birational spline of table (itab,l) at (u,v)=(logR,logT), and its
+// derivatives (rbivpd). Returns false outside of the table.
+bool opa_houdek_context::tables::rbivpd(double u,double v,int itab,int l,
+		double &z,double &zx,double &zy) const {
+
+	const double *x=rlgp(itab,l)-1,*y=tls;
+	int n=nxiri,m=nyifi,i=1,j=1,k;
+
+	if(u<x[1]||u>x[n]||v<y[1]||v>y[m]) return false;
+	if(u>x[2]) {
+		int h=n;
+		while(h>i+1) {
+			k=(i+h)/2;
+			if(u<x[k]) h=k;
+			else i=k;
+		}
+	}
+	if(v>y[2]) {
+		int h=m;
+		while(h>j+1) {
+			k=(j+h)/2;
+			if(v<y[k]) h=k;
+			else j=k;
+		}
+	}
+	double ux=(u-x[i])/(x[i+1]-x[i]);
+	double vy=(v-y[j])/(y[j+1]-y[j]);
+	z=0;
+	zx=0;
+	zy=0;
+	for(k=1;k<=4;k++) {
+		double h=gi(k,ux,pp);
+		double hx=gid(k,ux,pp);
+		for(int q=1;q<=4;q++) {
+			double a=rat(i,j,k,q,itab,l);
+			z=z+a*h*gi(q,vy,pp);
+			zx=zx+a*hx*gi(q,vy,pp)/(x[i+1]-x[i]);
+			zy=zy+a*h*gid(q,vy,pp)/(y[j+1]-y[j]);
+		}
+	}
+	return true;
+
+}
+
+// log10(kappa) and its derivatives with respect to log10(R) at constant T
+// and log10(T) at constant rho (opints), with R=rho/T6^3.
+double opa_houdek_context::tables::eval(double xval,double zval,double tlgv,
+		double rlgv,double &opx,double &opy,bool &extrapolated) const {
+
+	double zz[HOUDEK_NTAB],px[HOUDEK_NTAB],py[HOUDEK_NTAB];
+	double op[HOUDEK_NZVA],ox[HOUDEK_NZVA],oy[HOUDEK_NZVA],d;
+	double opalg,zvall,xi=rlgv,yi=tlgv;
+	int nzvab,ntabb,jlo,l,itab;
+
+	if(zval<1e-7) {
+		zval=1e-7;
+		zvall=-7.;
+	} else zvall=log10(zval);
+	jlo=1;
+	hunt(ztab+1,nzvai,zval,jlo);
+	if(jlo<iorder) nzvab=1;
+	else if(jlo>nzvai-(iorder-1)) nzvab=nzvai-iorder;
+	else {
+		if(fabs(zval-ztab[jlo])>fabs(zval-ztab[jlo+1])) jlo++;
+		nzvab=jlo-int(iorder/2.+0.5);
+	}
+	jlo=1;
+	hunt(xtab+1,ntabi,xval,jlo);
+	if(jlo<iorder) ntabb=1;
+	else if(jlo>ntabi-(iorder-1)) ntabb=ntabi-iorder;
+	else {
+		if(fabs(xval-xtab[jlo])>fabs(xval-xtab[jlo+1])) jlo++;
+		ntabb=jlo-int(iorder/2.+0.5);
+	}
+
+	extrapolated=false;
+	for(l=nzvab;l<=nzvab+iorder;l++) {
+		for(itab=ntabb;itab<=ntabb+iorder;itab++) {
+			int k=itab-ntabb;
+			if(!rbivpd(xi,yi,itab,l,zz[k],px[k],py[k])) {
+				extrapolated=true;
+				break;
+			}
+		}
+		if(extrapolated) break;
+		op[l-nzvab]=uvip3(iorder+1,xtab+ntabb,zz,xval,d);
+		ox[l-nzvab]=uvip3(iorder+1,xtab+ntabb,px,xval);
+		oy[l-nzvab]=uvip3(iorder+1,xtab+ntabb,py,xval);
+	}
+
+	if(extrapolated) {
+		// Outside of the tables: Shepard's method, from the nexp+1 nearest
+		// points on the edge of the tables
+		const int nexp=3;
+		const double *rlg0=rlgp(6,10)-1,*tlg0=tlgp(6,10)-1;
+		double xshep[nexp+1],yshep[nexp+1],zzshep[nexp+1],
+			pxshep[nexp+1],pyshep[nexp+1];
+		double xii=xi,yii=yi,zii=0,pdx=0,pdy=0;
+		int nrlgb=0,ntlgb=0;
+		bool rlef=xi<rlg0[1],rrig=xi>rlg0[nxiri],
+			ttop=yi<tlg0[1],tbot=yi>tlg0[nyiri];
+		if(tbot||ttop) {
+			jlo=1;
+			hunt(rlg0+1,nxiri,xi,jlo);
+			if(jlo<nexp) nrlgb=1;
+			else if(jlo>nxiri-(nexp-1)) nrlgb=nxiri-nexp;
+			else nrlgb=jlo-1;
+		}
+		if(rlef||rrig) {
+			jlo=1;
+			hunt(tls+1,nyifi,yi,jlo);
+			if(jlo<nexp) ntlgb=1;
+			else if(jlo>nyifi-(nexp-1)) ntlgb=nyifi-nexp;
+			else ntlgb=jlo-1;
+		}
+		for(l=nzvab;l<=nzvab+iorder;l++) {
+			for(itab=ntabb;itab<=ntabb+iorder;itab++) {
+				const double *rlgl=rlgp(itab,l)-1;
+				for(int ii=0;ii<=nexp;ii++) {
+					if(ttop||tbot) {
+						xii=rlgl[nrlgb+ii];
+						if(ttop) yii=tls[1];
+						if(tbot) yii=tls[nyifi];
+					}
+					if(rlef||rrig) {
+						yii=tls[ntlgb+ii];
+						if(rlef) xii=rlgl[1];
+						if(rrig) xii=rlgl[nxiri];
+					}
+					rbivpd(xii,yii,itab,l,zii,pdx,pdy);
+					zzshep[ii]=zii;
+					pxshep[ii]=pdx;
+					pyshep[ii]=pdy;
+					xshep[ii]=xii;
+					yshep[ii]=yii;
+				}
+				double anum[3]={0,0,0},aden=0;
+				for(int ii=0;ii<=nexp;ii++) {
+					double r2=(xshep[ii]-xi)*(xshep[ii]-xi)
+						+(yshep[ii]-yi)*(yshep[ii]-yi);
+					double r4=r2*r2;
+					if(r4==0) continue;
+					anum[0]=anum[0]+zzshep[ii]/r4;
+					anum[1]=anum[1]+pxshep[ii]/r4;
+					anum[2]=anum[2]+pyshep[ii]/r4;
+					aden=aden+1/r4;
+				}
+				zz[itab-ntabb]=anum[0]/aden;
+				px[itab-ntabb]=anum[1]/aden;
+				py[itab-ntabb]=anum[2]/aden;
+			}
+			op[l-nzvab]=uvip3(iorder+1,xtab+ntabb,zz,xval,d);
+			ox[l-nzvab]=uvip3(iorder+1,xtab+ntabb,px,xval);
+			oy[l-nzvab]=uvip3(iorder+1,xtab+ntabb,py,xval);
+		}
+	}
+
+	opalg=uvip3(iorder+1,ztabl+nzvab,op,zvall,d);
+	opx=uvip3(iorder+1,ztabl+nzvab,ox,zvall);
+	opy=uvip3(iorder+1,ztabl+nzvab,oy,zvall);
+	opy=opy-3.*opx;
+	if(lec) {
+		// Electron conduction
+		double rholgv=rlgv+3.*tlgv-1.8e1;
+		double ecot,ecor;
+		double ecolg=itohec(xval,zval,tlgv,rholgv,ecot,ecor);
+		if(ecolg-opalg<3.) {
+			double opa10=pow(1e1,opalg);
+			double eco10=pow(1e1,ecolg);
+			double ope10=opa10+eco10;
+			opalg=opalg+ecolg-log10(ope10);
+			opy=opy*eco10/ope10+ecot*opa10/ope10;
+			opx=opx*eco10/ope10+ecor*opa10/ope10;
+		}
+	}
+	return opalg;
+
+}
+
+opa_houdek_context::opa_houdek_context(const std::string &tabnam) {
+
+	std::string name=tabnam;
+	if(name.empty())
+		name=std::string(ESTER_DATADIR)+"/ester/tables/houdek/v9/OPINTPATH_AX";
+	tab=std::make_shared<const tables>(name);
+
+}
+
+int opa_houdek_context::evaluate(const matrix &X,double Z,const matrix &T,
+		const matrix &rho,opa_struct &opa) const {
+
+	int N=T.nrows()*T.ncols();
+	matrix logk(T.nrows(),T.ncols()),dlnkT(T.nrows(),T.ncols()),
+		dlnkrho(T.nrows(),T.ncols());
+	matrix logT=log10(T);
+	matrix t6=T*1e-6;
+	matrix logR=log10(rho/t6/t6/t6);
+	std::vector<char> extrapolated(N);
+
+	if(Z<1e-7) ester_warn("Houdek opacity: setting Z=1e-7");
+	parallel_for(N,[&](int begin,int end) {
+		for(int i=begin;i<end;i++) {
+			bool e;
+			logk(i)=tab->eval(X(i),Z,logT(i),logR(i),dlnkrho(i),dlnkT(i),e);
+			extrapolated[i]=e;
+		}
+	},16);
+	int next=0;
+	for(int i=0;i<N;i++) next+=extrapolated[i];
+	if(next)
+		ester_warn("Houdek opacity: %d points outside of the tables, "
+			"extrapolated with Shepard's method",next);
+
+	opa.k=pow(10,logk);
 	opa.xi=16*SIG_SB*pow(T,3)/(3*opa.k*rho);
 	opa.dlnxi_lnrho=-1-dlnkrho;
-    opa.dlnxi_lnT=3-dlnkT;
-	
-	return error;
-		
+	opa.dlnxi_lnT=3-dlnkT;
+
+	return 0;
+
+}
+
+int opa_houdek(const matrix &X,double Z,const matrix &T,const matrix &rho,
+		opa_struct &opa) {
+
+	static const opa_houdek_context houdek;
+
+	return houdek.evaluate(X,Z,T,rho,opa);
+
 }
-		
@@ -5,64 +5,466 @@
 #include "matrix.h"
 #include "constants.h"
 #include "physics.h"
+#include "parallel.h"
+#include <algorithm>
 #include <cmath>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+// GN93hz tables, as loaded (and smoothed) by the Fortran code (xztrin21.F)
+#define GN93_MX 10
+#define GN93_MZ 13
+#define GN93_NR 19
+#define GN93_NT 70
 
 extern"C" {
-	void opac_(int *izi,int *mzin,double *X,double *t6,double *r);
 	void opacgn93_(double *Z,double *X,double *t6,double *r);
-	extern struct{
-		double opact,dopact,dopacr,dopactd;
-	} e_;
+	// Commons are not aligned (-fno-align-commons)
+	extern struct __attribute__((packed)) {
+		int mzz;
+		double xz[GN93_NR][GN93_NT][GN93_MZ][GN93_MX];
+		double t6list[GN93_NT],alr[GN93_NR];
+		int n[GN93_MX];
+		double alt[GN93_NT];
+	} a_;
+}
+
+namespace {
+
+// Number of temperatures of the tables at each R (nta)
+const int gn93_nta[GN93_NR]={70,70,70,70,70,70,70,70,70,70,70,70,70,70,
+	69,64,60,58,57};
+// Number of tables (values of Z) at each X (n)
+const int gn93_n[GN93_MX]={13,13,13,13,13,13,13,13,10,12};
+
+// Quadratic interpolation, and its derivative (dkap in xztrin21.F)
+double quad(double x,double y1,double y2,double y3,
+		double x1,double x2,double x3,double &dkap) {
+	double xx12=1./(x1-x2),xx13=1./(x1-x3),xx23=1./(x2-x3);
+	double c3=(y1-y2)*xx12;
+	c3=c3-(y2-y3)*xx23;
+	c3=c3*xx13;
+	double c2=(y1-y2)*xx12-(x1+x2)*c3;
+	double c1=y1-x1*c2-x1*x1*c3;
+	dkap=c2+(x+x)*c3;
+	return c1+x*(c2+x*c3);
+}
+
+double quad(double x,double y1,double y2,double y3,
+		double x1,double x2,double x3) {
+	double dkap;
+	return quad(x,y1,y2,y3,x1,x2,x3,dkap);
+}
+
+// Reentrant version of the interpolation of xztrin21.F (opacgn93, opac and
+// t6rinterp): the smoothed tables are loaded once and only read afterwards,
+// the state of the interpolation of a point being kept on the stack.
+class opal_gn93_table {
+	std::vector<double> xz;
+	double xa[GN93_MX+1],xx[GN93_MX+1],dfsx[GN93_MX+1];
+	double za[GN93_MZ+1],dfsz[GN93_MZ+1];
+	double alr[GN93_NR+1],dfsr[GN93_NR+1];
+	double alt[GN93_NT+1],t6list[GN93_NT+1],dfs[GN93_NT+1];
+
+	// Table indices, kept between the calls to opac for the different Z
+	struct indices {
+		int mf,mg,mh,mi,mf2,l1,l2,l3,l4,k1,k2,k3,k4;
+	};
+	// Points of the tables copied by opac (opl in xztrin21.F), around the
+	// indices (k0,l0) of the first call. Each X table is copied over its own
+	// range, a table value of exactly zero at (k3,l4) being taken as missing,
+	// so that the other points keep the values of the previous Z.
+	struct window {
+		int k0,l0;
+		bool set[GN93_MX][12][8];
+		double opl[GN93_MX][12][8];
+	};
+	double table(int m,int mz,int it,int ir) const {
+		return xz[(((ir-1)*GN93_NT+it-1)*GN93_MZ+mz-1)*GN93_MX+m-1];
+	}
+	double opl(const window &w,int m,int mz,int it,int ir) const;
+	bool opac(bool izi,int mzz,double zval,double xh,double t6,double r,
+			indices &s,window &w,
+			double &opact,double &dopact,double &dopacr) const;
+public:
+	opal_gn93_table();
+	bool eval(double Z,double X,double t6,double r,
+			double &opact,double &dopact,double &dopacr) const;
+};
+
+opal_gn93_table::opal_gn93_table() {
+
+	// readco, with the smoothing of the tables, is run by the Fortran code
+	// on its first call
+	double Z=0.02,X=0.7,t6=1.,r=1e-3;
+	opacgn93_(&Z,&X,&t6,&r);
+
+	xz.resize(GN93_MX*GN93_MZ*GN93_NT*GN93_NR);
+	for(int ir=0;ir<GN93_NR;ir++) for(int it=0;it<GN93_NT;it++)
+		for(int iz=0;iz<GN93_MZ;iz++) for(int m=0;m<GN93_MX;m++)
+			xz[((ir*GN93_NT+it)*GN93_MZ+iz)*GN93_MX+m]=a_.xz[ir][it][iz][m];
+	for(int i=1;i<=GN93_NT;i++) {
+		alt[i]=a_.alt[i-1];
+		t6list[i]=a_.t6list[i-1];
+	}
+	for(int i=1;i<=GN93_NR;i++) alr[i]=a_.alr[i-1];
+
+	const double x[GN93_MX-1]={0.0,0.1,0.2,0.35,0.5,.7,.8,.9,.95};
+	const double z[GN93_MZ]={.0,0.0001,.0003,.001,.002,.004,.01,.02,.03,
+		.04,.06,.08,.1};
+	xa[GN93_MX]=xx[GN93_MX]=dfsx[GN93_MX]=0;
+	for(int i=1;i<GN93_MX;i++) {
+		xa[i]=x[i-1];
+		xx[i]=log10(.005+xa[i]);
+	}
+	for(int i=1;i<=GN93_MZ;i++) za[i]=z[i-1];
+	for(int i=2;i<GN93_MX;i++) dfsx[i]=1./(xx[i]-xx[i-1]);
+	for(int i=2;i<=GN93_NT;i++) dfs[i]=1./(alt[i]-alt[i-1]);
+	for(int i=2;i<=GN93_NR;i++) dfsr[i]=1./(alr[i]-alr[i-1]);
+	for(int i=2;i<=GN93_MZ;i++) dfsz[i]=1./(za[i]-za[i-1]);
+
+}
+
+// opacgn93: log10(kappa) and its derivatives with respect to log10(T6) at
+// constant R and to log10(R) at constant T6, for R=rho/T6^3. Returns false
+// outside of the tables.
+bool opal_gn93_table::eval(double z,double xh,double t6,double r,
+		double &opact,double &dopact,double &dopacr) const {
+
+	indices s;
+	window w;
+	double kapz[GN93_MZ+1],dkapdtr[GN93_MZ+1],dkapdrt[GN93_MZ+1];
+	int ilo,ihi,imd,i,m1,m2,m3,m4,mfm;
+
+	for(i=1;i<=GN93_MZ;i++)
+		if(fabs(z-za[i])<1.e-7)
+			return opac(false,i,z,xh,t6,r,s,w,opact,dopact,dopacr);
+
+	ilo=2;ihi=GN93_MZ;
+	while(ihi-ilo>1) {
+		imd=(ihi+ilo)/2;
+		if(z<=za[imd]+1.e-7) ihi=imd;
+		else ilo=imd;
+	}
+	i=ihi;
+	m1=i-2;m2=i-1;m3=i;m4=i+1;mfm=m4;
+	if(z<=za[2]+1.e-7||z>=za[GN93_MZ-1]) mfm=m3;
+	if(xh+za[mfm]>1.) mfm=m3;
+	if(xh+za[mfm]>1.) {
+		// X,Z location not covered by logic
+		if(m1<=1) return false;
+		m1--;m2--;m3--;
+		// xztrin21.F keeps mfm, and then uses kapz(m4) without computing it
+		mfm=m3;
+	}
+	for(int iz=m1;iz<=mfm;iz++) {
+		if(!opac(iz>m1,iz,z,xh,t6,r,s,w,opact,dopact,dopacr)) return false;
+		kapz[iz]=pow(10.,opact);
+		dkapdtr[iz]=dopact;
+		dkapdrt[iz]=dopacr;
+	}
+
+	double kapz1=quad(z,kapz[m1],kapz[m2],kapz[m3],za[m1],za[m2],za[m3]);
+	double dkapz1=quad(z,dkapdtr[m1],dkapdtr[m2],dkapdtr[m3],
+		za[m1],za[m2],za[m3]);
+	double dkapz3=quad(z,dkapdrt[m1],dkapdrt[m2],dkapdrt[m3],
+		za[m1],za[m2],za[m3]);
+	if(mfm==m3) {
+		opact=log10(kapz1);
+		dopact=dkapz1;
+		dopacr=dkapz3;
+		return true;
+	}
+	double kapz2=quad(z,kapz[m2],kapz[m3],kapz[m4],za[m2],za[m3],za[m4]);
+	double dkapz2=quad(z,dkapdtr[m2],dkapdtr[m3],dkapdtr[m4],
+		za[m2],za[m3],za[m4]);
+	double dkapz4=quad(z,dkapdrt[m2],dkapdrt[m3],dkapdrt[m4],
+		za[m2],za[m3],za[m4]);
+	double dix=(za[m3]-z)*dfsz[m3];
+	opact=log10(kapz1*dix+kapz2*(1.-dix));
+	dopact=dkapz1*dix+dkapz2*(1.-dix);
+	dopacr=dkapz3*dix+dkapz4*(1.-dix);
+	return true;
+
+}
+
+double opal_gn93_table::opl(const window &w,int m,int mz,int it,int ir) const {
+
+	int i=it-w.k0,j=ir-w.l0;
+	if(i>=0&&i<12&&j>=0&&j<8&&w.set[m-1][i][j]) return w.opl[m-1][i][j];
+	return table(m,mz,it,ir);
+
 }
 
-double opa_opal_i(double X,double Z,double T,double rho,double &dlogkt,double &dlogkr) {
+// opac and t6rinterp, for the tables of Z=za(mzz). The indices s are computed
+// if izi is false, and reused otherwise.
+bool opal_gn93_table::opac(bool izi,int mzz,double zval,double xh,double t6,
+		double r,indices &s,window &w,
+		double &opact,double &dopact,double &dopacr) const {
 
-    double t6,r;
+	double z=za[mzz];
+	int ilo,ihi,imd,i,ip,iq;
 
-    t6=T*1e-6;
-    r=rho/t6/t6/t6;
+	if(!izi&&z+xh-1.e-6>1) return false;
+	if(izi&&zval+xh-1.e-6>1) return false;
+	double xxx=log10(.005+xh);
+	double slt=log10(t6);
+	double slr=log10(r);
 
-    opacgn93_(&Z,&X,&t6,&r);
-    dlogkt=e_.dopact;
-    dlogkr=e_.dopacr;
+	// The last table is for X=1-Z
+	double xa[GN93_MX+1],xx[GN93_MX+1],dfsx[GN93_MX+1];
+	for(i=1;i<=GN93_MX;i++) {
+		xa[i]=this->xa[i];
+		xx[i]=this->xx[i];
+		dfsx[i]=this->dfsx[i];
+	}
+	int mxend=GN93_MX;
+	xa[GN93_MX]=1.-z;
+	if(xa[GN93_MX]<xa[GN93_MX-1]) {
+		mxend=GN93_MX-1;
+		xa[mxend]=xa[GN93_MX];
+	}
+	if(xh>=0.8) {
+		xx[mxend]=log10(0.005+xa[mxend]);
+		dfsx[mxend]=1./(xx[mxend]-xx[mxend-1]);
+	}
+	if(slt<alt[1]||slt>alt[GN93_NT]||slr<alr[1]||slr>alr[GN93_NR])
+		return false;
+
+	if(!izi) {
+		ilo=2;ihi=GN93_MX;
+		while(ihi-ilo>1) {
+			imd=(ihi+ilo)/2;
+			if(xh<=xa[imd]+1.e-7) ihi=imd;
+			else ilo=imd;
+		}
+		i=ihi;
+		s.mf=i-2;s.mg=i-1;s.mh=i;s.mi=i+1;s.mf2=s.mi;
+		if(xh<1.e-6) {
+			// mf is left to 0 in xztrin21.F
+			s.mf=s.mh=s.mg=1;s.mi=2;s.mf2=1;
+		}
+		if(xh<=xa[2]+1.e-7||xh>=xa[GN93_MX-2]-1.e-7) s.mf2=s.mh;
+		ilo=2;ihi=GN93_NR;
+		while(ihi-ilo>1) {
+			imd=(ihi+ilo)/2;
+			if(slr<=alr[imd]+1.e-7) ihi=imd;
+			else ilo=imd;
+		}
+		i=ihi;
+		s.l1=i-2;s.l2=i-1;s.l3=i;s.l4=s.l3+1;
+		ilo=2;ihi=GN93_NT;
+		while(ihi-ilo>1) {
+			imd=(ihi+ilo)/2;
+			if(t6<=t6list[imd]+1.e-7) ihi=imd;
+			else ilo=imd;
+		}
+		i=ihi;
+		s.k1=i-2;s.k2=i-1;s.k3=i;s.k4=s.k3+1;
+		w.k0=s.k1;w.l0=s.l1;
+		std::fill(&w.set[0][0][0],&w.set[0][0][0]+sizeof(w.set),false);
+	}
+
+	// Low T, low X corner of the tables, where there is no data
+	int kmin=0,k1in=s.k1,iadvance=0;
+	if(s.mf==1&&table(1,mzz,s.k1,s.l1)>9.) {
+		for(i=1;i<=6;i++) {
+			if(table(1,mzz,i,s.l1)>9.) {
+				if(xh<.1) kmin=i+1;
+				else if(iadvance==0) {
+					iadvance++;
+					s.mf++;s.mg++;s.mh++;s.mi++;s.mf2++;
+				}
+			}
+		}
+		if(iadvance==0&&s.k1<=kmin&&slt<=alt[kmin]) {
+			s.k1=kmin;
+			if(table(1,mzz,kmin,s.l1+1)<9.&&slr+.01>alr[s.l1+1]) {
+				s.l1++;
+				kmin=0;
+				s.k1=k1in;
+				for(i=1;i<=6;i++)
+					if(table(1,mzz,i,s.l1)>9.) kmin=i+1;
+				if(kmin!=0&&k1in<kmin) s.k1=kmin;
+			}
+		}
+		if(slt+.001<alt[s.k1]) {
+			opact=30.;
+			dopact=99.;
+			dopacr=99.;
+			return true;
+		}
+		s.l2=s.l1+1;s.l3=s.l2+1;s.l4=s.l3+1;
+		s.k2=s.k1+1;s.k3=s.k2+1;s.k4=s.k3+1;
+	}
+	// Jagged edge at high T, rho
+	for(i=14;i<=18;i++)
+		if(s.l3>i&&s.k3>gn93_nta[i]) return false;
+
+	// The last X table gives the size of the grid
+	int l1=s.l1,k1=s.k1;
+	for(int m=s.mf;m<=s.mf2;m++) {
+		ip=iq=3;
+		if(s.k3==gn93_nta[s.l3-1]) ip=iq=2;
+		if(t6<=t6list[2]+1.e-7) ip=2;
+		if(s.l3==GN93_NR) ip=iq=2;
+		if(s.l4<=GN93_NR&&table(m,mzz,s.k3,s.l4)==.0) iq=2;
+		if(slr<=alr[2]+1.e-7) iq=2;
+		for(int ir=l1;ir<=l1+iq;ir++) for(int it=k1;it<=k1+ip;it++) {
+			int di=it-w.k0,dj=ir-w.l0;
+			if(di<0||di>=12||dj<0||dj>=8) continue;
+			w.opl[m-1][di][dj]=table(m,mzz,it,ir);
+			w.set[m-1][di][dj]=true;
+		}
+	}
+
+	// Tables missing at high X
+	if(mzz>gn93_n[s.mf-1]||mzz>gn93_n[s.mg-1]||mzz>gn93_n[s.mh-1])
+		return false;
+
+	// Interpolation in X
+	double opk[4][4];
+	for(int ir=0;ir<=iq;ir++) for(int it=0;it<=ip;it++) {
+		if(s.mf2==1) {
+			opk[it][ir]=opl(w,s.mf,mzz,k1+it,l1+ir);
+			continue;
+		}
+		opk[it][ir]=quad(xxx,opl(w,s.mf,mzz,k1+it,l1+ir),
+			opl(w,s.mg,mzz,k1+it,l1+ir),opl(w,s.mh,mzz,k1+it,l1+ir),
+			xx[s.mf],xx[s.mg],xx[s.mh]);
+	}
+	if(s.mi==s.mf2) {
+		double dixr=(xx[s.mh]-xxx)*dfsx[s.mh];
+		for(int ir=0;ir<=iq;ir++) for(int it=0;it<=ip;it++) {
+			double opk2=quad(xxx,opl(w,s.mg,mzz,k1+it,l1+ir),
+				opl(w,s.mh,mzz,k1+it,l1+ir),opl(w,s.mi,mzz,k1+it,l1+ir),
+				xx[s.mg],xx[s.mh],xx[s.mi]);
+			opk[it][ir]=opk[it][ir]*dixr+opk2*(1.-dixr);
+		}
+	}
+
+	// Interpolation in T6 and R (t6rinterp), mixing overlapping quadratics
+	double h[4],q[4],dkap,dkap1,dkap2,dkapq1,dkapq2,dkapq3;
+	double opact2,opactq=0,opactq2,dopactq=0,opacrq,dopacrq;
+	double dix=0,dix2=0;
+	for(int it=0;it<=ip;it++) {
+		h[it]=quad(slr,opk[it][0],opk[it][1],opk[it][2],
+			alr[l1],alr[l1+1],alr[l1+2]);
+		if(iq==3)
+			q[it]=quad(slr,opk[it][1],opk[it][2],opk[it][3],
+				alr[l1+1],alr[l1+2],alr[l1+3]);
+	}
+	opact=quad(slt,h[0],h[1],h[2],alt[k1],alt[k1+1],alt[k1+2],dkap);
+	dopact=dkap;
+	dkap1=dkap;
+	if(iq==3) {
+		opactq=quad(slt,q[0],q[1],q[2],alt[k1],alt[k1+1],alt[k1+2],dkap);
+		dkapq1=dkap;
+	}
+	if(ip==3) {
+		opact2=quad(slt,h[1],h[2],h[3],alt[k1+1],alt[k1+2],alt[k1+3],dkap);
+		dkap2=dkap;
+		dix=(alt[k1+2]-slt)*dfs[k1+2];
+		dopact=dkap1*dix+dkap2*(1.-dix);
+		opact=opact*dix+opact2*(1.-dix);
+		if(iq==3) {
+			opactq2=quad(slt,q[1],q[2],q[3],
+				alt[k1+1],alt[k1+2],alt[k1+3],dkap);
+			dkapq2=dkap;
+			dopactq=dkapq1*dix+dkapq2*(1.-dix);
+			opactq=opactq*dix+opactq2*(1.-dix);
+		}
+	}
+	for(int ir=0;ir<=iq;ir++) {
+		h[ir]=quad(slt,opk[0][ir],opk[1][ir],opk[2][ir],
+			alt[k1],alt[k1+1],alt[k1+2]);
+		if(ip==3)
+			q[ir]=quad(slt,opk[1][ir],opk[2][ir],opk[3][ir],
+				alt[k1+1],alt[k1+2],alt[k1+3]);
+	}
+	quad(slr,h[0],h[1],h[2],alr[l1],alr[l1+1],alr[l1+2],dkap);
+	dopacr=dkap;
+	if(ip==3) {
+		quad(slr,q[0],q[1],q[2],alr[l1],alr[l1+1],alr[l1+2],dkap);
+		dkapq3=dkap;
+	}
+	if(iq==3) {
+		quad(slr,h[1],h[2],h[3],alr[l1+1],alr[l1+2],alr[l1+3],dkap);
+		dix2=(alr[l1+2]-slr)*dfsr[l1+2];
+		dopacr=dopacr*dix2+dkap*(1.-dix2);
+		if(ip==3) {
+			dopact=dopact*dix2+dopactq*(1.-dix2);
+			opact=opact*dix2+opactq*(1-dix2);
+		}
+		if(ip==3) {
+			quad(slr,q[1],q[2],q[3],alr[l1+1],alr[l1+2],alr[l1+3],dkap);
+			dopacrq=dkapq3*dix2+dkap*(1.-dix2);
+			dopacr=dopacr*dix+dopacrq*(1.-dix);
+		}
+	}
+	// Interpolation indices out of range
+	if(opact>1.e15) return false;
+	if(opact>9.) {
+		dopact=99.;
+		dopacr=99.;
+	}
+	return true;
+
+}
+
+std::shared_ptr<const opal_gn93_table> opal_gn93_get_table() {
+
+	static std::mutex mtx;
+	static std::shared_ptr<const opal_gn93_table> table;
+
+	std::lock_guard<std::mutex> lock(mtx);
+	if(!table) table=std::make_shared<opal_gn93_table>();
+	return table;
+
+}
 
-	return e_.opact;
 }
 
 int opa_opal(const matrix &X,double Z,const matrix &T,const matrix &rho,
 		opa_struct &opa) {
 
-	int i,N,error=0;
+	std::shared_ptr<const opal_gn93_table> table=opal_gn93_get_table();
+
+	int N=T.nrows()*T.ncols();
 	matrix dlnkT,dlnkrho;
+	matrix t6=T*1e-6;
+	matrix r=rho/t6/t6/t6;
+	matrix out=zeros(T.nrows(),T.ncols());
 
 	opa.k.dim(T.nrows(),T.ncols());
 	dlnkT.dim(T.nrows(),T.ncols());
 	dlnkrho.dim(T.nrows(),T.ncols());
-	N=T.nrows()*T.ncols();
-	double dlogkt,dlogkr;
-
-	for(i=0;i<N;i++) {
-		opa.k(i)=opa_opal_i(X(i),Z,T(i),rho(i),dlogkt,dlogkr);
-		if(opa.k(i)==-99) error=1;
-		dlnkT(i)=dlogkt;
-		dlnkrho(i)=dlogkr;
-        if (error) {
-            printf("Values outside OPAL opacity table\n");
-            printf("  X   = %e\n", X(i));
-            printf("  Z   = %e\n", Z);
-            printf("  T   = %e\n", T(i));
-            printf("  rho = %e\n", rho(i));
-            print_stack();
-            exit(EXIT_FAILURE);
-        }
+
+	parallel_for(N,[&](int begin,int end) {
+		for(int i=begin;i<end;i++)
+			if(!table->eval(Z,X(i),t6(i),r(i),opa.k(i),dlnkT(i),dlnkrho(i)))
+				out(i)=1;
+	},64);
+
+	if(exist(out)) {
+		int i=0;
+		while(out(i)==0) i++;
+		printf("Values outside OPAL opacity table\n");
+		printf("  X   = %e\n", X(i));
+		printf("  Z   = %e\n", Z);
+		printf("  T   = %e\n", T(i));
+		printf("  rho = %e\n", rho(i));
+		print_stack();
+		exit(EXIT_FAILURE);
 	}
+
 	opa.k=pow(10,opa.k);
 	dlnkT-=3*dlnkrho;
 	opa.xi=16*SIG_SB*pow(T,3)/(3*opa.k*rho);
 	opa.dlnxi_lnrho=-1-dlnkrho;
-    opa.dlnxi_lnT=3-dlnkT;
+	opa.dlnxi_lnT=3-dlnkT;
 
-	return error;
+	return 0;
 
 }
-
@@ -39,6 +39,8 @@ int eos_calc(const matrix &X,double Z,const matrix &T,const matrix &p,
         error=eos_opal(X,Z,T,p,rho,eos);
     else if(!strcmp(eos.name,"freeeos"))
         error = eos_freeeos(X, Z, T, p, rho, eos);
+    else if(!strcmp(eos.name,"freeeos_tab"))
+        error = eos_freeeos_tab(X, Z, T, p, rho, eos);
     else {
         ester_err("Unknown equation of state: %s",eos.name);
         return 1;
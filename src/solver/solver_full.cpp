@@ -3,9 +3,14 @@
 #endif
 #include "utils.h"
 #include "solver.h"
+#include "parallel.h"
 #include <unistd.h>
 #include <stdlib.h>
+#include <string.h>
+#include <fcntl.h>
+#include <sys/mman.h>
 #include <cmath>
+#include <algorithm>
 #include <time.h>
 
 extern "C" {
@@ -20,6 +25,53 @@ extern "C" {
 
 bool dump_jac = false;
 
+// Parallel LU factorization of the blocks: width of the panels, and of the
+// tiles of columns of the trailing matrix updated by each thread
+#define LU_PANEL 64
+#define LU_TILE 128
+// Minimum number of right hand sides solved by each thread
+#define SOLVE_GRAIN 16
+
+/// \brief LU factorization with partial pivoting of the n x n matrix \p a,
+/// same as dgetrf, in parallel.
+///
+/// Right-looking blocked algorithm: each panel of LU_PANEL columns is
+/// factorized with dgetrf, then the row interchanges and the update of the
+/// trailing matrix are done by tiles of columns, in parallel. The result
+/// does not depend on the number of threads.
+static int lu_factor(int n,double *a,int *ipiv) {
+
+	int info=0;
+
+	for(int j0=0;j0<n;j0+=LU_PANEL) {
+		int jb=std::min(LU_PANEL,n-j0),m=n-j0,k1=j0+1,k2=j0+jb,inc=1,iinfo;
+		double *p=a+j0+j0*n;
+		dgetrf_(&m,&jb,p,&n,ipiv+j0,&iinfo);
+		if(iinfo&&!info) info=iinfo+j0;
+		for(int i=j0;i<k2;i++) ipiv[i]+=j0;
+		int ntiles=(n-k2+LU_TILE-1)/LU_TILE;
+		// The last item applies the interchanges to the columns on the left
+		parallel_for(ntiles+1,[&](int begin,int end) {
+			for(int t=begin;t<end;t++) {
+				if(t==ntiles) {
+					int nc=j0;
+					if(nc) dlaswp_(&nc,a,&n,&k1,&k2,ipiv,&inc);
+					continue;
+				}
+				int c0=k2+t*LU_TILE,nc=std::min(LU_TILE,n-c0);
+				double *q=a+c0*n;
+				dlaswp_(&nc,q,&n,&k1,&k2,ipiv,&inc);
+				cblas_dtrsm(CblasColMajor,CblasLeft,CblasLower,CblasNoTrans,CblasUnit,
+					jb,nc,1,p,n,q+j0,n);
+				if(m>jb) cblas_dgemm(CblasColMajor,CblasNoTrans,CblasNoTrans,m-jb,nc,jb,
+					-1,p+jb,n,q+j0,n,1,q+k2,n);
+			}
+		});
+	}
+
+	return info;
+}
+
 solver_full::solver_full(int nblocks,int offcore) {
 	
 	nb=nblocks;
@@ -42,10 +94,20 @@ solver_full::solver_full(int nblocks,int offcore) {
 	oc=offcore;
 	
 	if(oc) {
-		sprintf(tempdir,"solver_full_oc_tmp_XXXXXX");
-		if (mkdtemp(tempdir) == NULL)
-            ester_err("could not create temporary directory `%s'",
-                    tempdir);
+		// The backing file is removed right away, the space is released
+		// when it is closed
+		char tmp[50];
+		sprintf(tmp,"solver_full_oc_tmp_XXXXXX");
+		oc_fd=mkstemp(tmp);
+		if (oc_fd<0)
+            ester_err("could not create temporary file `%s'",tmp);
+		unlink(tmp);
+		oc_size=0;
+		oc_region empty={0,0,0,0,NULL};
+		oc_reg.assign(3*nb,empty);
+		oc_buf.resize(3*nb);
+		oc_loaded.assign(3*nb,0);
+		oc_free.clear();
 	}
 
 }
@@ -66,10 +128,10 @@ solver_full::~solver_full() {
 		delete [] minf;
 	}
 	if(oc) {
-		char tmp[100];
-		sprintf(tmp,"rm -r %s",tempdir);
-		if (system(tmp))
-            ester_warn("could not remove %s", tempdir);
+		oc_wait();
+		for(i=0;i<3*nb;i++)
+			if(oc_reg[i].map) munmap(oc_reg[i].map,oc_reg[i].capacity);
+		close(oc_fd);
 	}
 }
 
@@ -187,6 +249,14 @@ void solver_full::lu_calc() {
 			}
 		}
 
+		// Load the blocks needed by the next step while factorizing this one
+		if(oc&&i<nb-1) {
+			std::vector<int> ids;
+			if(blk_index(i,0)) ids.push_back(nb+i);
+			if(blk_index(i,1)) ids.push_back(2*nb+i);
+			ids.push_back(i+1);
+			oc_prefetch(ids);
+		}
 		lu_block(i);
 	}
     if (dump_jac) {
@@ -225,7 +295,8 @@ void solver_full::lu_block(int i) {
 	
 	if(ipiv_flag(i)) delete [] ipiv[i];
 	ipiv[i]=new int[n];
-	dgetrf_(&n,&n,m[i].data(),&n,ipiv[i],&info);
+	if(ester_nthreads()>1) info=lu_factor(n,m[i].data(),ipiv[i]);
+	else dgetrf_(&n,&n,m[i].data(),&n,ipiv[i],&info);
 	ipiv_flag(i)=1;
 
 	if(verbose) {
@@ -237,7 +308,7 @@ void solver_full::lu_block(int i) {
 
 void solver_full::solve_block(int i,char trans,matrix &x) {
 
-	int n,nrhs,info=0;
+	int n,nrhs;
     matrix xx = x;
 	
 	if(trans=='T') x=x*c[i];
@@ -247,8 +318,12 @@ void solver_full::solve_block(int i,char trans,matrix &x) {
         ester_err("NaN in RHS solve block %d\n", i);
     }
 	
+	// The right hand sides are solved in parallel
 	n=m[i].nrows();nrhs=x.ncols();
-	dgetrs_(&trans,&n,&nrhs,m[i].data(),&n,ipiv[i],x.data(),&n,&info);
+	parallel_for(nrhs,[&](int begin,int end) {
+		int nc=end-begin,info=0;
+		dgetrs_(&trans,&n,&nc,m[i].data(),&n,ipiv[i],x.data()+begin*n,&n,&info);
+	},SOLVE_GRAIN);
 
     if (std::isnan(max(abs(x)))) {
         LOGE("NaN in solve block %d\n", i);
@@ -275,7 +350,14 @@ void solver_full::fwd_subs(matrix &x) {
 	j0=0;
 	for(i=1;i<nb;i++) {
 		if(blk_index(i-1,0)) {
-			if(oc) read_blockinf(i-1); 
+			if(oc) {
+				read_blockinf(i-1);
+				for(int k=i;k<nb-1;k++)
+					if(blk_index(k,0)) {
+						oc_prefetch(std::vector<int>(1,nb+k));
+						break;
+					}
+			}
 			x.setblock(j1,j1+minf[i-1].nrows()-1,0,x.ncols()-1,
 				x.block(j1,j1+minf[i-1].nrows()-1,0,x.ncols()-1)-
 				( minf[i-1] , x.block(j0,j1-1,0,x.ncols()-1) )
@@ -307,7 +389,15 @@ void solver_full::back_subs(matrix &x) {
 				if(oc) flush_blocksup(i);
 			}
 		xx=x.block(j0,j1-1,0,x.ncols()-1);
-		if(oc) read_block(i);
+		if(oc) {
+			read_block(i);
+			if(i>0) {
+				std::vector<int> ids;
+				if(blk_index(i-1,1)) ids.push_back(2*nb+i-1);
+				ids.push_back(i-1);
+				oc_prefetch(ids);
+			}
+		}
 		solve_block(i,'N',xx);
 		if(oc) flush_block(i);
 		x.setblock(j0,j1-1,0,x.ncols()-1,xx);
@@ -317,41 +407,155 @@ void solver_full::back_subs(matrix &x) {
 }
 
 
+/// \brief Returns the offset of \p size free bytes of the out of core backing
+/// file, taken from the first free extent large enough, or from the end of the
+/// file.
+size_t solver_full::oc_alloc(size_t size) {
+
+	for(size_t k=0;k<oc_free.size();k++) {
+		oc_extent &ext=oc_free[k];
+		if(ext.size<size) continue;
+		size_t offset=ext.offset;
+		ext.offset+=size;
+		ext.size-=size;
+		if(!ext.size) oc_free.erase(oc_free.begin()+k);
+		return offset;
+	}
+	size_t offset=oc_size;
+	oc_size+=size;
+	return offset;
+
+}
+
+/// \brief Gives back a region of the out of core backing file: its disk space
+/// is released, and it is merged with the free extents around it. The file is
+/// truncated if the region was at its end.
+void solver_full::oc_release(size_t offset,size_t size) {
+
+#ifdef FALLOC_FL_PUNCH_HOLE
+	fallocate(oc_fd,FALLOC_FL_PUNCH_HOLE|FALLOC_FL_KEEP_SIZE,offset,size);
+#endif
+	size_t k=0;
+	while(k<oc_free.size()&&oc_free[k].offset<offset) k++;
+	oc_extent ext={offset,size};
+	oc_free.insert(oc_free.begin()+k,ext);
+	if(k+1<oc_free.size()&&oc_free[k].offset+oc_free[k].size==oc_free[k+1].offset) {
+		oc_free[k].size+=oc_free[k+1].size;
+		oc_free.erase(oc_free.begin()+k+1);
+	}
+	if(k>0&&oc_free[k-1].offset+oc_free[k-1].size==oc_free[k].offset) {
+		oc_free[k-1].size+=oc_free[k].size;
+		oc_free.erase(oc_free.begin()+k);
+		k--;
+	}
+	if(oc_free[k].offset+oc_free[k].size==oc_size) {
+		oc_size=oc_free[k].offset;
+		oc_free.erase(oc_free.begin()+k);
+		if(ftruncate(oc_fd,oc_size))
+			ester_warn("could not truncate out of core solver file");
+	}
+
+}
+
+/// \brief Stores the matrix \p a in the region \p id of the out of core
+/// backing file.
+///
+/// If \p a does not fit in the region, the region is released and a new one is
+/// allocated, reusing the free space of the file if possible. Regions are
+/// mapped in memory: the data are written to disk by the kernel when it needs
+/// the memory.
+void solver_full::oc_write(int id,const matrix &a) {
+
+	oc_wait();
+	oc_loaded[id]=0;
+	oc_buf[id]=zeros(1,1);
+
+	oc_region &reg=oc_reg[id];
+	size_t size=(size_t) a.nrows()*a.ncols()*sizeof(double);
+	if(size>reg.capacity) {
+		size_t page=sysconf(_SC_PAGESIZE);
+		if(reg.map) {
+			munmap(reg.map,reg.capacity);
+			oc_release(reg.offset,reg.capacity);
+		}
+		reg.capacity=(size+page-1)/page*page;
+		reg.offset=oc_alloc(reg.capacity);
+		// Reserve the disk space now, so that a full disk is reported here
+		// instead of raising SIGBUS when writing to the mapping
+		if(posix_fallocate(oc_fd,reg.offset,reg.capacity))
+			ester_err("could not allocate %zu bytes for out of core solver",
+				reg.capacity);
+		void *p=mmap(NULL,reg.capacity,PROT_READ|PROT_WRITE,MAP_SHARED,oc_fd,reg.offset);
+		if(p==MAP_FAILED)
+			ester_err("could not map out of core solver file");
+		reg.map=(double *) p;
+	}
+	reg.nrows=a.nrows();
+	reg.ncols=a.ncols();
+	memcpy(reg.map,a.data(),size);
+
+}
+
+/// \brief Loads the region \p id of the out of core backing file in \p a,
+/// or takes it from the buffers filled by oc_prefetch().
+void solver_full::oc_read(int id,matrix &a) {
+
+	if(std::find(oc_queue.begin(),oc_queue.end(),id)!=oc_queue.end()) oc_wait();
+	if(oc_loaded[id]) {
+		a.swap(oc_buf[id]);
+		oc_buf[id]=zeros(1,1);
+		oc_loaded[id]=0;
+		return;
+	}
+	const oc_region &reg=oc_reg[id];
+	a.dim(reg.nrows,reg.ncols);
+	memcpy(a.data(),reg.map,(size_t) reg.nrows*reg.ncols*sizeof(double));
+
+}
+
+/// \brief Starts loading the regions \p ids of the out of core backing file
+/// in a background thread, to overlap the reads with the computations.
+void solver_full::oc_prefetch(const std::vector<int> &ids) {
+
+	oc_wait();
+	for(size_t k=0;k<ids.size();k++)
+		if(oc_reg[ids[k]].map&&!oc_loaded[ids[k]]) oc_queue.push_back(ids[k]);
+	if(oc_queue.empty()) return;
+	for(size_t k=0;k<oc_queue.size();k++) {
+		const oc_region &reg=oc_reg[oc_queue[k]];
+		madvise(reg.map,reg.capacity,MADV_WILLNEED);
+	}
+	oc_thread=std::thread([this] {
+		for(size_t k=0;k<oc_queue.size();k++) {
+			int id=oc_queue[k];
+			const oc_region &reg=oc_reg[id];
+			oc_buf[id].dim(reg.nrows,reg.ncols);
+			memcpy(oc_buf[id].data(),reg.map,(size_t) reg.nrows*reg.ncols*sizeof(double));
+			oc_loaded[id]=1;
+		}
+	});
+
+}
+
+/// \brief Waits for the end of the prefetch started by oc_prefetch().
+void solver_full::oc_wait() {
+
+	if(oc_thread.joinable()) oc_thread.join();
+	oc_queue.clear();
+
+}
+
 void solver_full::read_block(int i) {
-	
-	FILE *fp;
-	char tmp[100];
-	int nr,nc;
-	
-	sprintf(tmp,"%s/block_%d",tempdir,i);
-	fp=fopen(tmp,"rb");
-	if (fread(&nr,sizeof(int),1,fp) < 1)
-        ester_warn("could not read nr");
-	if (fread(&nc,sizeof(int),1,fp) < 1)
-        ester_warn("could not read nc");
-	m[i].read(nr,nc,fp,'b');
-	fclose(fp);
-	
+
+	oc_read(i,m[i]);
+
 }
 
 void solver_full::write_block(int i,const matrix &a) {
 
-	FILE *fp;
-	char tmp[100];
-	int nr,nc;
-	
-	sprintf(tmp,"%s/block_%d",tempdir,i);
-	fp=fopen(tmp,"wb");
-	nr=a.nrows();
-	nc=a.ncols();
-	if (fwrite(&nr,sizeof(int),1,fp) < 1)
-        ester_warn("could not write nr");
-	if (fwrite(&nc,sizeof(int),1,fp) < 1)
-        ester_warn("could not write nc");
-	a.write(fp,'b');
-	fclose(fp);	
+	oc_write(i,a);
 	m[i]=zeros(1,1);
-	
+
 }
 
 void solver_full::flush_block(int i) {
@@ -361,38 +565,16 @@ void solver_full::flush_block(int i) {
 }
 
 void solver_full::read_blockinf(int i) {
-	
-	FILE *fp;
-	char tmp[100];
-	int nr,nc;
-	
-	sprintf(tmp,"%s/blockinf_%d",tempdir,i);
-	fp=fopen(tmp,"rb");
-	if (fread(&nr,sizeof(int),1,fp) < 1)
-        ester_warn("could not read nr");
-	if (fread(&nc,sizeof(int),1,fp) < 1)
-        ester_warn("could not read nc");
-	minf[i].read(nr,nc,fp,'b');
-	fclose(fp);
-	
+
+	oc_read(nb+i,minf[i]);
+
 }
 
 void solver_full::write_blockinf(int i,const matrix &a) {
 
-	FILE *fp;
-	char tmp[100];
-	int nr,nc;
-	
-	sprintf(tmp,"%s/blockinf_%d",tempdir,i);
-	fp=fopen(tmp,"wb");
-	nr=a.nrows();
-	nc=a.ncols();
-	fwrite(&nr,sizeof(int),1,fp);
-	fwrite(&nc,sizeof(int),1,fp);
-	a.write(fp,'b');
-	fclose(fp);	
+	oc_write(nb+i,a);
 	minf[i]=zeros(1,1);
-	
+
 }
 
 void solver_full::flush_blockinf(int i) {
@@ -402,38 +584,16 @@ void solver_full::flush_blockinf(int i) {
 }
 
 void solver_full::read_blocksup(int i) {
-	
-	FILE *fp;
-	char tmp[100];
-	int nr,nc;
-	
-	sprintf(tmp,"%s/blocksup_%d",tempdir,i);
-	fp=fopen(tmp,"rb");
-	if (fread(&nr,sizeof(int),1,fp) < 1)
-        ester_warn("could not read nr");
-	if (fread(&nc,sizeof(int),1,fp) < 1)
-        ester_warn("could not read nc");
-	msup[i].read(nr,nc,fp,'b');
-	fclose(fp);
-	
+
+	oc_read(2*nb+i,msup[i]);
+
 }
 
 void solver_full::write_blocksup(int i,const matrix &a) {
 
-	FILE *fp;
-	char tmp[100];
-	int nr,nc;
-	
-	sprintf(tmp,"%s/blocksup_%d",tempdir,i);
-	fp=fopen(tmp,"wb");
-	nr=a.nrows();
-	nc=a.ncols();
-	fwrite(&nr,sizeof(int),1,fp);
-	fwrite(&nc,sizeof(int),1,fp);
-	a.write(fp,'b');
-	fclose(fp);	
+	oc_write(2*nb+i,a);
 	msup[i]=zeros(1,1);
-	
+
 }
 
 void solver_full::flush_blocksup(int i) {
@@ -441,6 +601,3 @@ void solver_full::flush_blocksup(int i) {
 	msup[i]=zeros(1,1);
 	
 }
-
-
-
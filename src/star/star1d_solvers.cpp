@@ -41,7 +41,7 @@ solver *star1d::init_solver(int nvar_add) {
     nvar=27;
 
     op=new solver();
-    op->init(ndomains,nvar+nvar_add,"full");
+    op->init(ndomains,nvar+nvar_add,config.out_of_core?"full-oc":"full");
 
     op->maxit_ref=10;op->use_cgs=0;op->maxit_cgs=20;
     op->rel_tol=1e-12;op->abs_tol=1e-20;
@@ -90,6 +90,8 @@ star2d::star2d() : nr(map.gl.N), nth(map.leg.npts), nex(map.ex.gl.N),
     version.svn=0;
     stratified_comp = 0;
     config.dump_iter = 0;
+    config.phys_tol = 0;
+    config.out_of_core = false;
 }
 
 star2d::~star2d() {
@@ -251,6 +253,8 @@ void star2d::hdf5_write(const char *filename) const {
     fields["Z"] = comp.Z();
     fields["N2"] = N2();
     fields["nuc.eps"] = nuc.eps;
+    // Teff depends on the opacity, store it for readers without the physics
+    fields["Teff"] = Teff();
 
     for (matrix_map::iterator it=fields.begin(); it!=fields.end(); ++it) {
         write_field(star, it->first.c_str(), it->second);
@@ -1108,6 +1112,13 @@ int star2d::check_arg(char *arg,char *val,int *change_grid) {
     else if (!strcmp(arg, "init_poly")) {
         config.init_poly = true;
     }
+    else if(!strcmp(arg,"phys_tol")) {
+        if(val==NULL) return 2;
+        config.phys_tol=atof(val);
+    }
+    else if(!strcmp(arg,"out_of_core")) {
+        config.out_of_core = true;
+    }
     else err=1;
 
     return err;
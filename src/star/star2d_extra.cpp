@@ -221,8 +221,39 @@ double star2d::energy_test() const {
 
 }
 
+namespace {
+
+// theta and phi grids of star2d::apparent_luminosity, and their quadrature
+// weights
+struct app_lum_grids {
+	matrix th,Ith,phi,Iphi;
+	app_lum_grids() {
+		diff_gl gl_th(1),gl_phi(1);
+		gl_th.set_npts(500);
+		gl_th.set_xif(0.,PI);
+		gl_th.init();
+		gl_phi.set_npts(500);
+		gl_phi.set_xif(0.,2*PI);
+		gl_phi.init();
+		th=gl_th.x.transpose();
+		Ith=gl_th.I.transpose();
+		phi=gl_phi.x;
+		Iphi=gl_phi.I;
+	}
+};
+
+}
+
 double star2d::apparent_luminosity(double i) const {
 
+	matrix I(1,1);
+	I(0)=i;
+	return apparent_luminosity(I)(0);
+
+}
+
+matrix star2d::apparent_luminosity(const matrix &i) const {
+
 	/*	Apparent luminosity= 4*PI*d^2*FT
 			d: distance
 			FT: Flux measured on Earth
@@ -243,53 +274,48 @@ double star2d::apparent_luminosity(double i) const {
 		so we have to use a 2D Gauss-Lobatto grid for the integral.
 		Also, as we will set (i·n)=0 over the non-visible part,
 		we will use a finer grid to reduce the impact of the discontinuity
-		(in the first derivative) on the accuracy of the quadrature formula. */
-
-
-	// theta grid
-	diff_gl gl_th(1);
-	gl_th.set_npts(500);
-	gl_th.set_xif(0.,PI);
-	gl_th.init();
-	
-	matrix th_f,Ith_f;
-	th_f=gl_th.x.transpose();
-	Ith_f=gl_th.I.transpose();
-	
-	// phi grid
-	diff_gl gl_phi(1);
-	gl_phi.set_npts(500);
-	gl_phi.set_xif(0.,2*PI);
-	gl_phi.init();
-	
-	matrix phi_f,Iphi_f;
-	phi_f=gl_phi.x;
-	Iphi_f=gl_phi.I;
-	
-	
-	// Symmetric part of the integrand
-	
-	matrix int_s;
-	
-	int_s=SIG_SB*pow(Teff(),4);
-	
-	matrix r_f,rt_f;
-	
-	// Interpolating in the new grid
-	
-	int_s=map.leg.eval_00(int_s,th_f);
-	r_f=map.leg.eval_00(r.row(nr-1),th_f);
-	rt_f=map.leg.eval_11(map.rt.row(nr-1),th_f);
-	
-	// Non symmetric part of the integrand
-	matrix int_ns;
-	
-	int_ns=r_f*( cos(i)*cos(th_f)+sin(i)*sin(th_f)*cos(phi_f) )
-				+rt_f*( cos(i)*sin(th_f)-sin(i)*cos(th_f)*cos(phi_f) );
-	int_ns*=(int_ns>0);
-	
-	// Integral
-	double L_ap=4*(Iphi_f,int_s*int_ns*r_f*sin(th_f),Ith_f)(0);
+		(in the first derivative) on the accuracy of the quadrature formula.
+		
+		The grids do not depend on the model, they are built only once. The
+		surface terms are interpolated once for all the inclinations i, and
+		kept until the surface of the model changes. */
+
+	static const app_lum_grids grids;
+
+	matrix Te,key;
+	Te=Teff();
+	key=Te.concatenate(r.row(nr-1)).concatenate(map.rt.row(nr-1));
+	matrix int_s,int_c,int_p;
+	std::unique_lock<std::mutex> lock(app_lum.lock);
+	if(key.nrows()!=app_lum.key.nrows()||key.ncols()!=app_lum.key.ncols()
+		||exist(key!=app_lum.key)) {
+		const matrix &th_f=grids.th,&phi_f=grids.phi;
+		matrix r_f,rt_f;
+
+		// Symmetric part of the integrand, interpolated in the new grid
+		app_lum.int_s=map.leg.eval_00(SIG_SB*pow(Te,4),th_f);
+		r_f=map.leg.eval_00(r.row(nr-1),th_f);
+		rt_f=map.leg.eval_11(map.rt.row(nr-1),th_f);
+
+		// Non symmetric part of the integrand:
+		// cos(i)*int_c + sin(i)*cos(phi)*int_p
+		app_lum.int_c=r_f*cos(th_f)+rt_f*sin(th_f);
+		app_lum.int_p=(r_f*sin(th_f)-rt_f*cos(th_f))*cos(phi_f);
+		app_lum.int_s=app_lum.int_s*r_f*sin(th_f);
+		app_lum.key=key;
+	}
+	int_s=app_lum.int_s;
+	int_c=app_lum.int_c;
+	int_p=app_lum.int_p;
+	lock.unlock();
+
+	// Integrals
+	matrix L_ap(i.nrows(),i.ncols()),int_ns;
+	for(int k=0;k<i.nrows()*i.ncols();k++) {
+		int_ns=cos(i(k))*int_c+sin(i(k))*int_p;
+		int_ns*=(int_ns>0);
+		L_ap(k)=4*(grids.Iphi,int_s*int_ns,grids.Ith)(0);
+	}
 	L_ap*=units.r*units.r;
 	
 	return L_ap;
@@ -10,13 +10,112 @@ extern "C" {
 #include <stdlib.h>
 }
 
+#include <vector>
+
+namespace {
+
+matrix phys_gather(const matrix &a,const std::vector<int> &idx) {
+
+	matrix res(idx.size(),1);
+	for(size_t k=0;k<idx.size();k++) res(k)=a(idx[k]);
+	return res;
+
+}
+
+void phys_scatter(matrix &a,const matrix &v,const std::vector<int> &idx) {
+
+	for(size_t k=0;k<idx.size();k++) a(idx[k])=v(k);
+
+}
+
+// Evaluates eval(in,out) for the inputs in, using the results kept in cache
+// for the points whose inputs changed by less than tol (relative change)
+// since they were last computed. Only the other points are passed to eval,
+// as column vectors. Outputs that eval does not compute for these points
+// keep the values of the last full evaluation.
+template<class F>
+int phys_incremental(phys_cache &cache,const char *name,double Z,
+		const matrix_map &in,double tol,matrix_map &out,F eval) {
+
+	const matrix &in0=in.begin()->second;
+	int N=in0.nrows()*in0.ncols();
+
+	bool valid=cache.name==name&&cache.Z==Z&&cache.in.size()==in.size();
+	for(matrix_map::const_iterator it=in.begin();valid&&it!=in.end();it++) {
+		matrix_map::const_iterator c=cache.in.find(it->first);
+		valid=c!=cache.in.end()&&c->second.nrows()==it->second.nrows()
+			&&c->second.ncols()==it->second.ncols();
+	}
+
+	if(!valid) {
+		int error=eval(in,out);
+		if(error) return error;
+		cache.name=name;cache.Z=Z;
+		cache.in=in;cache.out=out;
+		return 0;
+	}
+
+	std::vector<const double *> x,x0;
+	for(matrix_map::const_iterator it=in.begin();it!=in.end();it++) {
+		x.push_back(it->second.data());
+		x0.push_back(cache.in[it->first].data());
+	}
+	std::vector<int> idx;
+	for(int i=0;i<N;i++) {
+		for(size_t k=0;k<x.size();k++) {
+			if(fabs(x[k][i]-x0[k][i])>tol*fabs(x0[k][i])) {
+				idx.push_back(i);
+				break;
+			}
+		}
+	}
+
+	if(!idx.empty()) {
+		matrix_map pin,pout;
+		for(matrix_map::const_iterator it=in.begin();it!=in.end();it++)
+			pin[it->first]=phys_gather(it->second,idx);
+		int error=eval(pin,pout);
+		if(error) return error;
+		for(matrix_map::iterator it=cache.in.begin();it!=cache.in.end();it++)
+			phys_scatter(it->second,pin[it->first],idx);
+		for(matrix_map::iterator it=cache.out.begin();it!=cache.out.end();it++) {
+			matrix_map::iterator p=pout.find(it->first);
+			if(p!=pout.end()&&p->second.nrows()*p->second.ncols()==(int)idx.size()
+					&&it->second.nrows()*it->second.ncols()==N)
+				phys_scatter(it->second,p->second,idx);
+		}
+	}
+	out=cache.out;
+
+	return 0;
+
+}
+
+}
+
 void star2d::opacity() {
 
 	int error;
 
-	error=opa_calc(comp.X(),Z0,Tc*T,rhoc*rho,opa);
+	if(config.phys_tol<=0) {
+		error=opa_calc(comp.X(),Z0,Tc*T,rhoc*rho,opa);
+		if(error) exit(1);
+		return;
+	}
 
+	matrix_map in,out;
+	in["X"]=comp.X();in["T"]=Tc*T;in["rho"]=rhoc*rho;
+	error=phys_incremental(opa_cache,opa.name,Z0,in,config.phys_tol,out,
+		[&](const matrix_map &in,matrix_map &out) {
+			opa_struct o=opa;
+			int error=opa_calc(in["X"],Z0,in["T"],in["rho"],o);
+			out["k"]=o.k;out["xi"]=o.xi;
+			out["dlnxi_lnrho"]=o.dlnxi_lnrho;out["dlnxi_lnT"]=o.dlnxi_lnT;
+			return error;
+		});
 	if(error) exit(1);
+	opa.k=out["k"];opa.xi=out["xi"];
+	opa.dlnxi_lnrho=out["dlnxi_lnrho"];opa.dlnxi_lnT=out["dlnxi_lnT"];
 
 }
 
@@ -24,9 +123,32 @@ void star2d::nuclear() {
 
 	int error;
 
-	error=nuc_calc(comp,T*Tc,rho*rhoc,nuc);
+	if(config.phys_tol<=0) {
+		error=nuc_calc(comp,T*Tc,rho*rhoc,nuc);
+		if(error) exit(1);
+		return;
+	}
 
+	// The species are stored with their names, T and rho with a prefix
+	// that no species name has
+	matrix_map in,out;
+	for(matrix_map::iterator it=comp.begin();it!=comp.end();it++)
+		in[it->first]=it->second;
+	in[" T"]=T*Tc;in[" rho"]=rho*rhoc;
+	error=phys_incremental(nuc_cache,nuc.name,Z0,in,config.phys_tol,out,
+		[&](const matrix_map &in,matrix_map &out) {
+			composition_map c;
+			for(matrix_map::const_iterator it=in.begin();it!=in.end();it++)
+				if(it->first[0]!=' ') c[it->first]=it->second;
+			nuc_struct n=nuc;
+			int error=nuc_calc(c,in[" T"],in[" rho"],n);
+			out["eps"]=n.eps;out["pp"]=n.pp;out["cno"]=n.cno;
+			out["dlneps_lnrho"]=n.dlneps_lnrho;out["dlneps_lnT"]=n.dlneps_lnT;
+			return error;
+		});
 	if(error) exit(1);
+	nuc.eps=out["eps"];nuc.pp=out["pp"];nuc.cno=out["cno"];
+	nuc.dlneps_lnrho=out["dlneps_lnrho"];nuc.dlneps_lnT=out["dlneps_lnT"];
 
 }
 
@@ -38,7 +160,31 @@ void star2d::eq_state() {
 	eos_calc(comp.X()(0,0)*ones(1,1),Z0,ones(1,1)*Tc,ones(1,1)*pc,rhoc_m,eos);
 	rhoc=rhoc_m(0);
 
-	error=eos_calc(comp.X(),Z0,T*Tc,p*pc,rho,eos);
+	if(config.phys_tol<=0) {
+		error=eos_calc(comp.X(),Z0,T*Tc,p*pc,rho,eos);
+	} else {
+		matrix_map in,out;
+		in["X"]=comp.X();in["T"]=T*Tc;in["p"]=p*pc;
+		error=phys_incremental(eos_cache,eos.name,Z0,in,config.phys_tol,out,
+			[&](const matrix_map &in,matrix_map &out) {
+				eos_struct e=eos;
+				matrix r;
+				int error=eos_calc(in["X"],Z0,in["T"],in["p"],r,e);
+				out["rho"]=r;
+				out["G1"]=e.G1;out["cp"]=e.cp;out["del_ad"]=e.del_ad;
+				out["G3_1"]=e.G3_1;out["cv"]=e.cv;out["d"]=e.d;
+				out["prad"]=e.prad;out["chi_rho"]=e.chi_rho;
+				out["chi_T"]=e.chi_T;out["s"]=e.s;
+				return error;
+			});
+		if(!error) {
+			rho=out["rho"];
+			eos.G1=out["G1"];eos.cp=out["cp"];eos.del_ad=out["del_ad"];
+			eos.G3_1=out["G3_1"];eos.cv=out["cv"];eos.d=out["d"];
+			eos.prad=out["prad"];eos.chi_rho=out["chi_rho"];
+			eos.chi_T=out["chi_T"];eos.s=out["s"];
+		}
+	}
 
 
 //	rhoc=rho(0);
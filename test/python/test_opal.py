@@ -0,0 +1,56 @@
+"""
+Checks the OPAL GN93 opacities of the ESTER library (opa_opal) against the
+interpolation of the Fortran code they are ported from (opacgn93 in
+xztrin21.F), at values of Z between the tables.
+
+The tests are skipped when the ESTER library is not available.
+
+    python -m pytest test/python
+"""
+
+import ctypes
+
+import numpy as np
+import pytest
+
+import ester
+
+if ester._wrapper is None:
+    pytest.skip('the ESTER library is not available', allow_module_level=True)
+
+# opacgn93_ and its common /e/ are found among the dependencies of the module
+_lib = ctypes.CDLL(ester._wrapper._ester_wrap.__file__)
+_lib.opacgn93_.restype = None
+_e = (ctypes.c_double*4).in_dll(_lib, 'e_')
+
+def opacgn93(Z, X, t6, r):
+    args = [ctypes.c_double(v) for v in (Z, X, t6, r)]
+    _lib.opacgn93_(*[ctypes.byref(v) for v in args])
+    # log10(kappa), dlogk/dlogT6 at constant R and dlogk/dlogR at constant T6
+    return _e[0], _e[1], _e[2]
+
+@pytest.mark.parametrize('Z', [0.0005, 0.005, 0.015, 0.035, 0.05, 0.07])
+def test_opacgn93(Z):
+    rng = np.random.RandomState(1)
+    N = 5000
+    X = rng.uniform(0, 0.74, N)
+    logT6 = rng.uniform(-0.5, 1.5, N)
+    logR = rng.uniform(-7, -1, N)
+    # where a table value is exactly zero (Z=0.06, X=0.7), opac keeps the
+    # values of the previous Z on the last row of the grid
+    X[0], logT6[0], logR[0] = 0.6345, 1.3623, -2.6942
+    t6, r = 10**logT6, 10**logR
+    ref = np.array([opacgn93(Z, *p) for p in zip(X, t6, r)])
+
+    opa = ester._wrapper.opa_struct()
+    T, rho = t6*1e6, r*t6**3
+    assert ester._wrapper.opa_opal(ester._numpy_to_mat(X), Z,
+                                   ester._numpy_to_mat(T),
+                                   ester._numpy_to_mat(rho), opa) == 0
+    logk = np.log10(np.asarray(opa.k)[:, 0])
+    dlogkr = -1 - np.asarray(opa.dlnxi_lnrho)[:, 0]
+    dlogkt = 3 - np.asarray(opa.dlnxi_lnT)[:, 0] + 3*dlogkr
+
+    np.testing.assert_allclose(logk, ref[:, 0], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(dlogkt, ref[:, 1], rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(dlogkr, ref[:, 2], rtol=1e-9, atol=1e-9)
@@ -0,0 +1,88 @@
+"""
+Checks that the NumPy readers of the ester package (ester.h5, ester.binary
+and the sidecar index ester.index) agree with the models read by the ESTER
+library (ester.star2d).
+
+The models are given by the environment variable ESTER_TEST_MODELS (HDF5
+models separated by ':'), and default to the reference model of the source
+tree. The tests are skipped when the ESTER library is not available.
+
+    python -m pytest test/python
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import ester
+from ester import h5, binary
+from ester.index import index
+
+if ester._wrapper is None:
+    pytest.skip('the ESTER library is not available', allow_module_level=True)
+
+_REFERENCE = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir,
+                          'references', 'M5-omega0.8.h5')
+MODELS = os.environ.get('ESTER_TEST_MODELS', _REFERENCE).split(':')
+
+FIELDS = ('r', 'z', 'th', 'rho', 'T', 'p', 'phi', 'w', 'G', 'X', 'rt')
+SCALARS = ('M', 'R', 'Xc', 'Tc', 'pc', 'Omega', 'Omega_bk', 'L', 'Re')
+
+def assert_close(a, b, rtol=1e-10):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    assert a.shape == b.shape
+    np.testing.assert_allclose(a, b, rtol=rtol, atol=rtol*np.abs(b).max())
+
+@pytest.fixture(scope='module', params=MODELS)
+def model(request):
+    return request.param
+
+@pytest.fixture(scope='module')
+def lib(model):
+    return ester.star2d(model)
+
+def test_h5(model, lib):
+    a = h5.star2d(model)
+    try:
+        for name in FIELDS:
+            assert_close(getattr(a, name), getattr(lib, name))
+        for name in SCALARS:
+            assert_close(getattr(a, name), getattr(lib, name))
+        if 'Teff' in a._star:
+            assert_close(a.Teff, lib.Teff)
+            assert_close(a.apparent_luminosity([0, 45, 90]),
+                         lib.apparent_luminosity([0, 45, 90]))
+    finally:
+        a.close()
+
+def test_binary(model, lib, tmp_path):
+    name = str(tmp_path / 'model.out')
+    lib._s.write(name, 'b')
+    raw = ester.star2d(model, interpolate=False)
+    f = binary.binfile(name)
+    try:
+        # records are the matrices of the model, without any conversion
+        for name in ('phi', 'p', 'T', 'phiex', 'w', 'G'):
+            np.testing.assert_array_equal(f[name], getattr(raw, name))
+        np.testing.assert_array_equal(f['comp']['H'], raw.X)
+        for name in ('M', 'R', 'Xc', 'Tc', 'pc', 'Omega_bk'):
+            assert f[name] == getattr(raw, name)
+        assert f['nth'] == raw.nth and f['ndomains'] == raw.ndomains
+    finally:
+        f.close()
+
+def test_index(model, lib, tmp_path):
+    shutil.copy(model, str(tmp_path))
+    for update in (True, False):
+        # the second time, the index is read back from the sidecar file
+        a = index(str(tmp_path), update=update)
+        assert list(a['file']) == [os.path.basename(model)]
+        for name in ('L', 'Xc', 'Tc', 'rhoc', 'Re'):
+            assert_close(a[name][0], getattr(lib, name))
+        n = lib.nth+2
+        assert_close(a['Teff'][0, :n], lib.Teff[0])
+        assert_close(a['r'][0, :n], lib.r[-1])
+        assert_close([a['L_app_pole'][0], a['L_app_eq'][0]],
+                     lib.apparent_luminosity([0, 90]))